@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+"""Benchmarks locator matching offline by replaying recorded screen frames.
+
+Frames are PNG files that are replayed in name order as the screen of the fake backend, one
+frame per keyword call. Without ``--frames``, synthetic frames are generated by placing the
+reference images on a noisy background, each at the same position in every frame as controls
+of an application window are, while the background changes from frame to frame. Reference
+images are searched by the keywords of the library, so the find, findAll and wait code paths
+including the caches and location hints are measured. The benchmark runs with CPython 2.7,
+Robot Framework, NumPy and Pillow on any headless machine.
+
+Example:
+
+    python benchmark/benchmark_matching.py --frames recorded/ --reference calc.png=0.9 --pyramid auto
+"""
+
+import os, sys, glob, json, time, random, resource, argparse
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(THIS_DIR, "..", "src")
+DEFAULT_REFERENCE = os.path.join(THIS_DIR, "..", "demo", "calc_test_suite", "calc_image_library", "Win7", "calc.png")
+SCENARIOS = ("find", "find_all", "wait", "location_hints")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks locator matching against recorded frames")
+    parser.add_argument('--frames', action='store', help='Directory or glob pattern of the PNG frames to replay')
+    parser.add_argument('--reference', action='append', default=[],
+                        help='Reference image with optional similarity, e.g. calc.png=0.9 (repeatable)')
+    parser.add_argument('--synthetic', action='store', type=int, default=10, help='Number of synthetic frames')
+    parser.add_argument('--size', action='store', default='1920x1080', help='Size of the synthetic frames')
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS, help='Scenarios to run (repeatable)')
+    parser.add_argument('--iterations', action='store', type=int, default=20, help='Measured calls per scenario')
+    parser.add_argument('--warmup', action='store', type=int, default=2, help='Unmeasured calls per scenario')
+    parser.add_argument('--pyramid', action='store', default='0', help='Pyramid search setting: 0, auto or a depth')
+    parser.add_argument('--seed', action='store', type=int, default=0)
+    parser.add_argument('--json', action='store', help='Writes the results as JSON to this file')
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.abspath(SRC_DIR))
+    from SikuliXRobotLibrary import SikuliXRobotLibrary
+    from SikuliXRobotLibrary.backends import FakeBackend
+    from SikuliXRobotLibrary.matchers.numpymatcher import read_image
+
+    references = [_parse_reference(reference) for reference in (args.reference or [DEFAULT_REFERENCE + '=0.9'])]
+    if args.frames:
+        frames = [read_image(path) for path in _frame_paths(args.frames)]
+    else:
+        frames = _synthetic_frames([read_image(path) for (path, similarity) in references],
+                                   args.synthetic, args.size, args.seed)
+    (height, width) = frames[0].shape[:2]
+    screen = ReplayScreen(FakeBackend(width, height), frames)
+    library = SikuliXRobotLibrary(backend=screen.backend, run_on_failure='Nothing', pyramid_search=args.pyramid,
+                                  screenshot_queue_size=0)
+    locators = ["%s = %s" % (os.path.abspath(path), similarity) for (path, similarity) in references]
+
+    print("Frames: %d of %dx%d, references: %s, pyramid: %s"
+          % (len(frames), width, height,
+             ", ".join(os.path.basename(path) for (path, similarity) in references), args.pyramid))
+    print("%-16s %-10s %8s %8s %10s %10s %10s %10s"
+          % ("scenario", "reference", "calls", "found", "finds/s", "p50 ms", "p95 ms", "p99 ms"))
+    results = []
+    for scenario in args.scenario or SCENARIOS:
+        for (locator, (path, similarity)) in zip(locators, references):
+            result = run_scenario(scenario, library, screen, locator, args.iterations, args.warmup)
+            result['reference'] = path
+            results.append(result)
+            print("%-16s %-10s %8d %8d %10.1f %10.2f %10.2f %10.2f"
+                  % (scenario, os.path.basename(path)[:10], result['calls'], result['found'],
+                     result['finds_per_second'], result['p50'] * 1000, result['p95'] * 1000, result['p99'] * 1000))
+    peak_rss = _peak_rss()
+    print("Peak RSS: %.1f MB" % (peak_rss / 1024.0 / 1024.0))
+    if args.json:
+        with open(args.json, 'w') as json_file:
+            json.dump({'frames': len(frames), 'pyramid': args.pyramid, 'peak_rss': peak_rss, 'results': results},
+                      json_file, indent=2, sort_keys=True)
+
+class ReplayScreen(object):
+    """Shows the next recorded frame on the screen of the fake ``backend`` on every `next` call."""
+
+    def __init__(self, backend, frames):
+        self.backend = backend
+        self.frames = frames
+        self.shown = 0
+
+    def next(self):
+        self.backend.set_frame(self.frames[self.shown % len(self.frames)])
+        self.shown += 1
+
+def run_scenario(scenario, library, screen, locator, iterations, warmup):
+    (prepare, call) = _scenario_call(scenario, library, locator)
+    # Each scenario starts without the location hints and match sets of the previous one
+    library._location_hints.clear()
+    library._match_sets.clear()
+    for index in range(warmup):
+        screen.next()
+        prepare()
+        call()
+    durations = []
+    found = 0
+    for index in range(iterations):
+        screen.next()
+        prepare()
+        start = time.time()
+        if call():
+            found += 1
+        durations.append(time.time() - start)
+    durations.sort()
+    total = sum(durations)
+    return {'scenario': scenario,
+            'reference': locator,
+            'calls': iterations,
+            'found': found,
+            'finds_per_second': iterations / total if total else 0.0,
+            'p50': percentile(durations, 50),
+            'p95': percentile(durations, 95),
+            'p99': percentile(durations, 99)}
+
+def percentile(durations, percent):
+    """Returns the nearest-rank ``percent`` percentile of the sorted ``durations``."""
+    if not durations:
+        return 0.0
+    rank = max(int(round(percent / 100.0 * len(durations) + 0.5)) - 1, 0)
+    return durations[min(rank, len(durations) - 1)]
+
+def _scenario_call(scenario, library, locator):
+    """Returns the untimed preparation and the timed keyword call of ``scenario``."""
+    def found(keyword, *args):
+        # Keywords fail when the locator is not found, Get Pattern Count returns 0
+        try:
+            return keyword(locator, *args) != 0
+        except AssertionError:
+            return False
+    nothing = lambda: None
+    # Without hints every find searches the whole screen
+    forget_hints = library._location_hints.clear
+    return {'find': (forget_hints, lambda: found(library.get_reference_pattern_coordinates)),
+            'find_all': (nothing, lambda: found(library.get_pattern_count)),
+            'wait': (forget_hints, lambda: found(library.wait_until_pattern_is_visible, '0')),
+            'location_hints': (nothing, lambda: found(library.get_reference_pattern_coordinates))}[scenario]
+
+def _parse_reference(reference):
+    (path, separator, similarity) = reference.rpartition('=')
+    if not separator:
+        return (reference.strip(), 0.7)
+    return (path.strip(), float(similarity))
+
+def _frame_paths(frames):
+    if os.path.isdir(frames):
+        frames = os.path.join(frames, '*.png')
+    paths = sorted(glob.glob(frames))
+    if not paths:
+        raise IOError("No frames found at '%s'." % (frames))
+    return paths
+
+def _synthetic_frames(references, count, size, seed):
+    import numpy
+    (width, height) = [int(value) for value in size.lower().split('x')]
+    generator = random.Random(seed)
+    noise = numpy.random.RandomState(seed)
+    # The references stay where they are, as controls do, only the background changes
+    positions = []
+    for reference in references:
+        (h, w) = reference.shape[:2]
+        if h > height or w > width:
+            positions.append(None)
+        else:
+            positions.append((generator.randint(0, width - w), generator.randint(0, height - h)))
+    frames = []
+    for index in range(count):
+        frame = noise.randint(0, 256, (height, width, 3)).astype(numpy.uint8)
+        for (reference, position) in zip(references, positions):
+            if position is not None:
+                (x, y) = position
+                (h, w) = reference.shape[:2]
+                frame[y:y + h, x:x + w] = reference[..., :3]
+        frames.append(frame)
+    return frames
+
+def _peak_rss():
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+if __name__ == '__main__':
+    main()
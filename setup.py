@@ -40,7 +40,8 @@ setup(name         = 'robotframework-sikulixrobotLibrary',
 						 ],
       py_modules=['ez_setup'],
       package_dir  = {'' : 'src'},
-      packages     = ['SikuliXRobotLibrary','SikuliXRobotLibrary.keywords','SikuliXRobotLibrary.locators',
+      packages     = ['SikuliXRobotLibrary','SikuliXRobotLibrary.backends','SikuliXRobotLibrary.keywords','SikuliXRobotLibrary.locators',
+                      'SikuliXRobotLibrary.matchers','SikuliXRobotLibrary.ocr',
                       'SikuliXRobotLibrary.utils','SikuliXRobotLibrary.utils.events'],
       include_package_data = True,
       )
\ No newline at end of file
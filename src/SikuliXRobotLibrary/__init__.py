@@ -1,6 +1,8 @@
-from sikuli import *
+import os
+import robot
 from keywords import *
 from version import VERSION
+import utils
 from utils import LibraryListener
 
 __version__ = VERSION
@@ -8,6 +10,7 @@ __version__ = VERSION
 class SikuliXRobotLibrary(
     _ApplicationKeywords,
     _AssertionKeywords,
+    _BackendKeywords,
     _ElementKeywords,
     _KeyboardActionsKeywords,
     _ImageLibraryKeywords,
@@ -66,18 +69,63 @@ class SikuliXRobotLibrary(
     | Click Pattern  |  pattern.png = 0.90 | # Locator is a PNG image format with image sensitivity set to 0.90                         |
     | Click Pattern  |  pattern.png        | # Locator is a PNG image format with image sensitivity set to the default value 0.70.      |
     | Click Pattern  |  Password           | # Locator as a string or non-PNG images are matched against any string or image on screen. |
+
+    *Locator options*
+    Matching options may follow a locator as ``name = value`` pairs separated by ``;``.
+
+    | *Option* | *Values*                    | *Description*                                                                          |
+    | pyramid  | off, auto or a depth number | Coarse-to-fine search on downsampled screens, overrides `pyramid_search` in `importing` |
+    | fuzzy    | a ratio from 0.0 to 1.0     | Text locators also match words at least this similar, to tolerate OCR mistakes         |
+
+    For example:
+    | Click Pattern  |  pattern.png = 0.90 ; pyramid = auto | # Searches downsampled screens first, then refines around the candidates |
+    | Click Pattern  |  pattern.png = 0.90 ; pyramid = off  | # Always searches at full resolution                                       |
+    | Click Pattern  |  Sign in ; fuzzy = 0.8               | # Also matches "Sign ln" read by OCR                                       |
+
+    The pyramid search is done by frame based matchers such as the NumPy matcher. The default SikuliX
+    matcher leaves the search strategy to SikuliX and ignores this option.
+
+    *Locator alternatives*
+    Locators separated by ``||`` are alternatives, e.g. for patterns that look different on other
+    operating systems or themes. On every scan, all alternatives are searched in the same capture
+    of the search region and the first alternative in the list that is found wins, so the keyword
+    waits only once. This works with every keyword taking a ``pattern``.
+
+    For example, ``Click Pattern    win8/equals.png = 0.90 || win7/equals.png = 0.90 || =`` clicks
+    whichever of the two images is found, or the text ``=`` when neither image is.
+
+    A single ``|`` is part of the locator, so text locators such as ``File | Save`` are searched
+    as they are. The doubled separator is also kept in one cell by the pipe separated test data
+    format, where a single ``|`` surrounded by spaces separates cells.
     """
     ROBOT_LIBRARY_SCOPE = 'GLOBAL'
     ROBOT_LIBRARY_VERSION = VERSION
-    Settings.OcrTextSearch = True
-    Settings.OcrTextRead = True
 
     def __init__(self,
                  sikulix_timeout = 10.0,
                  sikulix_scanrate = 3.0,
                  screenshot_directory = None,
                  target_screen = 'Screen 0',
-                 run_on_failure ='Capture Screenshot Of Active App'
+                 run_on_failure ='Capture Screenshot Of Active App',
+                 locator_cache_size = 256,
+                 image_store_size = 64,
+                 pyramid_search = False,
+                 active_app_cache_ttl = 0,
+                 screenshot_queue_size = 32,
+                 screenshot_overflow = 'block',
+                 screenshot_dedup = False,
+                 screenshot_format = 'png',
+                 screenshot_quality = 85,
+                 screenshot_max_size = 0,
+                 latency_report = None,
+                 match_set_cache_ttl = 5,
+                 pattern_order = 'xy',
+                 ocr_cache_size = 128,
+                 ocr_workers = None,
+                 text_locator_index = True,
+                 test_search_budget = None,
+                 keyword_search_budget = None,
+                 backend = 'sikulix'
     ):
 
         """SikuliXRobotLibrary can be imported with optional arguments.
@@ -102,6 +150,84 @@ class SikuliXRobotLibrary(
         `screenshot_root_directory` specifies the default root directory that screenshots should be
         stored in. If not provided the default directory will be where robotframework places its logfile.
 
+        `locator_cache_size` is the maximum number of parsed locators kept in memory so that repeated
+        keyword calls with the same locator skip parsing. See `Get Locator Cache Statistics`.
+
+        `image_store_size` is the memory budget in megabytes for decoded reference images.
+        See `Preload Image Library` and `Get Image Store Statistics`.
+
+        `pyramid_search` enables the coarse-to-fine search on downsampled screens, which is faster on
+        large screens. Use ``auto`` (or ``True``) to pick the pyramid depth from the screen and pattern
+        sizes, or a number to fix the depth. See `Locator options` for setting it per locator.
+        The pyramid search is done by frame based matchers, with the ``sikulix`` backend the
+        argument is ignored with a warning.
+
+        `active_app_cache_ttl` is the number of seconds the position and size of the `application` in
+        focus are reused before the window is queried again. The default 0 queries the window every
+        time. Keywords that change the focus, such as `Set Application Focus`, always query it again.
+        Searching keywords skip setting the search region when it is already set to the window.
+        See `Get Window Query Statistics`.
+
+        `screenshot_queue_size` is the number of captured screenshots that may wait to be written to
+        disk by a background thread, so that capturing does not wait for the disk. Use 0 to write
+        screenshots before the keyword returns. `screenshot_overflow` decides what happens when the
+        queue is full: ``block`` waits for a free slot, ``drop_oldest`` drops the oldest waiting
+        screenshot. Waiting screenshots are written at the end of every suite or with `Flush Screenshots`.
+
+        `screenshot_dedup` enables writing identical screenshots only once. Screenshots are identified
+        by the SHA-1 digest of their content and later captures of the same content link to the file
+        written first. The bytes saved are logged at the end of every suite. See
+        `Get Screenshot Deduplication Statistics`.
+
+        `screenshot_format`, `screenshot_quality` and `screenshot_max_size` set the format, the
+        compression quality from 0 to 100 and the maximum width and height in pixels of written
+        screenshots, including the ones taken on failure. See `Set Screenshot Options`.
+        `Capture Screenshot Of Match Context` can be used as `run_on_failure` keyword to keep
+        only the surroundings of the last searched pattern.
+
+        `latency_report` enables recording the wall time of every keyword split into phases such as
+        pattern matching, input and OCR, aggregated as histograms per keyword and per locator. The
+        summary is written as JSON to the given file, relative to the log directory, at the end of
+        every suite. See `Get Keyword Latency Statistics`.
+
+        `match_set_cache_ttl` is the number of seconds the matches found by keywords working on all
+        matches of a ``pattern``, such as `Click Nth Pattern`, are reused by the following keywords.
+        Matches are only reused while the search region shows the same pixels. Use 0 to search
+        every time. See `Get Match Set Cache Statistics`.
+
+        `pattern_order` is the order in which the nth pattern keywords count matches: ``xy``,
+        ``row_major`` or ``column_major``. The last two group matches into visual rows and columns
+        so that grids and lists are counted as they are read. See `Set Pattern Order`.
+
+        `ocr_cache_size` is the number of texts read by OCR that are kept and returned again when the
+        same region is read with unchanged pixels and OCR whitelist. Use 0 to read the text every time.
+        See `Get OCR Cache Statistics`.
+
+        `ocr_workers` is the number of threads reading several regions in parallel, e.g. with
+        `Get Texts In Regions`. The threads are kept between keywords. 0 starts one thread per
+        processor and 1 reads the regions one after the other. By default the ``sikulix`` backend
+        uses 1, since SikuliX has a single text recognizer that reads one region at a time, and
+        the other backends use 0.
+
+        `text_locator_index` enables searching text locators, such as ``Password``, in the words read
+        by one OCR pass over the search region. The words are reused by all text locators until the
+        search region shows different pixels. Text locators ignore case. Use False to run a text
+        search of SikuliX for every text locator. See `Get Text Index Statistics`.
+
+        `test_search_budget` and `keyword_search_budget` limit the total time the searches of a test
+        or of a keyword may wait, as Robot Framework times such as ``2 minutes``. Every search takes
+        its timeout from the time left, so a test cannot wait longer than its budget however many
+        searches it makes. See `Set Search Time Budget`.
+
+        `backend` selects what drives the screen, mouse, keyboard and applications. The default
+        ``sikulix`` uses the SikuliX runtime on Jython. ``fake`` runs under CPython without a display:
+        the screen is an in-memory NumPy image searched by the NumPy matcher, and mouse, keyboard and
+        application actions are recorded instead of performed. ``x11`` also runs under CPython but
+        searches the live screen of the X11 display in ``DISPLAY``, e.g. Xvfb, read through shared
+        memory so that only the searched region is transferred. It only captures: input, application
+        and text recognition keywords fail with it.
+        A backend object can also be given when the library is created from Python. See `Get Backend`.
+
         Examples:
         | Library `|` SikuliXRobotLibrary `|` 15                                                    | # Sets default sikulix_timeout to 15 seconds                                          |
         | Library `|` SikuliXRobotLibrary `|` 0 `|` 5                                               | # Sets default sikulix_timeout to 0 seconds and default sikulix_scanrate to 5 seconds |
@@ -109,11 +235,32 @@ class SikuliXRobotLibrary(
         | Library `|` SikuliXRobotLibrary `|` sikulix_timeout=5       `|` run_on_failure=Log Source | # Sets default implicit_wait to 5 seconds and runs `Log Source` on failure            |
         | Library `|` SikuliXRobotLibrary `|` sikulix_scanrate=10     `|` run_on_failure=Nothing    | # Sets default sikulix_scanrate to 10 seconds and does nothing on failure             |
         """
+        # The keyword groups register their suite and test handlers with the listener of this instance
+        self.ROBOT_LIBRARY_LISTENER = LibraryListener()
         for base in SikuliXRobotLibrary.__bases__:
             base.__init__(self)
+        self._set_backend(backend)
         self.sikulix_timeout = sikulix_timeout
         self.sikulix_scanrate = sikulix_scanrate
         self.screenshot_directory = screenshot_directory
         self.target_screen = target_screen
         self.sikulix_register_keyword_to_run_on_failure(run_on_failure)
-        self.ROBOT_LIBRARY_LISTENER = LibraryListener()
\ No newline at end of file
+        self._pattern_finder.set_locator_cache_size(locator_cache_size)
+        self._pattern_finder.image_store.set_budget(image_store_size)
+        self._matcher.image_store = self._pattern_finder.image_store
+        self._set_pyramid_search(pyramid_search)
+        self.active_app_cache_ttl = float(active_app_cache_ttl)
+        self._screenshot_writer.configure(screenshot_queue_size, screenshot_overflow)
+        self.screenshot_dedup = robot.utils.is_truthy(screenshot_dedup)
+        self.set_screenshot_options(screenshot_format, screenshot_quality, screenshot_max_size)
+        if latency_report:
+            self.ROBOT_LIBRARY_LISTENER.latency.report = os.path.join(self._get_log_dir(), latency_report)
+            self.ROBOT_LIBRARY_LISTENER.latency.enabled = True
+        self._match_sets.ttl = float(match_set_cache_ttl)
+        self.set_pattern_order(pattern_order)
+        self._text_cache.set_capacity(ocr_cache_size)
+        self._ocr_pool.set_workers(self._get_ocr_workers(ocr_workers))
+        self._matcher.text_index = self._text_index if robot.utils.is_truthy(text_locator_index) else None
+        self._deadlines.test_budget = self._parse_budget(test_search_budget)
+        self._deadlines.keyword_budget = self._parse_budget(keyword_search_budget)
+        self._matcher.deadlines = self._deadlines
@@ -0,0 +1,35 @@
+from backend import Backend, UnsupportedOperation
+from fakebackend import FakeBackend, FakeApp
+from x11backend import X11Backend
+from xshm import XShmCapture
+
+try:
+    from sikulibackend import SikuliBackend
+except ImportError:
+    # SikuliX is only available on Jython
+    SikuliBackend = None
+
+__all__ = [
+    "Backend",
+    "UnsupportedOperation",
+    "SikuliBackend",
+    "FakeBackend",
+    "FakeApp",
+    "X11Backend",
+    "XShmCapture",
+    "get_backend"
+]
+
+BACKENDS = {'sikulix': lambda: SikuliBackend(), 'fake': lambda: FakeBackend(), 'x11': lambda: X11Backend()}
+
+def get_backend(backend):
+    """Returns ``backend`` if it is a `Backend`, otherwise creates the backend named ``backend``."""
+    if isinstance(backend, Backend):
+        return backend
+    name = str(backend).strip().lower()
+    if name not in BACKENDS:
+        raise ValueError("Invalid backend '%s', expected one of: %s."
+                         % (backend, ", ".join(sorted(BACKENDS))))
+    if name == 'sikulix' and SikuliBackend is None:
+        raise ImportError("The 'sikulix' backend requires Jython with SikuliX on the classpath.")
+    return BACKENDS[name]()
@@ -0,0 +1,214 @@
+import abc
+
+class UnsupportedOperation(Exception):
+    """Raised by a backend for an action it cannot perform, e.g. input on a capture-only backend."""
+
+class Backend(object):
+    """Interface between the keywords and the screen, the input devices and the applications.
+
+    ``matcher`` is the `Matcher` used to search the screen. Coordinates are ``(x, y, w, h)``
+    tuples in screen coordinates. Input methods take a ``target``, which is a match or a region
+    returned by the ``matcher``; a ``target`` of None acts on the last match, as the global
+    SikuliX functions do. Mouse buttons are ``left``, ``middle`` or ``right`` and the wheel
+    directions ``up`` or ``down``.
+
+    ``parallel_ocr`` tells whether `read_text` calls from several threads actually run at the
+    same time; it selects the default number of OCR workers.
+    """
+    __metaclass__ = abc.ABCMeta
+    parallel_ocr = True
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+
+    # Screens and search region
+
+    @abc.abstractmethod
+    def screen_count(self):
+        """Returns the number of screens."""
+
+    @abc.abstractmethod
+    def screen_coordinates(self, number):
+        """Returns the coordinates of screen ``number``, counting from 0."""
+
+    @abc.abstractmethod
+    def set_roi(self, x, y, w, h):
+        """Limits the searches without a region to the given rectangle."""
+
+    def set_timeout(self, timeout):
+        self.matcher.timeout = float(timeout)
+
+    def set_scan_rate(self, scan_rate):
+        self.matcher.scan_rate = float(scan_rate)
+
+    @abc.abstractmethod
+    def add_image_path(self, path):
+        """Adds ``path`` to the directories reference images are looked up in."""
+
+    # Capturing and text recognition
+
+    @abc.abstractmethod
+    def capture(self, x, y, w, h):
+        """Captures the rectangle and returns the path of the PNG file holding it."""
+
+    def capture_pixels(self, x, y, w, h):
+        """Returns the rectangle as an ``(h, w, 3)`` RGB NumPy array owned by the caller, or None
+        when the backend only captures to files with `capture`."""
+        return None
+
+    def encode_pixels(self, pixels, destination, format, quality, max_size):
+        """Writes ``pixels`` returned by `capture_pixels` to ``destination`` as `encode_image` does."""
+        raise UnsupportedOperation("%s does not capture to memory." % (type(self).__name__))
+
+    @abc.abstractmethod
+    def image_formats(self):
+        """Returns the names of the image formats `encode_image` can write."""
+
+    @abc.abstractmethod
+    def encode_image(self, source, destination, format, quality, max_size):
+        """Writes the image ``source`` to ``destination`` in ``format``, scaled down to at most
+        ``max_size`` pixels per side unless ``max_size`` is 0."""
+
+    @abc.abstractmethod
+    def read_text(self, frame, whitelist=None):
+        """Returns the text recognized in ``frame``, captured by ``matcher``, limited to the characters
+        of ``whitelist`` or to the ones set with `set_ocr_whitelist` when ``whitelist`` is None. It
+        may be called from several OCR worker threads at the same time."""
+
+    @abc.abstractmethod
+    def read_words(self, frame):
+        """Returns the words recognized in ``frame``, captured by ``matcher``, as ``(text, x, y, w, h)``
+        tuples in screen coordinates."""
+
+    @abc.abstractmethod
+    def set_ocr_whitelist(self, characters):
+        """Limits the text recognition to ``characters``."""
+
+    @abc.abstractmethod
+    def reset_text_recognizer(self):
+        """Restores the default text recognition settings."""
+
+    # Mouse
+
+    @abc.abstractmethod
+    def click(self, target=None):
+        """Left-clicks ``target``."""
+
+    @abc.abstractmethod
+    def double_click(self, target=None):
+        """Double-clicks ``target``."""
+
+    @abc.abstractmethod
+    def right_click(self, target=None):
+        """Right-clicks ``target``."""
+
+    @abc.abstractmethod
+    def hover(self, target=None):
+        """Moves the mouse to ``target``."""
+
+    @abc.abstractmethod
+    def highlight(self, target, seconds):
+        """Outlines ``target`` on the screen for ``seconds``."""
+
+    @abc.abstractmethod
+    def mouse_move(self, x, y):
+        """Moves the mouse to the point."""
+
+    @abc.abstractmethod
+    def mouse_down(self, button):
+        """Presses and holds ``button``."""
+
+    @abc.abstractmethod
+    def mouse_up(self, button):
+        """Releases ``button``."""
+
+    @abc.abstractmethod
+    def drag(self, target):
+        """Starts dragging at ``target``."""
+
+    @abc.abstractmethod
+    def drop_at(self, target):
+        """Drops what is being dragged at ``target``."""
+
+    def drag_drop(self, source, target):
+        self.drag(source)
+        self.drop_at(target)
+
+    @abc.abstractmethod
+    def wheel(self, direction, steps, target=None):
+        """Turns the mouse wheel ``steps`` notches in ``direction`` at ``target``."""
+
+    # Keyboard
+
+    @abc.abstractmethod
+    def key(self, name):
+        """Returns the backend representation of the special key ``name``, e.g. ``ENTER``."""
+
+    @abc.abstractmethod
+    def type(self, text, modifiers=None, target=None):
+        """Types ``text`` while holding ``modifiers``, clicking ``target`` first when given."""
+
+    @abc.abstractmethod
+    def paste(self, text, target=None):
+        """Pastes ``text`` through the clipboard, clicking ``target`` first when given."""
+
+    @abc.abstractmethod
+    def clipboard(self):
+        """Returns the text on the clipboard."""
+
+    # Applications and operating system
+
+    @abc.abstractmethod
+    def focused_window(self):
+        """Returns the coordinates of the window in focus."""
+
+    @abc.abstractmethod
+    def app_window(self, name):
+        """Returns the coordinates of the window of application ``name``."""
+
+    @abc.abstractmethod
+    def app_window_title(self, name):
+        """Returns the title of the window of application ``name``."""
+
+    @abc.abstractmethod
+    def focus_app(self, name):
+        """Brings application ``name`` to the front, raises `FindFailed` if it is not found."""
+
+    def switch_app(self, name):
+        self.focus_app(name)
+
+    @abc.abstractmethod
+    def open_app(self, path):
+        """Starts the application at ``path``."""
+
+    @abc.abstractmethod
+    def close_app(self, name):
+        """Closes application ``name``."""
+
+    @abc.abstractmethod
+    def app_is_running(self, name):
+        """Returns True if application ``name`` is running."""
+
+    @abc.abstractmethod
+    def app_has_window(self, name):
+        """Returns True if application ``name`` has a window."""
+
+    @abc.abstractmethod
+    def app_pid(self, name):
+        """Returns the process ID of application ``name``."""
+
+    @abc.abstractmethod
+    def app_name(self, name):
+        """Returns the name the operating system knows application ``name`` by."""
+
+    @abc.abstractmethod
+    def run(self, command):
+        """Runs ``command`` in a shell."""
+
+    @abc.abstractmethod
+    def os_type(self):
+        """Returns ``WINDOWS``, ``MAC`` or ``LINUX``."""
+
+    @abc.abstractmethod
+    def os_version(self):
+        """Returns the version of the operating system."""
@@ -0,0 +1,328 @@
+import os
+import platform
+import tempfile
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from SikuliXRobotLibrary.matchers.matcher import FindFailed, region_bounds
+from SikuliXRobotLibrary.matchers.numpymatcher import NumpyMatcher, read_image
+from backend import Backend
+
+class FakeApp(object):
+    """Application known to the `FakeBackend`, with its window coordinates."""
+
+    def __init__(self, name, x, y, w, h, pid, title=None):
+        self.name = name
+        self.coordinates = (int(x), int(y), int(w), int(h))
+        self.pid = pid
+        self.title = title if title is not None else name
+        self.running = True
+
+class FakeBackend(Backend):
+    """In-process backend for headless execution under CPython.
+
+    The screen is ``framebuffer``, an ``(h, w, 3)`` uint8 NumPy array searched by a
+    `NumpyMatcher`. Tests paint it with `set_frame` and `draw` and declare applications with
+    `add_app` and recognizable text with `add_text`. Mouse, keyboard and application actions
+    are not performed but appended to ``events`` as tuples, e.g. ``('click', x, y)`` or
+    ``('type', text, modifiers)``.
+    """
+
+    def __init__(self, width=1920, height=1080, timeout=0.0, scan_rate=10.0):
+        if numpy is None:
+            raise ImportError("FakeBackend requires the numpy package.")
+        Backend.__init__(self, NumpyMatcher(lambda: self.framebuffer, timeout, scan_rate))
+        self.framebuffer = numpy.zeros((int(height), int(width), 3), dtype=numpy.uint8)
+        self.screens = [(0, 0, int(width), int(height))]
+        self.events = []
+        self.apps = {}
+        self.focused = None
+        self.texts = []
+        self.mouse = (0, 0)
+        self.whitelist = None
+        self._clipboard = ''
+        self.matcher.set_roi(*self.screens[0])
+
+    # Public
+
+    def set_frame(self, pixels):
+        """Replaces the whole screen with ``pixels``, an array or the path of an image."""
+        pixels = self._to_pixels(pixels)
+        self.framebuffer = numpy.ascontiguousarray(pixels, dtype=numpy.uint8)
+
+    def draw(self, image, x, y):
+        """Paints ``image``, an array or the path of an image, with its top left corner at ``x``, ``y``."""
+        pixels = self._to_pixels(image)
+        (x, y) = (int(x), int(y))
+        (h, w) = pixels.shape[:2]
+        (frame_h, frame_w) = self.framebuffer.shape[:2]
+        (left, top) = (max(x, 0), max(y, 0))
+        (right, bottom) = (min(x + w, frame_w), min(y + h, frame_h))
+        if right > left and bottom > top:
+            self.framebuffer[top:bottom, left:right] = pixels[top - y:bottom - y, left - x:right - x]
+
+    def add_app(self, name, x, y, w, h, pid=None, title=None, focus=True):
+        self.apps[name] = FakeApp(name, x, y, w, h, pid if pid is not None else 1000 + len(self.apps), title)
+        if focus:
+            self.focused = name
+
+    def add_text(self, text, x, y, w, h):
+        """Makes ``text`` recognizable in the rectangle by `read_text`."""
+        self.texts.append((int(x), int(y), int(w), int(h), text))
+
+    def clear_events(self):
+        self.events = []
+
+    # Screens and search region
+
+    def screen_count(self):
+        return len(self.screens)
+
+    def screen_coordinates(self, number):
+        return self.screens[int(number)]
+
+    def set_roi(self, x, y, w, h):
+        self.matcher.set_roi(x, y, w, h)
+
+    def add_image_path(self, path):
+        self.matcher.add_image_directory(path)
+
+    # Capturing and text recognition
+
+    def capture(self, x, y, w, h):
+        (handle, path) = tempfile.mkstemp(suffix='.png', prefix='sikulix-fake-')
+        os.close(handle)
+        to_image(self.capture_pixels(x, y, w, h)).save(path, 'PNG')
+        return path
+
+    def capture_pixels(self, x, y, w, h):
+        (x, y, w, h) = (max(int(x), 0), max(int(y), 0), int(w), int(h))
+        return self.framebuffer[y:y + h, x:x + w].copy()
+
+    def encode_pixels(self, pixels, destination, format, quality, max_size):
+        save_image(to_image(pixels), destination, format, quality, max_size)
+
+    def image_formats(self):
+        return image_formats()
+
+    def encode_image(self, source, destination, format, quality, max_size):
+        save_image(open_image(source), destination, format, quality, max_size)
+
+    def read_text(self, frame, whitelist=None):
+        """Returns the texts added with `add_text` lying within ``frame``, top to bottom."""
+        (x, y, w, h) = self.matcher.frame_bounds(frame)
+        lines = [(ty, tx, text) for (tx, ty, tw, th, text) in self.texts
+                 if tx >= x and ty >= y and tx + tw <= x + w and ty + th <= y + h]
+        text = "\n".join(text for (ty, tx, text) in sorted(lines))
+        whitelist = whitelist if whitelist is not None else self.whitelist
+        if whitelist is not None:
+            text = "".join(char for char in text if char in whitelist or char.isspace())
+        return text
+
+    def read_words(self, frame):
+        """Returns the words of the texts added with `add_text` lying within ``frame``, each
+        given a share of the width of its text proportional to its length."""
+        (x, y, w, h) = self.matcher.frame_bounds(frame)
+        words = []
+        for (tx, ty, tw, th, text) in self.texts:
+            if tx >= x and ty >= y and tx + tw <= x + w and ty + th <= y + h:
+                position = 0
+                for word in text.split(' '):
+                    if word:
+                        words.append((word, tx + tw * position // len(text), ty, max(tw * len(word) // len(text), 1), th))
+                    position += len(word) + 1
+        return words
+
+    def set_ocr_whitelist(self, characters):
+        self.whitelist = characters
+
+    def reset_text_recognizer(self):
+        self.whitelist = None
+
+    # Mouse
+
+    def click(self, target=None):
+        self._record('click', *self._point(target))
+
+    def double_click(self, target=None):
+        self._record('double_click', *self._point(target))
+
+    def right_click(self, target=None):
+        self._record('right_click', *self._point(target))
+
+    def hover(self, target=None):
+        self._record('hover', *self._point(target))
+
+    def highlight(self, target, seconds):
+        self.events.append(('highlight',) + region_bounds(self._bounds(target)) + (float(seconds),))
+
+    def mouse_move(self, x, y):
+        self._record('mouse_move', int(x), int(y))
+
+    def mouse_down(self, button):
+        self.events.append(('mouse_down', button) + self.mouse)
+
+    def mouse_up(self, button):
+        self.events.append(('mouse_up', button) + self.mouse)
+
+    def drag(self, target):
+        self._record('drag', *self._point(target))
+
+    def drop_at(self, target):
+        self._record('drop', *self._point(target))
+
+    def wheel(self, direction, steps, target=None):
+        if target is not None:
+            self.hover(target)
+        self.events.append(('wheel', direction, int(steps)) + self.mouse)
+
+    # Keyboard
+
+    def key(self, name):
+        return '{%s}' % (name)
+
+    def type(self, text, modifiers=None, target=None):
+        if target is not None:
+            self.click(target)
+        self.events.append(('type', text, modifiers))
+
+    def paste(self, text, target=None):
+        if target is not None:
+            self.click(target)
+        self._clipboard = text
+        self.events.append(('paste', text))
+
+    def clipboard(self):
+        return self._clipboard
+
+    # Applications and operating system
+
+    def focused_window(self):
+        if self.focused is None:
+            return self.screens[0]
+        return self.apps[self.focused].coordinates
+
+    def app_window(self, name):
+        return self._get_app(name).coordinates
+
+    def app_window_title(self, name):
+        return self._get_app(name).title
+
+    def focus_app(self, name):
+        self._get_app(name)
+        self.focused = name
+        self.events.append(('focus', name))
+
+    def open_app(self, path):
+        name = os.path.splitext(os.path.basename(path))[0]
+        if name not in self.apps:
+            self.add_app(name, *self.screens[0])
+        self.apps[name].running = True
+        self.focused = name
+        self.events.append(('open', path))
+
+    def close_app(self, name):
+        if name in self.apps:
+            self.apps[name].running = False
+        if self.focused == name:
+            self.focused = None
+        self.events.append(('close', name))
+
+    def app_is_running(self, name):
+        return name in self.apps and self.apps[name].running
+
+    def app_has_window(self, name):
+        return self.app_is_running(name)
+
+    def app_pid(self, name):
+        return self._get_app(name).pid
+
+    def app_name(self, name):
+        return self._get_app(name).name
+
+    def run(self, command):
+        self.events.append(('run', command))
+        return ''
+
+    def os_type(self):
+        return 'LINUX'
+
+    def os_version(self):
+        return platform.release()
+
+    # Private
+
+    def _get_app(self, name):
+        app = self.apps.get(name)
+        if app is None or not app.running:
+            raise FindFailed("Application '%s' not found." % (name))
+        return app
+
+    def _record(self, action, x, y):
+        self.mouse = (x, y)
+        self.events.append((action, x, y))
+
+    def _bounds(self, target):
+        if target is None:
+            target = self.matcher.last_match
+            if target is None:
+                raise FindFailed("There is no last match.")
+        return target
+
+    def _point(self, target):
+        target = self._bounds(target)
+        if hasattr(target, 'getTarget'):
+            return target.getTarget()
+        (x, y, w, h) = region_bounds(target)
+        return (x + w // 2, y + h // 2)
+
+    def _to_pixels(self, image):
+        if isinstance(image, basestring):
+            image = read_image(image)
+        pixels = numpy.asarray(image)
+        if pixels.ndim == 2:
+            pixels = numpy.dstack([pixels] * 3)
+        return pixels[..., :3]
+
+def image_formats():
+    """Returns the names of the image formats Pillow can write."""
+    _require_pillow()
+    Image.init()
+    formats = set(name.lower() for name in Image.SAVE)
+    if 'jpeg' in formats:
+        formats.add('jpg')
+    return sorted(formats)
+
+def save_image(image, destination, format, quality, max_size):
+    """Writes the Pillow ``image`` as described by `Backend.encode_image`."""
+    if max_size and max(image.size) > max_size:
+        scale = float(max_size) / max(image.size)
+        image = image.resize((max(int(image.size[0] * scale), 1), max(int(image.size[1] * scale), 1)),
+                             Image.BILINEAR)
+    format = 'jpeg' if format == 'jpg' else format
+    if format != 'png':
+        # Lossy formats do not support an alpha channel
+        image = image.convert('RGB')
+        image.save(destination, format.upper(), quality=int(quality))
+    else:
+        image.save(destination, 'PNG')
+
+def to_image(pixels):
+    _require_pillow()
+    return Image.fromarray(numpy.ascontiguousarray(pixels, dtype=numpy.uint8))
+
+def open_image(path):
+    _require_pillow()
+    return Image.open(path)
+
+def _require_pillow():
+    if Image is None:
+        raise ImportError("Backend images require the Pillow package.")
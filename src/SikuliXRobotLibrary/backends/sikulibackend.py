@@ -0,0 +1,250 @@
+import threading
+from sikuli import *
+from org.sikuli.natives import OCR
+from org.sikuli.script import TextRecognizer
+from java.awt import RenderingHints
+from java.awt.image import BufferedImage
+from java.io import File
+from javax.imageio import ImageIO, ImageWriteParam, IIOImage
+from javax.imageio.stream import FileImageOutputStream
+from SikuliXRobotLibrary.matchers import SikuliMatcher
+from backend import Backend
+
+class SikuliBackend(Backend):
+    """Backend driving the real screen, mouse and keyboard through the SikuliX runtime.
+
+    SikuliX has a single Tesseract recognizer per JVM, so text is read one region at a time.
+    """
+    parallel_ocr = False
+
+    WHEEL_DIRECTIONS = {'up': WHEEL_UP, 'down': WHEEL_DOWN}
+    BUTTONS = {'left': Button.LEFT, 'middle': Button.MIDDLE, 'right': Button.RIGHT}
+
+    def __init__(self):
+        Backend.__init__(self, SikuliMatcher())
+        Settings.OcrTextSearch = True
+        Settings.OcrTextRead = True
+        self.whitelist = None
+        self._ocr_lock = threading.Lock()
+
+    # Screens and search region
+
+    def screen_count(self):
+        return getNumberScreens()
+
+    def screen_coordinates(self, number):
+        screen = Screen(int(number))
+        return (screen.getX(), screen.getY(), screen.getW(), screen.getH())
+
+    def set_roi(self, x, y, w, h):
+        setROI(int(x), int(y), int(w), int(h))
+
+    def set_timeout(self, timeout):
+        Settings.AutoWaitTimeout = float(timeout)
+        Backend.set_timeout(self, timeout)
+
+    def set_scan_rate(self, scan_rate):
+        Settings.WaitScanRate = float(scan_rate)
+        Backend.set_scan_rate(self, scan_rate)
+
+    def add_image_path(self, path):
+        addImagePath(path)
+
+    # Capturing and text recognition
+
+    def capture(self, x, y, w, h):
+        return capture(x, y, w, h)
+
+    def image_formats(self):
+        return sorted(set(name.lower() for name in ImageIO.getWriterFormatNames()))
+
+    def encode_image(self, source, destination, format, quality, max_size):
+        image = ImageIO.read(File(source))
+        (width, height) = (image.getWidth(), image.getHeight())
+        scale = 1.0
+        if max_size and max(width, height) > max_size:
+            scale = float(max_size) / max(width, height)
+        if scale < 1.0 or format != 'png':
+            # Lossy formats do not support an alpha channel
+            encoded = BufferedImage(max(int(width * scale), 1), max(int(height * scale), 1), BufferedImage.TYPE_INT_RGB)
+            graphics = encoded.createGraphics()
+            try:
+                graphics.setRenderingHint(RenderingHints.KEY_INTERPOLATION, RenderingHints.VALUE_INTERPOLATION_BILINEAR)
+                graphics.drawImage(image, 0, 0, encoded.getWidth(), encoded.getHeight(), None)
+            finally:
+                graphics.dispose()
+            image = encoded
+        writer = ImageIO.getImageWritersByFormatName(format).next()
+        param = writer.getDefaultWriteParam()
+        if format != 'png' and param.canWriteCompressed():
+            param.setCompressionMode(ImageWriteParam.MODE_EXPLICIT)
+            if param.getCompressionTypes():
+                param.setCompressionType(param.getCompressionTypes()[0])
+            param.setCompressionQuality(quality / 100.0)
+        output = FileImageOutputStream(File(destination))
+        try:
+            writer.setOutput(output)
+            writer.write(None, IIOImage(image, None, None), param)
+        finally:
+            output.close()
+            writer.dispose()
+
+    def read_text(self, frame, whitelist=None):
+        # The Tesseract instance and its parameters are shared by the whole JVM
+        with self._ocr_lock:
+            if whitelist is None or whitelist == self.whitelist:
+                return TextRecognizer.getInstance().recognize(frame)
+            OCR.setParameter("tessedit_char_whitelist", whitelist)
+            try:
+                return TextRecognizer.getInstance().recognize(frame)
+            finally:
+                OCR.setParameter("tessedit_char_whitelist", self.whitelist or "")
+
+    def read_words(self, frame):
+        roi = frame.getROI()
+        with self._ocr_lock:
+            # Recognizing the captured image, the words are translated to the screen by the parent region
+            words = TextRecognizer.getInstance().listText(frame, Region(roi.x, roi.y, roi.width, roi.height))
+        return [(word.getText(), word.getX(), word.getY(), word.getW(), word.getH()) for word in words]
+
+    def set_ocr_whitelist(self, characters):
+        with self._ocr_lock:
+            OCR.setParameter("tessedit_char_whitelist", characters)
+            self.whitelist = characters
+
+    def reset_text_recognizer(self):
+        with self._ocr_lock:
+            TextRecognizer.reset()
+            TextRecognizer.getInstance()
+            self.whitelist = None
+
+    # Mouse
+
+    def click(self, target=None):
+        target = self._target(target)
+        if target is None:
+            return click()
+        return target.click()
+
+    def double_click(self, target=None):
+        target = self._target(target)
+        if target is None:
+            return doubleClick()
+        return target.doubleClick()
+
+    def right_click(self, target=None):
+        target = self._target(target)
+        if target is None:
+            return rightClick()
+        return target.rightClick()
+
+    def hover(self, target=None):
+        target = self._target(target)
+        if target is None:
+            return hover()
+        return target.hover()
+
+    def highlight(self, target, seconds):
+        target.highlight(float(seconds))
+
+    def mouse_move(self, x, y):
+        mouseMove(int(x), int(y))
+
+    def mouse_down(self, button):
+        mouseDown(self.BUTTONS.get(button, button))
+
+    def mouse_up(self, button):
+        mouseUp(self.BUTTONS.get(button, button))
+
+    def drag(self, target):
+        drag(target)
+
+    def drop_at(self, target):
+        dropAt(target)
+
+    def drag_drop(self, source, target):
+        dragDrop(source, target)
+
+    def wheel(self, direction, steps, target=None):
+        direction = self.WHEEL_DIRECTIONS.get(direction, direction)
+        if target is None:
+            return wheel(direction, steps)
+        return target.wheel(direction, steps)
+
+    # Keyboard
+
+    def key(self, name):
+        return getattr(Key, name, None)
+
+    def type(self, text, modifiers=None, target=None):
+        if target is not None:
+            if modifiers is None:
+                return target.type(text)
+            return target.type(text, modifiers)
+        if modifiers is None:
+            return type(text)
+        return type(text, modifiers)
+
+    def paste(self, text, target=None):
+        if target is None:
+            return paste(text)
+        return target.paste(text)
+
+    def clipboard(self):
+        return str(Env.getClipboard())
+
+    # Applications and operating system
+
+    def focused_window(self):
+        return self._to_coordinates(App.focusedWindow())
+
+    def app_window(self, name):
+        return self._to_coordinates(App(name).window())
+
+    def app_window_title(self, name):
+        return App(name).getWindow()
+
+    def focus_app(self, name):
+        App(name).focus()
+
+    def switch_app(self, name):
+        switchApp(name)
+
+    def open_app(self, path):
+        App.open(path)
+
+    def close_app(self, name):
+        App.close(name)
+
+    def app_is_running(self, name):
+        return App(name).isRunning()
+
+    def app_has_window(self, name):
+        return App(name).hasWindow()
+
+    def app_pid(self, name):
+        return App(name).getPID()
+
+    def app_name(self, name):
+        return App(name).getName()
+
+    def run(self, command):
+        return run(command)
+
+    def os_type(self):
+        return str(Env.getOS())
+
+    def os_version(self):
+        return str(Env.getOSVersion())
+
+    # Private
+
+    def _target(self, target):
+        """Returns ``target`` or, without one, the last match of the matcher. Searches of captured
+        frames and of regions other than ``SCREEN`` do not update the last match of ``SCREEN``."""
+        if target is None:
+            return self.matcher.last_match
+        return target
+
+    def _to_coordinates(self, region):
+        return (region.getX(), region.getY(), region.getW(), region.getH())
@@ -0,0 +1,195 @@
+import os
+import platform
+import tempfile
+import threading
+
+from SikuliXRobotLibrary.matchers.numpymatcher import NumpyMatcher, to_grayscale
+from backend import Backend, UnsupportedOperation
+from fakebackend import image_formats, open_image, save_image, to_image
+from xshm import XShmCapture
+
+class X11Backend(Backend):
+    """CPython backend searching the live screen of an X11 display, e.g. Xvfb on Linux.
+
+    The screen is read with an `XShmCapture`, which makes the X server write the pixels into
+    one shared memory segment reused for every capture. Searches transfer only their search
+    region and convert it to grayscale straight from the shared memory, and screenshots are
+    encoded from an in-memory copy of the region without a temporary file. ``display``
+    defaults to ``$DISPLAY``.
+
+    The backend only captures: mouse, keyboard, application and text recognition actions
+    raise `UnsupportedOperation`, so tests drive the applications on the display themselves.
+    The window in focus is the whole screen.
+    """
+
+    def __init__(self, display=None, timeout=3.0, scan_rate=3.0):
+        self.capturer = XShmCapture(display)
+        # The shared memory is overwritten by every capture
+        self._capture_lock = threading.Lock()
+        Backend.__init__(self, NumpyMatcher(None, timeout, scan_rate))
+        self.matcher.region_source = self._grab
+        self.screens = [(0, 0) + self.capturer.size]
+        self.matcher.set_roi(*self.screens[0])
+
+    # Public
+
+    def close(self):
+        self.capturer.close()
+
+    # Screens and search region
+
+    def screen_count(self):
+        return len(self.screens)
+
+    def screen_coordinates(self, number):
+        return self.screens[int(number)]
+
+    def set_roi(self, x, y, w, h):
+        self.matcher.set_roi(x, y, w, h)
+
+    def add_image_path(self, path):
+        self.matcher.add_image_directory(path)
+
+    # Capturing and text recognition
+
+    def capture(self, x, y, w, h):
+        (handle, path) = tempfile.mkstemp(suffix='.png', prefix='sikulix-x11-')
+        os.close(handle)
+        to_image(self.capture_pixels(x, y, w, h)).save(path, 'PNG')
+        return path
+
+    def capture_pixels(self, x, y, w, h):
+        with self._capture_lock:
+            (pixels, left, top) = self._grab_bgrx(x, y, w, h)
+            # Screenshots are written later, copy the pixels out of the shared memory
+            return pixels[..., 2::-1].copy()
+
+    def encode_pixels(self, pixels, destination, format, quality, max_size):
+        save_image(to_image(pixels), destination, format, quality, max_size)
+
+    def image_formats(self):
+        return image_formats()
+
+    def encode_image(self, source, destination, format, quality, max_size):
+        save_image(open_image(source), destination, format, quality, max_size)
+
+    def read_text(self, frame, whitelist=None):
+        self._unsupported("Text recognition")
+
+    def read_words(self, frame):
+        self._unsupported("Text recognition")
+
+    def set_ocr_whitelist(self, characters):
+        self._unsupported("Text recognition")
+
+    def reset_text_recognizer(self):
+        self._unsupported("Text recognition")
+
+    # Mouse
+
+    def click(self, target=None):
+        self._unsupported("Mouse input")
+
+    def double_click(self, target=None):
+        self._unsupported("Mouse input")
+
+    def right_click(self, target=None):
+        self._unsupported("Mouse input")
+
+    def hover(self, target=None):
+        self._unsupported("Mouse input")
+
+    def highlight(self, target, seconds):
+        self._unsupported("Highlighting")
+
+    def mouse_move(self, x, y):
+        self._unsupported("Mouse input")
+
+    def mouse_down(self, button):
+        self._unsupported("Mouse input")
+
+    def mouse_up(self, button):
+        self._unsupported("Mouse input")
+
+    def drag(self, target):
+        self._unsupported("Mouse input")
+
+    def drop_at(self, target):
+        self._unsupported("Mouse input")
+
+    def wheel(self, direction, steps, target=None):
+        self._unsupported("Mouse input")
+
+    # Keyboard
+
+    def key(self, name):
+        self._unsupported("Keyboard input")
+
+    def type(self, text, modifiers=None, target=None):
+        self._unsupported("Keyboard input")
+
+    def paste(self, text, target=None):
+        self._unsupported("Keyboard input")
+
+    def clipboard(self):
+        self._unsupported("Clipboard access")
+
+    # Applications and operating system
+
+    def focused_window(self):
+        return self.screens[0]
+
+    def app_window(self, name):
+        self._unsupported("Application control")
+
+    def app_window_title(self, name):
+        self._unsupported("Application control")
+
+    def focus_app(self, name):
+        self._unsupported("Application control")
+
+    def open_app(self, path):
+        self._unsupported("Application control")
+
+    def close_app(self, name):
+        self._unsupported("Application control")
+
+    def app_is_running(self, name):
+        self._unsupported("Application control")
+
+    def app_has_window(self, name):
+        self._unsupported("Application control")
+
+    def app_pid(self, name):
+        self._unsupported("Application control")
+
+    def app_name(self, name):
+        self._unsupported("Application control")
+
+    def run(self, command):
+        self._unsupported("Running commands")
+
+    def os_type(self):
+        return 'LINUX'
+
+    def os_version(self):
+        return platform.release()
+
+    # Private
+
+    def _unsupported(self, action):
+        raise UnsupportedOperation("%s is not supported by the x11 backend, which only captures X display '%s'."
+                                   % (action, self.capturer.display_name))
+
+    def _grab(self, x, y, w, h):
+        """Returns the part of the rectangle on the screen in grayscale with its position."""
+        with self._capture_lock:
+            (pixels, left, top) = self._grab_bgrx(x, y, w, h)
+            return (to_grayscale(pixels[..., 2::-1]), left, top)
+
+    def _grab_bgrx(self, x, y, w, h):
+        (x, y, w, h) = (int(x), int(y), int(w), int(h))
+        # Regions may reach beyond the screen, e.g. padded search windows
+        (left, top) = (min(max(x, 0), self.capturer.width), min(max(y, 0), self.capturer.height))
+        (right, bottom) = (max(min(x + w, self.capturer.width), left), max(min(y + h, self.capturer.height), top))
+        return (self.capturer.grab(left, top, right - left, bottom - top), left, top)
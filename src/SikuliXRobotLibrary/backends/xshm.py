@@ -0,0 +1,186 @@
+import os
+
+try:
+    import ctypes
+    import ctypes.util
+except ImportError:
+    # Jython has no ctypes
+    ctypes = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+ZPIXMAP = 2
+ALL_PLANES = 0xffffffff
+IPC_PRIVATE = 0
+IPC_CREAT = 0o1000
+IPC_RMID = 0
+
+if ctypes is not None:
+
+    class XImage(ctypes.Structure):
+        _fields_ = [('width', ctypes.c_int),
+                    ('height', ctypes.c_int),
+                    ('xoffset', ctypes.c_int),
+                    ('format', ctypes.c_int),
+                    ('data', ctypes.c_void_p),
+                    ('byte_order', ctypes.c_int),
+                    ('bitmap_unit', ctypes.c_int),
+                    ('bitmap_bit_order', ctypes.c_int),
+                    ('bitmap_pad', ctypes.c_int),
+                    ('depth', ctypes.c_int),
+                    ('bytes_per_line', ctypes.c_int),
+                    ('bits_per_pixel', ctypes.c_int),
+                    ('red_mask', ctypes.c_ulong),
+                    ('green_mask', ctypes.c_ulong),
+                    ('blue_mask', ctypes.c_ulong),
+                    ('obdata', ctypes.c_void_p),
+                    ('functions', ctypes.c_void_p * 6)]
+
+    class XShmSegmentInfo(ctypes.Structure):
+        _fields_ = [('shmseg', ctypes.c_ulong),
+                    ('shmid', ctypes.c_int),
+                    ('shmaddr', ctypes.c_void_p),
+                    ('readOnly', ctypes.c_int)]
+
+class XShmCapture(object):
+    """Captures the root window of an X11 display through the MIT shared memory extension.
+
+    One shared memory segment the size of the screen is attached when the capture is created
+    and every `grab` makes the X server write the requested rectangle straight into it, so a
+    capture costs no socket transfer, no allocation and no copy. `grab` returns a NumPy view
+    of the segment that stays valid until the next `grab`; callers needing the pixels longer
+    must copy them. Only 32 bits per pixel TrueColor screens, as Xvfb and Xorg use at depth
+    24, are supported.
+    """
+
+    def __init__(self, display=None):
+        if ctypes is None or numpy is None:
+            raise ImportError("XShmCapture requires ctypes and the numpy package.")
+        self._xlib = self._load_library('X11')
+        self._xext = self._load_library('Xext')
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._declare_functions()
+        self.display_name = display or os.environ.get('DISPLAY')
+        self._display = self._xlib.XOpenDisplay(self.display_name.encode('ascii') if self.display_name else None)
+        if not self._display:
+            raise IOError("Cannot open X display '%s'." % (self.display_name))
+        self._image = None
+        self._segment = None
+        try:
+            self._attach()
+        except Exception:
+            self.close()
+            raise
+
+    # Public
+
+    @property
+    def size(self):
+        return (self.width, self.height)
+
+    def grab(self, x, y, w, h):
+        """Returns the rectangle, which must lie within the screen, as an ``(h, w, 4)`` uint8
+        view in BGRX order."""
+        (x, y, w, h) = (int(x), int(y), int(w), int(h))
+        if x < 0 or y < 0 or x + w > self.width or y + h > self.height:
+            raise ValueError("Rectangle (%d, %d, %d, %d) is not within the %dx%d screen."
+                             % (x, y, w, h, self.width, self.height))
+        if w <= 0 or h <= 0:
+            return self._buffer[:0].reshape(0, 0, 4)
+        image = self._image.contents
+        # The server writes only the rectangle, packed with no padding at 32 bits per pixel
+        (image.width, image.height, image.bytes_per_line) = (w, h, w * 4)
+        if not self._xext.XShmGetImage(self._display, self._root, self._image, x, y, ALL_PLANES):
+            raise IOError("Capturing (%d, %d, %d, %d) from X display '%s' failed."
+                          % (x, y, w, h, self.display_name))
+        return self._buffer[:w * h * 4].reshape(h, w, 4)
+
+    def close(self):
+        if self._segment is not None:
+            self._xext.XShmDetach(self._display, ctypes.byref(self._segment))
+            self._xlib.XSync(self._display, 0)
+            self._libc.shmdt(ctypes.c_void_p(self._segment.shmaddr))
+            self._segment = None
+        if self._image is not None:
+            # The pixels belong to the segment, only the structure is freed
+            self._xlib.XFree(self._image)
+            self._image = None
+        if self._display:
+            self._xlib.XCloseDisplay(self._display)
+            self._display = None
+
+    # Private
+
+    def _load_library(self, name):
+        path = ctypes.util.find_library(name)
+        if path is None:
+            raise ImportError("XShmCapture requires the lib%s library." % (name))
+        return ctypes.CDLL(path)
+
+    def _declare_functions(self):
+        (display, pointer) = (ctypes.c_void_p, ctypes.c_void_p)
+        image = ctypes.POINTER(XImage)
+        segment = ctypes.POINTER(XShmSegmentInfo)
+        self._declare(self._xlib, 'XOpenDisplay', display, [ctypes.c_char_p])
+        self._declare(self._xlib, 'XCloseDisplay', ctypes.c_int, [display])
+        self._declare(self._xlib, 'XDefaultScreen', ctypes.c_int, [display])
+        self._declare(self._xlib, 'XRootWindow', ctypes.c_ulong, [display, ctypes.c_int])
+        self._declare(self._xlib, 'XDefaultVisual', pointer, [display, ctypes.c_int])
+        self._declare(self._xlib, 'XDefaultDepth', ctypes.c_int, [display, ctypes.c_int])
+        self._declare(self._xlib, 'XDisplayWidth', ctypes.c_int, [display, ctypes.c_int])
+        self._declare(self._xlib, 'XDisplayHeight', ctypes.c_int, [display, ctypes.c_int])
+        self._declare(self._xlib, 'XSync', ctypes.c_int, [display, ctypes.c_int])
+        self._declare(self._xlib, 'XFree', ctypes.c_int, [pointer])
+        self._declare(self._xext, 'XShmQueryExtension', ctypes.c_int, [display])
+        self._declare(self._xext, 'XShmCreateImage', image,
+                      [display, pointer, ctypes.c_uint, ctypes.c_int, pointer, segment, ctypes.c_uint, ctypes.c_uint])
+        self._declare(self._xext, 'XShmAttach', ctypes.c_int, [display, segment])
+        self._declare(self._xext, 'XShmDetach', ctypes.c_int, [display, segment])
+        self._declare(self._xext, 'XShmGetImage', ctypes.c_int,
+                      [display, ctypes.c_ulong, image, ctypes.c_int, ctypes.c_int, ctypes.c_ulong])
+        self._declare(self._libc, 'shmget', ctypes.c_int, [ctypes.c_int, ctypes.c_size_t, ctypes.c_int])
+        self._declare(self._libc, 'shmat', pointer, [ctypes.c_int, pointer, ctypes.c_int])
+        self._declare(self._libc, 'shmdt', ctypes.c_int, [pointer])
+        self._declare(self._libc, 'shmctl', ctypes.c_int, [ctypes.c_int, ctypes.c_int, pointer])
+
+    def _declare(self, library, name, restype, argtypes):
+        function = getattr(library, name)
+        function.restype = restype
+        function.argtypes = argtypes
+
+    def _attach(self):
+        if not self._xext.XShmQueryExtension(self._display):
+            raise IOError("X display '%s' does not support the MIT-SHM extension." % (self.display_name))
+        screen = self._xlib.XDefaultScreen(self._display)
+        self._root = self._xlib.XRootWindow(self._display, screen)
+        self.width = self._xlib.XDisplayWidth(self._display, screen)
+        self.height = self._xlib.XDisplayHeight(self._display, screen)
+        segment = XShmSegmentInfo()
+        image = self._xext.XShmCreateImage(self._display, self._xlib.XDefaultVisual(self._display, screen),
+                                           self._xlib.XDefaultDepth(self._display, screen), ZPIXMAP, None,
+                                           ctypes.byref(segment), self.width, self.height)
+        if not image:
+            raise IOError("Creating a shared memory image on X display '%s' failed." % (self.display_name))
+        self._image = image
+        if image.contents.bits_per_pixel != 32:
+            raise IOError("X display '%s' uses %d bits per pixel, only 32 are supported."
+                          % (self.display_name, image.contents.bits_per_pixel))
+        size = image.contents.bytes_per_line * image.contents.height
+        segment.shmid = self._libc.shmget(IPC_PRIVATE, size, IPC_CREAT | 0o600)
+        if segment.shmid < 0:
+            raise IOError(ctypes.get_errno(), "Allocating %d bytes of shared memory failed." % (size))
+        address = self._libc.shmat(segment.shmid, None, 0)
+        if address is None or address == ctypes.c_void_p(-1).value:
+            self._libc.shmctl(segment.shmid, IPC_RMID, None)
+            raise IOError(ctypes.get_errno(), "Attaching shared memory segment %d failed." % (segment.shmid))
+        (segment.shmaddr, segment.readOnly) = (address, 0)
+        image.contents.data = address
+        self._xext.XShmAttach(self._display, ctypes.byref(segment))
+        self._xlib.XSync(self._display, 0)
+        # The segment is freed once both the server and this process have detached from it
+        self._libc.shmctl(segment.shmid, IPC_RMID, None)
+        self._segment = segment
+        self._buffer = numpy.frombuffer((ctypes.c_ubyte * size).from_address(address), dtype=numpy.uint8)
@@ -1,5 +1,6 @@
 from _application import _ApplicationKeywords
 from _assertions import _AssertionKeywords
+from _backend import _BackendKeywords
 from _element import _ElementKeywords
 from _imagelibrary import _ImageLibraryKeywords
 from _keyboardactions import _KeyboardActionsKeywords
@@ -14,6 +15,7 @@ from _waiting import _WaitingKeywords
 __all__ = [
     "_ApplicationKeywords",
     "_AssertionKeywords",
+    "_BackendKeywords",
     "_ElementKeywords",
     "_ImageLibraryKeywords",
     "_KeyboardActionsKeywords",
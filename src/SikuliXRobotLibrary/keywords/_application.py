@@ -1,6 +1,6 @@
-from sikuli import *
 import os
 from keywordgroup import KeywordGroup
+from SikuliXRobotLibrary.matchers import FindFailed
 
 class _ApplicationKeywords(KeywordGroup):
     def __init__(self):
@@ -17,8 +17,9 @@ class _ApplicationKeywords(KeywordGroup):
         """
         self._info("Setting focus at application '%s'." % app_name)
         self._set_application_name(app_name)
+        self._invalidate_active_app_cache()
         try:
-            App(self.application_name).focus()
+            self._backend.focus_app(self.application_name)
         except FindFailed, err:
             raise AssertionError("Application '%s' not found." % (app_name))
 
@@ -31,8 +32,9 @@ class _ApplicationKeywords(KeywordGroup):
         """
         self._info("Switching focus to application '%s'." % app_name)
         self._set_application_name(app_name)
+        self._invalidate_active_app_cache()
         try:
-            switchApp(self.application_name)
+            self._backend.switch_app(self.application_name)
         except FindFailed, err:
             raise AssertionError("Application '%s' not found." % (app_name))
 
@@ -50,11 +52,12 @@ class _ApplicationKeywords(KeywordGroup):
         if os.path.exists(path):
             self._set_application_path(path)
             self._set_application_name(app_name)
+            self._invalidate_active_app_cache()
 
-            if not App(self.application_name).isRunning():
-                App(self.application_path).open()
+            if not self._backend.app_is_running(self.application_name):
+                self._backend.open_app(self.application_path)
             else:
-                App(app_name).focus()
+                self._backend.focus_app(app_name)
         else:
             raise AssertionError("Application path '%s' not found." % (path))
 
@@ -65,7 +68,8 @@ class _ApplicationKeywords(KeywordGroup):
         """
         self._info("Closing application '%s'." % app_name)
         self._set_application_name(app_name)
-        App.close(self.application_name)
+        self._invalidate_active_app_cache()
+        self._backend.close_app(self.application_name)
 
     def open_application(self, application_path):
         """opens the application matching the given ``application_path``.
@@ -73,7 +77,8 @@ class _ApplicationKeywords(KeywordGroup):
         See also `Check And Open Application`, `Close Application` and `Application Is Running`
         """
         if os.path.exists(application_path):
-            App.open(application_path)
+            self._invalidate_active_app_cache()
+            self._backend.open_app(application_path)
         else:
             raise AssertionError("Application path '%s' not found." % (application_path))
 
@@ -82,7 +87,7 @@ class _ApplicationKeywords(KeywordGroup):
 
         See also `Check And Open Application`, `Close Application`, and `Open Application`.
         """
-        return App(app_name).isRunning()
+        return self._backend.app_is_running(app_name)
 
     def run_command(self, command):
         """Runs a command, script or application path as specified in `command`.
@@ -90,7 +95,7 @@ class _ApplicationKeywords(KeywordGroup):
         Example:
         | Run Command | control appwiz.cpl | # Opens the Windows Control Panel > Programs and Features window. |
         """
-        run(command)
+        self._backend.run(command)
 
     def app_has_window(self, app_name):
         """Returns `True` if application's window or dialog as specified in `app_name` is open,
@@ -100,7 +105,7 @@ class _ApplicationKeywords(KeywordGroup):
         Example:
         | App Has Window | Calculator | # Returns `True` if Calculator app is running in windows, else `False`. |
         """
-        return App(app_name).hasWindow()
+        return self._backend.app_has_window(app_name)
 
     def app_get_process_ID(self, app_name):
         """Returns the application's process ID as number if app is running, -1 otherwise.
@@ -110,7 +115,7 @@ class _ApplicationKeywords(KeywordGroup):
         Example:
         | App Get Process ID | Calculator | # Returns a PID number if Calculator app is running in windows, else `-1`. |
         """
-        return App(app_name).getPID()
+        return self._backend.app_pid(app_name)
 
     def app_get_name(self, app_name):
         """Returns the application's short name as show in the process list.
@@ -120,7 +125,7 @@ class _ApplicationKeywords(KeywordGroup):
         Example:
         | App Get Name | Calculator | # Returns `calc.exe` if Calculator app is running in windows. |
         """
-        return App(app_name).getName()
+        return self._backend.app_name(app_name)
 
 
     def app_get_window(self, app_name):
@@ -132,7 +137,7 @@ class _ApplicationKeywords(KeywordGroup):
         Example:
         | App Get Window | Calculator | # Returns `Calculator` if Calculator app is running in windows. |
         """
-        return App(app_name).getWindow()
+        return self._backend.app_window_title(app_name)
 
     # Private
     """***************************** Internal Methods ************************************"""
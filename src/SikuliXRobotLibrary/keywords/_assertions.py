@@ -1,4 +1,3 @@
-from sikuli import *
 from SikuliXRobotLibrary.locators import PatternFinder
 from SikuliXRobotLibrary import utils
 from keywordgroup import KeywordGroup
@@ -28,7 +27,7 @@ class _AssertionKeywords(KeywordGroup):
         self._info("Asserting that pattern, '%s' is visible in app." % (pattern))
         self.set_search_region_to_active_app()
         try:
-            assert exists(self._pattern_finder._find_pattern(pattern))
+            assert self._pattern_exists(pattern)
         except AssertionError, err:
             raise AssertionError("No matching pattern: %s found in search region." % (pattern))
 
@@ -56,7 +55,7 @@ class _AssertionKeywords(KeywordGroup):
         """
         self._info("Asserting that pattern, '%s' is visible in specified ROI or search region." % (pattern))
         try:
-            assert exists(self._pattern_finder._find_pattern(pattern))
+            assert self._pattern_exists(pattern)
         except AssertionError, err:
             raise AssertionError("No matching pattern: %s found in search region." % (pattern))
 
@@ -78,7 +77,7 @@ class _AssertionKeywords(KeywordGroup):
         self._info("Asserting that pattern, '%s' is not visible in app." % (pattern))
         self.set_search_region_to_active_app()
         try:
-            assert not exists(self._pattern_finder._find_pattern(pattern))
+            assert not self._pattern_exists(pattern)
         except AssertionError, err:
             raise AssertionError("Pattern: %s is visible in search region." % (pattern))
 
@@ -107,6 +106,34 @@ class _AssertionKeywords(KeywordGroup):
         """
         self._info("Asserting that pattern, '%s' is not visible in app." % (pattern))
         try:
-            assert not exists(self._pattern_finder._find_pattern(pattern))
+            assert not self._pattern_exists(pattern)
         except AssertionError, err:
-            raise AssertionError("Pattern: %s is visible in search region." % (pattern))
\ No newline at end of file
+            raise AssertionError("Pattern: %s is visible in search region." % (pattern))
+
+    def assert_patterns_are_visible(self, *patterns):
+        """Assert that all ``patterns`` are visible in one capture of the search region.
+        See `introduction` for details about locating elements.
+
+        The search region is captured once and all ``patterns`` are matched against that capture,
+        which is faster than asserting the ``patterns`` one by one and checks them against the
+        same state of the screen. Fails listing every ``pattern`` that was not found.
+
+        See also `Find Patterns` and `Assert Pattern Is Visible In Region`.
+
+        Example:
+        | Set Search Region To Active App |             |                |               |
+        | Assert Patterns Are Visible     | title.png   | ok.png = 0.90  | cancel.png    |
+        """
+        self._info("Asserting that patterns '%s' are visible in specified ROI or search region." % ("', '".join(patterns)))
+        matches = self._find_patterns(patterns)
+        missing = [pattern for pattern in patterns if matches[pattern] is None]
+        if missing:
+            raise AssertionError("No matching pattern(s): %s found in search region." % (", ".join(missing)))
+
+    # Private
+
+    def _pattern_exists(self, pattern):
+        locator = self._pattern_finder.compile(pattern)
+        match = self._matcher.exists(locator)
+        self._location_hints.remember(self._matcher, locator, match)
+        return match
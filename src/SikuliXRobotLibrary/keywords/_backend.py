@@ -0,0 +1,39 @@
+from SikuliXRobotLibrary import backends
+from SikuliXRobotLibrary.matchers.matcher import parse_pyramid_setting
+from keywordgroup import KeywordGroup
+
+class _BackendKeywords(KeywordGroup):
+
+    def __init__(self):
+        self._backend = None
+
+    # Public
+
+    def get_backend(self):
+        """Returns the backend that drives the screen, mouse, keyboard and applications.
+
+        The backend is selected with the `backend` argument in `importing`. With the ``fake``
+        backend the returned object is used to paint the fake screen and to check the recorded
+        mouse and keyboard events.
+
+        Example:
+        | ${backend}=             | Get Backend                  |
+        | Call Method             | ${backend}                   | draw        | ${IMAGES}${/}ok.png | 100 | 200 |
+        | Click Pattern           | ok.png                       |
+        | Should Be Equal         | ${backend.events[-1]}        | ${expected} |
+        """
+        return self._backend
+
+    # Private
+
+    def _set_backend(self, backend):
+        self._backend = backends.get_backend(backend)
+        self._matcher = self._backend.matcher
+
+    def _set_pyramid_search(self, pyramid_search):
+        if not self._matcher.supports_pyramid:
+            if parse_pyramid_setting(pyramid_search):
+                self._warn("Argument pyramid_search is ignored, the %s of the backend does not support pyramid search."
+                           % (type(self._matcher).__name__))
+            return
+        self._matcher.set_pyramid(pyramid_search)
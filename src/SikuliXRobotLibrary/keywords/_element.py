@@ -1,11 +1,18 @@
-from sikuli import *
 from SikuliXRobotLibrary.locators import PatternFinder
+from SikuliXRobotLibrary.matchers import FindFailed, LocationHints, MatchSetCache, ORDERS, ScreenSearch
+from SikuliXRobotLibrary.ocr import ScrollingText
 from SikuliXRobotLibrary import utils
 from keywordgroup import KeywordGroup
 
 class _ElementKeywords(KeywordGroup):
     def __init__(self):
         self._pattern_finder = PatternFinder()
+        self._location_hints = LocationHints()
+        self._match_sets = MatchSetCache()
+        self._pattern_order = 'xy'
+        self._pattern_order_tolerance = None
+        self._scrolling_text = ScrollingText()
+        self._screen_search = ScreenSearch()
 
     # Public
 
@@ -36,7 +43,8 @@ class _ElementKeywords(KeywordGroup):
         """
         reg = self.get_last_matching_region()
         self._info("Clicking specified ROI or search region '%s'" % (reg))
-        reg.click()
+        with utils.latency.phase('input'):
+            self._backend.click(reg)
 
     def double_click_region(self):
         """Double-clicks the center x,y coordinate of a specified ROI or search region.
@@ -55,7 +63,8 @@ class _ElementKeywords(KeywordGroup):
         """
         reg = self.get_last_matching_region()
         self._info("Double-clicking specified ROI or search region '%s'" % (reg))
-        reg.doubleClick()
+        with utils.latency.phase('input'):
+            self._backend.double_click(reg)
 
     def right_click_region(self):
         """Right-clicks the center x,y coordinate of a specified ROI or search region.
@@ -74,7 +83,8 @@ class _ElementKeywords(KeywordGroup):
         """
         reg = self.get_last_matching_region()
         self._info("Right-clicking specified ROI or search region '%s'" % (reg))
-        reg.rightClick()
+        with utils.latency.phase('input'):
+            self._backend.right_click(reg)
 
     def highlight_region(self, highlight_duration):
         """Highlights the specified ROI or search region for a specified ``highlight_duration`` in seconds.
@@ -92,7 +102,7 @@ class _ElementKeywords(KeywordGroup):
         """
         reg = self.get_last_matching_region()
         self._info("Highlighting specified ROI or search region '%s' for '%s' seconds" % (reg, highlight_duration))
-        reg.highlight(float(highlight_duration))
+        self._backend.highlight(reg, highlight_duration)
 
     def hover_at_region(self):
         """Hovers mouse pointer at center x,y coordinate of a specified ROI or search region.
@@ -111,7 +121,8 @@ class _ElementKeywords(KeywordGroup):
         """
         reg = self.get_last_matching_region()
         self._info("Hovering at specified ROI or search region '%s'" % (reg))
-        reg.hover()
+        with utils.latency.phase('input'):
+            self._backend.hover(reg)
 
 
     def type_text_at_region(self, text):
@@ -131,7 +142,8 @@ class _ElementKeywords(KeywordGroup):
         text = text.strip()
         reg = self.get_last_matching_region()
         self._info("Typing text '%s' at specified ROI or search region '%s'" % (text, reg))
-        reg.type(text)
+        with utils.latency.phase('input'):
+            self._backend.type(text, target=reg)
 
 
     def paste_text_at_region(self, text):
@@ -151,7 +163,8 @@ class _ElementKeywords(KeywordGroup):
         text = text.strip()
         reg = self.get_last_matching_region()
         self._info("Pasting text '%s' at specified ROI or search region '%s'" % (text, reg))
-        reg.paste(text)
+        with utils.latency.phase('input'):
+            self._backend.paste(text, reg)
 
     def click_last_match(self):
         """Left-clicks the center x,y coordinate of a last match.
@@ -163,7 +176,8 @@ class _ElementKeywords(KeywordGroup):
         | Click Last Match  | # Clicks the last matched pattern. |
         """
         self._info("Clicking last matched pattern.")
-        click()
+        with utils.latency.phase('input'):
+            self._backend.click()
 
     def double_click_last_match(self):
         """Double-clicks the center x,y coordinate of a last match.
@@ -175,7 +189,8 @@ class _ElementKeywords(KeywordGroup):
         | Double Click Last Match  | # Double-clicks the last matched pattern. |
         """
         self._info("Double-clicking last matched pattern.")
-        doubleClick()
+        with utils.latency.phase('input'):
+            self._backend.double_click()
 
     def right_click_last_match(self):
         """Right-clicks the center x,y coordinate of a last match.
@@ -187,7 +202,8 @@ class _ElementKeywords(KeywordGroup):
         | Right Click Last Match  | # Right-clicks the last matched pattern. |
         """
         self._info("Right-clicking last matched pattern.")
-        rightClick()
+        with utils.latency.phase('input'):
+            self._backend.right_click()
 
     def hover_at_last_match(self):
         """Double-clicks the center x,y coordinate of a last match.
@@ -199,7 +215,8 @@ class _ElementKeywords(KeywordGroup):
         | Hover At Last Match  | # Hovers at the last matched pattern. |
         """
         self._info("Hovering at last matched pattern.")
-        hover()
+        with utils.latency.phase('input'):
+            self._backend.hover()
 
     def click_pattern(self, pattern):
         """Perform a mouse `click` on the click point using the `left` button.
@@ -209,7 +226,8 @@ class _ElementKeywords(KeywordGroup):
         See `introduction` for details about locating elements.
         """
         self._info("Clicking element '%s'." % pattern)
-        self._pattern_find(pattern, None, None).click()
+        with utils.latency.phase('input'):
+            self._backend.click(self._pattern_find(pattern, None, None))
 
     def click_pattern_at_coordinates(self, pattern, xoffset, yoffset):
         """Perform a mouse `click` on the click point using the `left` button.
@@ -219,7 +237,8 @@ class _ElementKeywords(KeywordGroup):
         See `introduction` for details about locating elements.
         """
         self._info("Click element '%s' in coordinates '%s', '%s'." % (pattern, xoffset, yoffset))
-        self._pattern_find(pattern, xoffset, yoffset).click()
+        with utils.latency.phase('input'):
+            self._backend.click(self._pattern_find(pattern, xoffset, yoffset))
 
     def right_click_pattern(self, pattern):
         """Perform a mouse `click` on the click point using the `right` button.
@@ -229,7 +248,8 @@ class _ElementKeywords(KeywordGroup):
         See `introduction` for details about locating elements.
         """
         self._info("Right-clicking element '%s'." % pattern)
-        self._pattern_find(pattern, None, None).rightClick()
+        with utils.latency.phase('input'):
+            self._backend.right_click(self._pattern_find(pattern, None, None))
 
     def right_click_pattern_at_coordinates(self, pattern, xoffset, yoffset):
         """Perform a mouse `click` on the click point using the `right` button.
@@ -239,7 +259,8 @@ class _ElementKeywords(KeywordGroup):
         See `introduction` for details about locating elements.
         """
         self._info("Right-clicking element '%s' in coordinates '%s', '%s'." % (pattern, xoffset, yoffset))
-        self._pattern_find(pattern, xoffset, yoffset).rightClick()
+        with utils.latency.phase('input'):
+            self._backend.right_click(self._pattern_find(pattern, xoffset, yoffset))
 
     def double_click_pattern(self, pattern):
         """Perform a mouse `double-click` on the click point using the `left` button.
@@ -249,7 +270,8 @@ class _ElementKeywords(KeywordGroup):
         See `introduction` for details about locating elements.
         """
         self._info("Double-clicking element '%s'." % pattern)
-        self._pattern_find(pattern, None, None).doubleClick()
+        with utils.latency.phase('input'):
+            self._backend.double_click(self._pattern_find(pattern, None, None))
 
     def double_click_pattern_at_coordinates(self, pattern, xoffset, yoffset):
         """Perform a mouse `double-click` on the click point using the `left` button.
@@ -259,7 +281,8 @@ class _ElementKeywords(KeywordGroup):
         See `introduction` for details about locating elements.
         """
         self._info("Double-clicking element '%s' in coordinates '%s', '%s'." % (pattern, xoffset, yoffset))
-        self._pattern_find(pattern, xoffset, yoffset).doubleClick()
+        with utils.latency.phase('input'):
+            self._backend.double_click(self._pattern_find(pattern, xoffset, yoffset))
 
     def highlight_pattern(self, pattern, highlight_duration):
         """Highlight element identified by ``pattern`` for a specified ``highlight_duration`` in seconds.
@@ -271,7 +294,7 @@ class _ElementKeywords(KeywordGroup):
         | Highlight Pattern | pattern.png = 0.90 | 2   | This is a sample text. | # Type a text in element identified by pattern.png |
         """
         self._info("Highlighting element '%s' for '%s' second(s)." % (pattern, highlight_duration))
-        self._pattern_find(pattern, None, None).highlight(float(highlight_duration))
+        self._backend.highlight(self._pattern_find(pattern, None, None), float(highlight_duration))
 
     def hover_at_pattern(self, pattern):
         """Hover mouse pointer at center of element identified by ``pattern``.
@@ -280,7 +303,8 @@ class _ElementKeywords(KeywordGroup):
         See `introduction` for details about locating elements.
         """
         self._info("Hovering at element '%s'." % pattern)
-        self._pattern_find(pattern, None, None).hover()
+        with utils.latency.phase('input'):
+            self._backend.hover(self._pattern_find(pattern, None, None))
 
     def hover_at_pattern_at_coordinates(self, pattern, xoffset, yoffset):
         """Hover mouse pointer at `x/y` coordinates of the element identified by ``pattern``.
@@ -289,27 +313,31 @@ class _ElementKeywords(KeywordGroup):
         See `introduction` for details about locating elements.
         """
         self._info("Hovering at element '%s' in coordinates '%s', '%s'." % (pattern, xoffset, yoffset))
-        self._pattern_find(pattern, xoffset, yoffset).hover()
+        with utils.latency.phase('input'):
+            self._backend.hover(self._pattern_find(pattern, xoffset, yoffset))
 
     def move_mouse_at_coordinates(self, xoffset, yoffset):
         """Move mouse cursor coordinates at ``x/y`` coordinates of the `screen`.
         """
         self._info("Moving mouse at coordinates '%s', '%s'." % (xoffset, yoffset))
-        mouseMove(int(xoffset), int(yoffset))
+        with utils.latency.phase('input'):
+            self._backend.mouse_move(xoffset, yoffset)
 
     def mouse_button_down(self, mouse_button):
         """Press the ``left`` mouse button `down`. 
         Must be paired with `Mouse Button Up` keyword.
         """
         self._info("Mouse down at, '%s' button." % (mouse_button))
-        mouseDown(self._mouse_button(mouse_button))
+        with utils.latency.phase('input'):
+            self._backend.mouse_down(self._mouse_button(mouse_button))
 
     def mouse_button_up(self, mouse_button):
         """Release the mouse button previously pressed. 
         Must be paired with `Mouse Button Down` keyword.
         """
         self._info("Mouse up at, '%s' button." % (mouse_button))
-        mouseUp(self._mouse_button(mouse_button))
+        with utils.latency.phase('input'):
+            self._backend.mouse_up(self._mouse_button(mouse_button))
 
     def scroll_from_pattern(self, pattern, scroll):
         """Scroll up or down as specified by the `scroll step` at center of the element identified by ``pattern``.
@@ -359,7 +387,8 @@ class _ElementKeywords(KeywordGroup):
         | Drop At Pattern | pattern.png = 0.90 | # Drag at element identified by pattern.png |
         """
         self._info("Dragging element '%s'." % pattern)
-        drag(self._pattern_find(pattern, None, None))
+        with utils.latency.phase('input'):
+            self._backend.drag(self._pattern_find(pattern, None, None))
 
     def drop_at_pattern(self, pattern):
         """`Drag Pattern` and `Drop At Pattern` keywords must be used in pairs to complete a drag and drop action.
@@ -369,19 +398,22 @@ class _ElementKeywords(KeywordGroup):
         | Drop At Pattern | pattern.png | # Drag at element identified by pattern.png |
         """
         self._info("Dropping at element '%s'." % pattern)
-        dropAt(self._pattern_find(pattern, None, None))
+        with utils.latency.phase('input'):
+            self._backend.drop_at(self._pattern_find(pattern, None, None))
 
     def drag_pattern_in_coordinates(self, pattern, xoffset, yoffset):
         """Drag element at `x/y` coordinates of the element identified by ``pattern``.
         """
         self._info("Dragging element '%s' in coordinates '%s', '%s'." % (pattern, xoffset, yoffset))
-        drag(self._pattern_find(pattern, xoffset, yoffset))
+        with utils.latency.phase('input'):
+            self._backend.drag(self._pattern_find(pattern, xoffset, yoffset))
 
     def drop_pattern_at_coordinates(self, pattern, xoffset, yoffset):
         """Drop or release mouse button element at `x/y` coordinates of the element identified by ``pattern``.
         """
         self._info("Dropping element '%s' in coordinates '%s', '%s'." % (pattern, xoffset, yoffset))
-        dropAt(self._pattern_find(pattern, xoffset, yoffset))
+        with utils.latency.phase('input'):
+            self._backend.drop_at(self._pattern_find(pattern, xoffset, yoffset))
 
     def drag_and_drop_element(self, pattern1, pattern2):
         """Drag and drop an element identified by ``pattern1`` to another element identified by ``pattern2``.
@@ -390,7 +422,8 @@ class _ElementKeywords(KeywordGroup):
         | Drag and drop | pattern1.png = 0.90 | pattern2.png = 0.90 | # Drag element identified by pattern.png |
         """
         self._info("Performing drag and drop from element '%s' to element '%s'." % (pattern1, pattern2))
-        dragDrop(self._pattern_find(pattern1, None, None), self._pattern_find(pattern2, None, None))
+        with utils.latency.phase('input'):
+            self._backend.drag_drop(self._pattern_find(pattern1, None, None), self._pattern_find(pattern2, None, None))
 
     """***************************** KEYBOARD ACTIONS ************************************"""
     def paste_text_in_pattern(self, pattern, text):
@@ -401,7 +434,8 @@ class _ElementKeywords(KeywordGroup):
         """
         text = str(text)
         self._info("Pasting text '%s' in pattern '%s'." % (text, pattern))
-        self._pattern_find(pattern, None, None).paste(text)
+        with utils.latency.phase('input'):
+            self._backend.paste(text, self._pattern_find(pattern, None, None))
 
     def paste_text_in_pattern_at_coordinates(self, pattern, text, xoffset, yoffset):
 
@@ -410,7 +444,8 @@ class _ElementKeywords(KeywordGroup):
         | Paste Text In Pattern | pattern.png = 0.90 | 30 | 30 | This is a sample text. | # Paste a text in x/y coordinates of element identified by pattern.png |
         """
         self._info("Pasting text '%s' in '%s'  at coordinates '%s', '%s'." % (text, pattern, xoffset, yoffset))
-        self._pattern_find(pattern, xoffset, yoffset).paste(text)
+        with utils.latency.phase('input'):
+            self._backend.paste(text, self._pattern_find(pattern, xoffset, yoffset))
 
     def type_text_in_pattern(self, pattern, text):
         """Type a `text` in element identified by ``pattern``.
@@ -420,7 +455,8 @@ class _ElementKeywords(KeywordGroup):
         """
         text = str(text)
         self._info("Typing '%s' in pattern '%s'." % (text, pattern))
-        self._pattern_find(pattern, None, None).type(text)
+        with utils.latency.phase('input'):
+            self._backend.type(text, target=self._pattern_find(pattern, None, None))
 
     def type_text_in_pattern_at_coordinates(self, pattern, text, xoffset, yoffset):
         """Type a `text` at `x/y` coordinates of the element identified by ``pattern``.
@@ -429,7 +465,8 @@ class _ElementKeywords(KeywordGroup):
         | Type Text In Pattern | pattern.png = 0.90 | 30 | 30 | This is a sample text. | # Type a text in x/y coordinates of element identified by pattern.png |
         """
         self._info("Typing text '%s' in '%s'  at coordinates '%s', '%s'." % (text, pattern, xoffset, yoffset))
-        self._pattern_find(pattern, xoffset, yoffset).type(text)
+        with utils.latency.phase('input'):
+            self._backend.type(text, target=self._pattern_find(pattern, xoffset, yoffset))
 
     """***************************** READ TEXTS IN PATTERN ************************************
     Note: OCR tessdata should downloaded then put in a local directory
@@ -471,6 +508,62 @@ class _ElementKeywords(KeywordGroup):
         self._info("Getting texts from at '%s' of specified ROI." % (search_location))
         return self._read_text_in_region(search_location)
 
+    def get_scrolled_text_in_search_region(self):
+        """Returns all text read in the search region since `Reset Scrolled Text`, reading only the lines scrolled into view.
+
+        Useful to read a long list page by page with `Scroll From Pattern`. Every call compares the
+        search region with the previous call to find how far its content scrolled, reads only the
+        newly visible strip and adds its lines to the text read so far, at the bottom when scrolling
+        down and at the top when scrolling up. Nothing is read when the search region is unchanged.
+        Changing the search region starts over.
+
+        Example:
+        | Reset Scrolled Text                |                     |              |
+        | :FOR                               | ${page}             | IN RANGE     | 10 |
+        | \   Scroll From Pattern            | list.png            | down = 5     |    |
+        | \   ${text}=                       | Get Scrolled Text In Search Region |    |
+        """
+        self._info("Getting scrolled texts of specified ROI.")
+        return self._scrolling_text.read(self._matcher, self._matcher.get_roi(), self._read_text)
+
+    def reset_scrolled_text(self):
+        """Forgets the text read by `Get Scrolled Text In Search Region`."""
+        self._info("Resetting scrolled texts.")
+        self._scrolling_text.reset()
+
+    def get_text_grid(self, anchor, search_location, rows, columns, row_height=None, column_width=None):
+        """Returns the texts of a table as a list of ``rows`` lists of ``columns`` texts.
+
+        The table is the ``search location`` of ``anchor``, given as in `Get Text In Pattern`.
+        ``anchor`` is either a ``pattern``, e.g. the table header, or ``region`` for the search
+        region set with keywords like `Set New Search Region In Active App`. The table is split
+        into ``rows`` rows and ``columns`` columns of equal size, or of ``row_height`` and
+        ``column_width`` pixels from its top left corner when given.
+
+        The table is captured once and the changed cells are recognized from crops of that capture,
+        in one batch by the OCR workers, instead of searching and capturing once per cell
+        as a loop over `Get Text In Nth Pattern` does. See `Get Texts In Regions`.
+
+        Examples:
+        | ${cells}=       | Get Text Grid   | header.png  | below = 200 | 10 | 3  |    | # 10 rows of 3 cells below the header   |
+        | ${cells}=       | Get Text Grid   | region      | region      | 4  | 4  | 20 | # 4 rows of 20 pixels in the search region |
+        | Should Be Equal | ${cells[0][2]}  | 112         |             |    |    |    |                                          |
+        """
+        self._info("Getting %s x %s text grid at '%s' of '%s'." % (rows, columns, search_location, anchor))
+        (rows, columns) = (int(rows), int(columns))
+        if rows < 1 or columns < 1:
+            raise ValueError("Text grid must have at least 1 row and 1 column, got %s x %s." % (rows, columns))
+        (x, y, w, h) = self._spatial_coordinates(self._get_anchor_coordinates(anchor), *self._parse_spatial_location(search_location))
+        row_height = int(row_height) if row_height not in (None, '') else h // rows
+        column_width = int(column_width) if column_width not in (None, '') else w // columns
+        if row_height < 1 or column_width < 1:
+            raise ValueError("Text grid cells of %s x %s pixels are empty, the %s x %s table cannot hold %s x %s cells."
+                             % (column_width, row_height, w, h, rows, columns))
+        cells = [(x + column * column_width, y + row * row_height, column_width, row_height)
+                 for row in range(rows) for column in range(columns)]
+        texts = self._read_texts(cells)
+        return [texts[row * columns:(row + 1) * columns] for row in range(rows)]
+
     """***************************** DO SOMETHING IN MATCHING PATTERNS IN ACTIVE WINDOW ************************************
     Keywords used when multiple patterns on screen is present.
     Search region or setROI() value is set to the application in focus as default.
@@ -484,7 +577,7 @@ class _ElementKeywords(KeywordGroup):
         Search for matching patterns is set to top > down > left > right.
         """
         self._info("Getting count of pattern '%s'." % pattern)
-        return len(self._get_all_patterns(pattern))
+        return len(self._get_all_patterns(pattern, wait=False))
 
     def click_nth_pattern(self, pattern, pattern_index):
         """Perform a mouse ``click`` on the click point using the ``left`` button.
@@ -499,7 +592,8 @@ class _ElementKeywords(KeywordGroup):
         | Click Nth Pattern | pattern.png = 0.99 | 3 | # Clicks the third instance of an element identified by pattern.png |
         """
         self._info("Clicking '%s'nth pattern '%s'." % (pattern_index, pattern))
-        self._get_nth_pattern(pattern, pattern_index).click()
+        with utils.latency.phase('input'):
+            self._backend.click(self._get_nth_pattern(pattern, pattern_index))
 
     def right_click_nth_pattern(self, pattern, pattern_index):
         """Perform a mouse ``click`` on the click point using the ``right`` button.
@@ -514,7 +608,8 @@ class _ElementKeywords(KeywordGroup):
         | Right Click Nth Pattern | pattern.png = 0.99 | 4 | # Right-clicks the fourth instance of an element identified by pattern.png |
         """
         self._info("Clicking '%s'nth pattern '%s'." % (pattern_index, pattern))
-        self._get_nth_pattern(pattern, pattern_index).rightClick()
+        with utils.latency.phase('input'):
+            self._backend.right_click(self._get_nth_pattern(pattern, pattern_index))
 
     def double_click_nth_pattern(self, pattern, pattern_index):
         """Perform a mouse ``double-click`` on the click point using the ``left`` button.
@@ -530,7 +625,8 @@ class _ElementKeywords(KeywordGroup):
         """
 
         self._info("Double-clicking '%s'nth pattern '%s'." % (pattern_index, pattern))
-        self._get_nth_pattern(pattern, pattern_index).doubleClick()
+        with utils.latency.phase('input'):
+            self._backend.double_click(self._get_nth_pattern(pattern, pattern_index))
 
     def hover_at_nth_pattern(self, pattern, pattern_index):
         """Hovers mouse pointer at the center the nth element identified by ``pattern``.
@@ -545,7 +641,8 @@ class _ElementKeywords(KeywordGroup):
         """
 
         self._info("Hovering at '%s'nth pattern '%s'." % (pattern_index, pattern))
-        self._get_nth_pattern(pattern, pattern_index).hover()
+        with utils.latency.phase('input'):
+            self._backend.hover(self._get_nth_pattern(pattern, pattern_index))
 
     def highlight_nth_pattern(self, pattern, pattern_index, highlight_duration):
         """Highlights the nth element identified by ``pattern`` for a specified `highlight_duration` in seconds.
@@ -562,7 +659,7 @@ class _ElementKeywords(KeywordGroup):
         """
 
         self._info("Highlighting '%s'nth pattern '%s'  for '%s' second(s)." % (pattern_index, pattern, highlight_duration))
-        self._get_nth_pattern(pattern, pattern_index).highlight(highlight_duration)
+        self._backend.highlight(self._get_nth_pattern(pattern, pattern_index), highlight_duration)
 
     def drag_nth_pattern(self, pattern, pattern_index):
         """Drag the nth element identified by ``pattern``.
@@ -579,7 +676,8 @@ class _ElementKeywords(KeywordGroup):
         """
 
         self._info("Dragging '%s'nth pattern '%s'." % (pattern_index, pattern))
-        drag(self._get_nth_pattern(pattern, pattern_index))
+        with utils.latency.phase('input'):
+            self._backend.drag(self._get_nth_pattern(pattern, pattern_index))
 
     def drop_at_nth_pattern(self, pattern, pattern_index):
         """Drop at the nth element identified by ``pattern``.
@@ -596,7 +694,8 @@ class _ElementKeywords(KeywordGroup):
         """
 
         self._info("Dropping at '%s'nth pattern '%s'." % (pattern_index, pattern))
-        dropAt(self._get_nth_pattern(pattern, pattern_index))
+        with utils.latency.phase('input'):
+            self._backend.drop_at(self._get_nth_pattern(pattern, pattern_index))
 
     def drag_and_drop_from_nth_pattern(self, pattern1, pattern1_index, pattern2, pattern2_index):
         """Drag and drop an nth element identified by ``pattern1`` to another nth element identified by ``pattern2``.
@@ -612,8 +711,9 @@ class _ElementKeywords(KeywordGroup):
         """
 
         self._info("Performing drag and drop from element '%s' to element '%s'." % (pattern1, pattern2))
-        dragDrop(self._get_nth_pattern(pattern1, pattern1_index),
-                 self._get_nth_pattern(pattern2, pattern2_index))
+        with utils.latency.phase('input'):
+            self._backend.drag_drop(self._get_nth_pattern(pattern1, pattern1_index),
+                                    self._get_nth_pattern(pattern2, pattern2_index))
 
     def paste_text_in_nth_pattern(self, pattern, pattern_index, text):
         """Paste a `text` at `x/y` coordinates of the element identified by ``pattern``.
@@ -623,7 +723,8 @@ class _ElementKeywords(KeywordGroup):
         """
 
         self._info("Pasting text '%s' in '%s'nth pattern '%s'." % (text, pattern_index, pattern))
-        self._get_nth_pattern(pattern, pattern_index).type(text)
+        with utils.latency.phase('input'):
+            self._backend.type(text, target=self._get_nth_pattern(pattern, pattern_index))
 
     def type_text_in_nth_pattern(self, pattern, pattern_index, text):
         """Type a `text` in nth element identified by ``pattern``.
@@ -638,7 +739,8 @@ class _ElementKeywords(KeywordGroup):
         """
 
         self._info("Typing text '%s' in '%s'nth pattern '%s'." % (text, pattern_index, pattern))
-        self._get_nth_pattern(pattern, pattern_index).type(text)
+        with utils.latency.phase('input'):
+            self._backend.type(text, target=self._get_nth_pattern(pattern, pattern_index))
 
     def get_text_in_nth_pattern(self, pattern, pattern_index, search_location):
         """Return the `text` in nth element identified by ``pattern``.
@@ -658,7 +760,198 @@ class _ElementKeywords(KeywordGroup):
 
         self._info("Getting texts in '%s' nth pattern at '%s' of pattern '%s'." % (pattern_index, search_location, pattern))
         pattern = self._get_nth_pattern(pattern, pattern_index)
-        return self._read_text(pattern, search_location)
+        return self._read_text_at_match(pattern, search_location)
+
+    def find_patterns(self, *patterns):
+        """Returns a dictionary of each ``pattern`` to its matching region, or to None if not found.
+
+        All ``patterns`` are searched in one capture of the specified ROI or search region,
+        so the results are consistent with each other and the screen is captured only once.
+        Unlike `Click Pattern`, this keyword does not wait for the ``patterns`` to appear.
+
+        See also `Assert Patterns Are Visible`.
+
+        Example:
+        | ${matches}=         | Find Patterns            | ok.png = 0.90 | cancel.png | Password |
+        | Should Not Be Equal | ${matches['cancel.png']} | ${None}       |            |          |
+        """
+        self._info("Finding patterns '%s' in one capture of the search region." % ("', '".join(patterns)))
+        return self._find_patterns(patterns)
+
+    def find_patterns_on_all_screens(self, *patterns):
+        """Returns a dictionary of each ``pattern`` to its screen number and matching coordinates
+        ``x, y, w, h``, or to None if it is not on any screen.
+
+        All screens are searched at the same time, each by its own worker, and every screen is
+        captured once for all ``patterns``. Unlike `Wait For Pattern On Any Screen`, this keyword
+        does not wait for the ``patterns`` to appear.
+
+        Example:
+        | ${found}=       | Find Patterns On All Screens | error.png         | warning.png |
+        | Should Be Equal | ${found['error.png']}        | ${None}           |             |
+        """
+        self._info("Finding patterns '%s' on all screens." % ("', '".join(patterns)))
+        locators = [self._pattern_finder.compile(pattern) for pattern in patterns]
+        found = dict((pattern, None) for pattern in patterns)
+        for (screen, index, match) in self._screen_search.match(self._matcher, self._get_all_screens(), locators):
+            if found[patterns[index]] is None or match.getScore() > found[patterns[index]][2]:
+                found[patterns[index]] = (screen, (match.getX(), match.getY(), match.getW(), match.getH()), match.getScore())
+        return dict((pattern, value[:2] if value is not None else None) for pattern, value in found.items())
+
+    def wait_for_pattern_on_any_screen(self, pattern, timeout=None, mode='first'):
+        """Waits until ``pattern`` appears on any screen and returns the screen number and the
+        matching coordinates ``x, y, w, h``.
+
+        All screens are searched at the same time, each by its own worker. With ``mode`` ``first``
+        the match found first is returned, with ``best`` the best match across all screens.
+        ``timeout`` defaults to `sikulix_timeout`, see `importing`. The screen number can be given
+        to `Set Search Region To Target Screen` as ``Screen <number>``.
+
+        Example:
+        | ${screen} | ${coordinates}=                    | Wait For Pattern On Any Screen | dialog.png = 0.90 | 10 |
+        | Set Search Region To Target Screen | Screen ${screen}               |                   |    |
+        """
+        self._info("Waiting for pattern '%s' on all screens." % (pattern))
+        (screen, match) = self._find_on_any_screen(pattern, timeout, mode)
+        return (screen, (match.getX(), match.getY(), match.getW(), match.getH()))
+
+    def click_pattern_on_any_screen(self, pattern, mode='first'):
+        """Perform a mouse ``click`` on the element identified by ``pattern`` on whichever screen it is.
+
+        See `Wait For Pattern On Any Screen` for the searching of all screens and ``mode``.
+
+        Example:
+        | Click Pattern On Any Screen | ok.png = 0.90 | # Clicks OK in the dialog, on any of the monitors |
+        """
+        self._info("Clicking pattern '%s' on any screen." % (pattern))
+        (screen, match) = self._find_on_any_screen(pattern, None, mode)
+        self._info("Pattern '%s' found on screen '%s'." % (pattern, screen))
+        with utils.latency.phase('input'):
+            self._backend.click(match)
+
+    def click_pattern_nearest_to_coordinates(self, pattern, x, y):
+        """Perform a mouse ``click`` on the element identified by ``pattern`` whose center is nearest to ``x``, ``y``.
+
+        Useful when the same element is present many times, e.g. the checkbox next to a known row.
+
+        See also `Get Pattern Count In Rectangle` and `Click Nth Pattern`.
+
+        Example:
+        | Click Pattern Nearest To Coordinates | checkbox.png = 0.99 | 400 | 250 | # Clicks the checkbox nearest to 400, 250 |
+        """
+        self._info("Clicking pattern '%s' nearest to coordinates '%s', '%s'." % (pattern, x, y))
+        match = self._get_all_patterns(pattern).nearest(int(x), int(y))
+        if match is None:
+            raise AssertionError("No matching pattern(s): %s found on screen." % (pattern))
+        with utils.latency.phase('input'):
+            self._backend.click(match)
+
+    def get_pattern_count_in_rectangle(self, pattern, x, y, w, h):
+        """Returns the count of elements identified by ``pattern`` lying entirely within the rectangle ``x``, ``y``, ``w``, ``h``.
+
+        See also `Get Pattern Count` and `Click Pattern Nearest To Coordinates`.
+
+        Example:
+        | ${count}= | Get Pattern Count In Rectangle | unread.png = 0.99 | 0 | 100 | 400 | 600 | # Counts the unread icons in the left pane |
+        """
+        self._info("Getting count of pattern '%s' in rectangle '%s', '%s', '%s', '%s'." % (pattern, x, y, w, h))
+        return len(self._get_all_patterns(pattern, wait=False).within(int(x), int(y), int(w), int(h)))
+
+    def set_pattern_order(self, order, tolerance=None):
+        """Sets the order in which the nth pattern keywords, such as `Click Nth Pattern`, count matches.
+
+        ``order`` is one of:
+        | xy           | Left to right by the x coordinate, then by the y coordinate. This is the default. |
+        | row_major    | Row by row from the top, left to right within a row.                             |
+        | column_major | Column by column from the left, top to bottom within a column.                   |
+
+        With ``row_major`` and ``column_major`` matches are grouped into visual rows and columns:
+        matches whose centers are at most ``tolerance`` pixels apart vertically are in the same row,
+        and horizontally in the same column. The default ``tolerance`` is half the average size of
+        the matches, so that a few pixels of jitter in a grid or list do not change the order.
+
+        Returns the previous order. The default order can be set with `pattern_order` in `importing`.
+
+        See also `Click Pattern At Row And Column`.
+
+        Example:
+        | Set Pattern Order | row_major         |   |                                                       |
+        | Click Nth Pattern | folder.png = 0.99 | 5 | # Clicks the fifth folder reading the grid row by row |
+        """
+        order = order.lower()
+        if order not in ORDERS:
+            raise ValueError("Invalid pattern order '%s', expected one of: %s." % (order, ", ".join(ORDERS)))
+        previous = self._pattern_order
+        self._pattern_order = order
+        self._pattern_order_tolerance = float(tolerance) if tolerance not in (None, '') else None
+        self._info("Pattern order set to '%s'." % (order))
+        return previous
+
+    def click_pattern_at_row_and_column(self, pattern, row, column, tolerance=None):
+        """Perform a mouse ``click`` on the element identified by ``pattern`` in ``row`` and ``column``, counting from 1.
+
+        Matches are grouped into rows and columns as described in `Set Pattern Order`, with the
+        given ``tolerance`` in pixels. Fails if no match is in that row and column.
+
+        See also `Get Pattern Coordinates At Row And Column` and `Get Pattern Row And Column Count`.
+
+        Example:
+        | Click Pattern At Row And Column | icon.png = 0.95 | 2 | 3 | # Clicks the third icon in the second row |
+        """
+        self._info("Clicking pattern '%s' at row '%s', column '%s'." % (pattern, row, column))
+        match = self._get_pattern_at_row_and_column(pattern, row, column, tolerance)
+        with utils.latency.phase('input'):
+            self._backend.click(match)
+
+    def get_pattern_coordinates_at_row_and_column(self, pattern, row, column, tolerance=None):
+        """Returns the x, y, w and h of the element identified by ``pattern`` in ``row`` and ``column``, counting from 1.
+
+        See `Click Pattern At Row And Column`.
+
+        Example:
+        | ${x} | ${y} | ${w} | ${h}= | Get Pattern Coordinates At Row And Column | icon.png = 0.95 | 1 | 4 |
+        """
+        match = self._get_pattern_at_row_and_column(pattern, row, column, tolerance)
+        return (match.getX(), match.getY(), match.getW(), match.getH())
+
+    def get_pattern_row_and_column_count(self, pattern, tolerance=None):
+        """Returns the number of rows and columns the elements identified by ``pattern`` are arranged in.
+
+        See `Click Pattern At Row And Column`.
+
+        Example:
+        | ${rows} | ${columns}= | Get Pattern Row And Column Count | icon.png = 0.95 |
+        """
+        (rows, columns) = self._get_all_patterns(pattern, wait=False).shape(self._get_tolerance(tolerance))
+        self._info("Pattern '%s' is arranged in %s row(s) and %s column(s)." % (pattern, rows, columns))
+        return (rows, columns)
+
+    def get_match_set_cache_statistics(self):
+        """Returns the statistics of the match set cache as a dictionary with the keys
+        ``size``, ``hits``, ``misses`` and ``hit_rate``.
+
+        Keywords working on all matches of a ``pattern``, such as `Click Nth Pattern` and
+        `Get Pattern Count`, reuse the matches found by the previous keyword as long as the search
+        region shows the same pixels and the matches are younger than `match_set_cache_ttl`,
+        see `importing`.
+        """
+        stats = self._match_sets.stats()
+        self._info("Match set cache: %(hits)s hits, %(misses)s misses." % stats)
+        return stats
+
+    def get_location_hint_statistics(self):
+        """Returns the statistics of the last known location search as a dictionary with the keys
+        ``hints``, ``hits``, ``misses``, ``hit_rate`` and ``time_saved`` (seconds).
+
+        Keywords searching a ``pattern`` first look around the location where the same ``pattern``
+        was matched last in the same search region and only search the whole region on a miss.
+        Locations are forgotten when the application in focus is moved or resized. ``time_saved``
+        subtracts the time spent searching around locations where the ``pattern`` was not found
+        anymore and is negative when the location search cost more time than it saved.
+        """
+        stats = self._location_hints.stats()
+        self._info("Location hints: %(hits)s hits, %(misses)s misses, %(time_saved).3f second(s) saved." % stats)
+        return stats
 
     # Private
     """***************************** Internal methods ************************************"""
@@ -667,63 +960,76 @@ class _ElementKeywords(KeywordGroup):
         To do: dynamic search region where user can set the search region to either, active application, specific region or screen
         """
 
-        matching_pattern = self._pattern_finder._find_pattern(pattern)
+        matching_pattern = self._pattern_finder.compile(pattern)
         try:
-            if (xoffset != None or yoffset != None):
-                xoffset = int(xoffset); yoffset = int(yoffset)
-                element = find(matching_pattern.targetOffset(xoffset, yoffset))
-            else:
-                element = find(matching_pattern)
+            element = self._location_hints.find(self._matcher, matching_pattern, xoffset, yoffset)
             return element
         except FindFailed, err:
             raise AssertionError("No matching pattern: %s found on screen." % (pattern))
 
+    def _find_patterns(self, patterns):
+        locators = [self._pattern_finder.compile(pattern) for pattern in patterns]
+        with utils.latency.phase('capture'):
+            frame = self._matcher.capture()
+        with utils.latency.phase('match'):
+            matches = self._matcher.match_many(frame, locators)
+        for pattern, locator, match in zip(patterns, locators, matches):
+            self._location_hints.remember(self._matcher, locator, match)
+            self._debug("Pattern '%s' matched at '%s'." % (pattern, match))
+        return dict(zip(patterns, matches))
+
+    def _get_all_screens(self):
+        return [self._backend.screen_coordinates(number) for number in range(self._backend.screen_count())]
+
+    def _find_on_any_screen(self, pattern, timeout, mode):
+        found = self._screen_search.find(self._matcher, self._get_all_screens(),
+                                         [self._pattern_finder.compile(pattern)],
+                                         timeout if timeout not in (None, '') else None, mode.strip().lower())
+        if found is None:
+            raise AssertionError("No matching pattern: %s found on any screen." % (pattern))
+        self._matcher.last_match = found[2]
+        return (found[0], found[2])
+
     def _scroll_direction_and_steps(self, scroll):
         (scroll_direction, scroll_steps) = self._pattern_finder._parse_scroll_details(scroll)
-        if (scroll_direction == "up"):
-            scroll_direction = WHEEL_UP
-        elif (scroll_direction == "down"):
-            scroll_direction = WHEEL_DOWN
-        return wheel(scroll_direction, scroll_steps)
+        with utils.latency.phase('input'):
+            return self._backend.wheel(scroll_direction, scroll_steps)
 
     def _scroll_direction_and_steps_from_pattern(self, pattern, scroll, xoffset, yoffset):
         (scroll_direction, scroll_steps) = self._pattern_finder._parse_scroll_details(scroll)
-        if (scroll_direction == "up"):
-            scroll_direction = WHEEL_UP
-        elif (scroll_direction == "down"):
-            scroll_direction = WHEEL_DOWN
-        return self._pattern_find(pattern, xoffset, yoffset).wheel(scroll_direction, scroll_steps)
+        with utils.latency.phase('input'):
+            return self._backend.wheel(scroll_direction, scroll_steps, self._pattern_find(pattern, xoffset, yoffset))
 
     def _read_text_in_pattern(self, pattern, search_location):
+        return self._read_text_at_match(self._pattern_find(pattern, None, None), search_location)
+
+    def _read_text_at_match(self, match, search_location):
         (location, search_area) = self._parse_spatial_location(search_location)
-        pattern = self._pattern_find(pattern, None, None)
-        if (location == "left"):
-            pattern_text = pattern.left(search_area).text()
-        elif (location == "right"):
-            pattern_text = pattern.right(search_area).text()
-        elif (location == "above"):
-            pattern_text = pattern.above(search_area).text()
-        elif (location == "below"):
-            pattern_text = pattern.below(search_area).text()
-        else:
-            pattern_text = pattern.text()
-        return pattern_text
+        coordinates = (match.getX(), match.getY(), match.getW(), match.getH())
+        return self._read_text(*self._spatial_coordinates(coordinates, location, search_area))
 
     def _read_text_in_region(self, search_location):
         (location, search_area) = self._parse_spatial_location(search_location)
+        return self._read_text(*self._spatial_coordinates(self._matcher.get_roi(), location, search_area))
+
+    def _get_anchor_coordinates(self, anchor):
+        if anchor.strip().lower() == "region":
+            return self._matcher.get_roi()
+        match = self._pattern_find(anchor, None, None)
+        return (match.getX(), match.getY(), match.getW(), match.getH())
+
+    def _spatial_coordinates(self, coordinates, location, search_area):
+        """Returns the coordinates of the area of ``search_area`` pixels at ``location`` of ``coordinates``"""
+        (x, y, w, h) = coordinates
         if (location == "left"):
-            region_text = left(search_area).text()
+            return (x - search_area, y, search_area, h)
         elif (location == "right"):
-            region_text = right(search_area).text()
+            return (x + w, y, search_area, h)
         elif (location == "above"):
-            region_text = above(search_area).text()
+            return (x, y - search_area, w, search_area)
         elif (location == "below"):
-            region_text = below(search_area).text()
-        elif (location == "region"):
-            region_text = Region(getX(), getY(), getW(), getH()).text()
-        else:
-            region_text = text()
-        return region_text
+            return (x, y + h, w, search_area)
+        return coordinates
 
     def _parse_spatial_location(self, search_location):
         assert search_location is not None and len(search_location) > 0
@@ -740,30 +1046,30 @@ class _ElementKeywords(KeywordGroup):
 
     def _mouse_button(self, mouse_button):
         assert mouse_button is not None and len(mouse_button) > 0
-        mouse_button = mouse_button.lower()
-        if(mouse_button == "left"):
-            mouse_button = Button.LEFT
-        elif(mouse_button == "middle"):
-            mouse_button = Button.MIDDLE
-        elif(mouse_button == "right"):
-            mouse_button = Button.RIGHT
-        return mouse_button
-
-    def _set_image_order(self, match):
-        return match.x, match.y
-
-    def _get_all_patterns(self, pattern):
-        list_of_patterns = []; sorted_patterns = []
-        try:
-            found_patterns =  findAll(self._pattern_finder._find_pattern(pattern))
-            while found_patterns.hasNext():
-                list_of_patterns.append(found_patterns.next())
-            sorted_patterns = sorted(list_of_patterns, key=self._set_image_order)
-            return sorted_patterns
-        except FindFailed, err:
-            AssertionError("No matching pattern(s): %s found on screen." % (pattern))
+        return mouse_button.lower()
+
+    def _get_all_patterns(self, pattern, wait=True):
+        """Returns the `MatchSet` of all matches of ``pattern`` in the search region, waiting for the
+        first match up to the timeout unless ``wait`` is False, e.g. when counting"""
+        timeout = self._matcher.resolve_timeout(None) if wait else 0
+        return self._match_sets.get(self._matcher, self._pattern_finder.compile(pattern), timeout)
 
     def _get_nth_pattern(self, pattern, pattern_index):
         pattern_index = int(pattern_index) - 1
-        nth_pattern = self._get_all_patterns(pattern)[pattern_index]
-        return nth_pattern
\ No newline at end of file
+        match_set = self._get_all_patterns(pattern)
+        if not 0 <= pattern_index < len(match_set):
+            raise AssertionError("No matching pattern: %s number %s found on screen, found %s."
+                                 % (pattern, pattern_index + 1, len(match_set)))
+        return match_set.nth(pattern_index, self._pattern_order, self._pattern_order_tolerance)
+
+    def _get_pattern_at_row_and_column(self, pattern, row, column, tolerance):
+        match = self._get_all_patterns(pattern).at(int(row) - 1, int(column) - 1, self._get_tolerance(tolerance))
+        if match is None:
+            raise AssertionError("No matching pattern: %s found on screen at row %s, column %s."
+                                 % (pattern, row, column))
+        return match
+
+    def _get_tolerance(self, tolerance):
+        if tolerance in (None, ''):
+            return self._pattern_order_tolerance
+        return float(tolerance)
\ No newline at end of file
@@ -1,5 +1,3 @@
-
-from sikuli import *
 from keywordgroup import KeywordGroup
 
 class _ImageLibraryKeywords(KeywordGroup):
@@ -13,8 +11,61 @@ class _ImageLibraryKeywords(KeywordGroup):
         This must be used during setup in order to set the image library before the test cases are executed.
         """
         self._info("Setting image library at '%s'." % path)
+        previous_directory = self.image_library_directory
         self._set_image_library_directory(path)
-        addImagePath(self.image_library_directory)
+        self._backend.add_image_path(self.image_library_directory)
+        self._pattern_finder.image_store.add_directory(self.image_library_directory)
+        if previous_directory != self.image_library_directory:
+            self._pattern_finder.clear_locator_cache()
+
+    def preload_image_library(self, path=None, file_pattern='*.png'):
+        """Decodes all reference images under ``path`` and keeps them in memory so that keywords
+        do not read and decode the image files on every search.
+
+        If ``path`` is not given, the directory set with `Set Image Library` is preloaded.
+        Images that change on disk are decoded again on their next use. The memory used for
+        the images is limited by the `image_store_size` argument in `importing`, least recently
+        used images are dropped first once the limit is reached.
+
+        Returns the number of preloaded images.
+
+        Example:
+        | Set Image Library     | ${IMAGE_LIBRARY} |
+        | Preload Image Library |                  | # Decodes all PNG images in ${IMAGE_LIBRARY} |
+        """
+        if path is None:
+            path = self._get_image_library_directory()
+        if path is None or not self._path_exists(path):
+            raise AssertionError("Path '%s' does not exist." % (path))
+        count = self._pattern_finder.image_store.preload(path, file_pattern)
+        self._info("Preloaded '%s' image(s) from '%s'." % (count, path))
+        return count
+
+    def get_image_store_statistics(self):
+        """Returns the reference image store statistics as a dictionary with the keys
+        ``size``, ``weight`` (bytes in use), ``capacity`` (bytes), ``hits``, ``misses``,
+        ``evictions``, ``hit_rate`` and ``directories``.
+
+        See `Preload Image Library`.
+        """
+        stats = self._pattern_finder.image_store.stats()
+        self._info("Image store: %(size)s image(s), %(weight)s of %(capacity)s bytes, %(hits)s hits, %(misses)s misses." % stats)
+        return stats
+
+    def get_locator_cache_statistics(self):
+        """Returns the compiled locator cache statistics as a dictionary with the keys
+        ``size``, ``capacity``, ``hits``, ``misses`` and ``hit_rate``.
+
+        The cache size is set with the `locator_cache_size` argument in `importing`.
+        The cache is cleared whenever `Set Image Library` changes the image library path.
+
+        Example:
+        | ${stats}= | Get Locator Cache Statistics |
+        | Log       | ${stats['hit_rate']}         |
+        """
+        stats = self._pattern_finder.get_locator_cache_statistics()
+        self._info("Locator cache: %(size)s/%(capacity)s entries, %(hits)s hits, %(misses)s misses." % stats)
+        return stats
 
     # Private
     """***************************** Internal methods ************************************"""
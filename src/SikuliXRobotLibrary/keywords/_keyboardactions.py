@@ -1,6 +1,13 @@
-from sikuli import *
+from SikuliXRobotLibrary import utils
 from keywordgroup import KeywordGroup
 
+SUPPORTED_KEYS = ('WIN', 'ENTER', 'ALT', 'CMD', 'CTRL', 'META', 'SHIFT', 'ALTGR', 'TAB', 'ESC', 'SPACE',
+                  'UP', 'DOWN', 'LEFT', 'RIGHT', 'DELETE', 'BACKSPACE', 'INSERT', 'PAGE_UP', 'PAGE_DOWN',
+                  'HOME', 'END', 'PRINTSCREEN', 'PAUSE', 'CAPS_LOCK', 'SCROLL_LOCK', 'NUM_LOCK',
+                  'NUM0', 'NUM1', 'NUM2', 'NUM3', 'NUM4', 'NUM5', 'NUM6', 'NUM7', 'NUM8', 'NUM9',
+                  'SEPARATOR', 'ADD', 'MINUS', 'MULTIPLY', 'DIVIDE',
+                  'F1', 'F2', 'F3', 'F4', 'F5', 'F6', 'F7', 'F8', 'F9', 'F10', 'F11', 'F12')
+
 class _KeyboardActionsKeywords(KeywordGroup):
 
     # Public
@@ -26,11 +33,14 @@ class _KeyboardActionsKeywords(KeywordGroup):
         (keys, len_keys) =self._split_and_map_keys(keyboard_keys)
         try:
             if (len_keys == 1):
-                type(keys[0])
+                with utils.latency.phase('input'):
+                    self._backend.type(keys[0])
             elif (len_keys == 2):
-                type(keys[1], keys[0])
+                with utils.latency.phase('input'):
+                    self._backend.type(keys[1], keys[0])
             elif (len_keys == 3):
-                type(keys[2], keys[0] + keys[1])
+                with utils.latency.phase('input'):
+                    self._backend.type(keys[2], keys[0] + keys[1])
         except ValueError:
             raise ValueError("Unsupported keys '%s'." % (keys))
 
@@ -43,7 +53,8 @@ class _KeyboardActionsKeywords(KeywordGroup):
         """
         count = int(count)
         keyboard_key = self._map_supported_keyboard_keys(keyboard_key)
-        type(keyboard_key * count)
+        with utils.latency.phase('input'):
+            self._backend.type(keyboard_key * count)
 
     def type_string(self, string_param):
         """ Types a string as specified by `srtring_param`
@@ -54,7 +65,8 @@ class _KeyboardActionsKeywords(KeywordGroup):
         | Type String | A quick cat fox jumps over the mat. | # Types the specified string |
         """
         string_param = string_param.strip()
-        type(string_param)
+        with utils.latency.phase('input'):
+            self._backend.type(string_param)
 
     def paste_string(self, string_param):
         """ Pastes a string as specified by `srtring_param`
@@ -65,7 +77,8 @@ class _KeyboardActionsKeywords(KeywordGroup):
         | Paste String | A quick cat fox jumps over the mat. | # Types the specified string |
         """
         string_param = string_param.strip()
-        paste(string_param)
+        with utils.latency.phase('input'):
+            self._backend.paste(string_param)
 
     def get_result_from_clipboard(self):
         """ Returns the result from the clipboard
@@ -73,7 +86,7 @@ class _KeyboardActionsKeywords(KeywordGroup):
         Example:
         | ${clipboardText}=    Get Result From Clipboard | # Returns the text from the clipboard and assigns the value to ${clipboardText} variable |
         """
-        return str(Env.getClipboard())
+        return self._backend.clipboard()
 
     # Private
     """***************************** INTERNAL METHODS ************************************"""
@@ -94,63 +107,6 @@ class _KeyboardActionsKeywords(KeywordGroup):
 
     def _map_supported_keyboard_keys(self, keyboard_key):
         assert keyboard_key is not None and len(keyboard_key) > 0
-        map = {
-            "WIN": Key.WIN,
-            "ENTER": Key.ENTER,
-            "ALT": Key.ALT,
-            "CMD": Key.CMD,
-            "CTRL": Key.CTRL,
-            "META": Key.META,
-            "SHIFT": Key.SHIFT,
-            "ALTGR": Key.ALTGR,
-            "TAB": Key.TAB,
-            "ESC": Key.ESC,
-            "SPACE": Key.SPACE,
-            "UP": Key.UP,
-            "DOWN": Key.DOWN,
-            "LEFT": Key.LEFT,
-            "RIGHT": Key.RIGHT,
-            "DELETE": Key.DELETE,
-            "BACKSPACE": Key.BACKSPACE,
-            "INSERT": Key.INSERT,
-            "PAGE_UP": Key.PAGE_UP,
-            "PAGE_DOWN": Key.PAGE_DOWN,
-            "HOME": Key.HOME,
-            "END": Key.END,
-            "PRINTSCREEN": Key.PRINTSCREEN,
-            "PAUSE": Key.PAUSE,
-            "CAPS_LOCK": Key.CAPS_LOCK,
-            "SCROLL_LOCK": Key.SCROLL_LOCK,
-            "NUM_LOCK": Key.NUM_LOCK,
-            "NUM0": Key.NUM0,
-            "NUM1": Key.NUM1,
-            "NUM2": Key.NUM2,
-            "NUM3": Key.NUM3,
-            "NUM4": Key.NUM4,
-            "NUM5": Key.NUM5,
-            "NUM6": Key.NUM6,
-            "NUM7": Key.NUM7,
-            "NUM8": Key.NUM8,
-            "NUM9": Key.NUM9,
-            "SEPARATOR": Key.SEPARATOR,
-            "ADD": Key.ADD,
-            "MINUS": Key.MINUS,
-            "MULTIPLY": Key.MULTIPLY,
-            "DIVIDE": Key.DIVIDE,
-            "F1": Key.F1,
-            "F2": Key.F2,
-            "F3": Key.F3,
-            "F4": Key.F4,
-            "F5": Key.F5,
-            "F6": Key.F6,
-            "F7": Key.F7,
-            "F8": Key.F8,
-            "F9": Key.F9,
-            "F10": Key.F10,
-            "F11": Key.F11,
-            "F12": Key.F12
-        }
-        key = map.get(keyboard_key)
-        if key is None:
+        if keyboard_key not in SUPPORTED_KEYS:
             return keyboard_key
-        return key
\ No newline at end of file
+        return self._backend.key(keyboard_key)
\ No newline at end of file
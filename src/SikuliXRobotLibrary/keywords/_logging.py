@@ -2,6 +2,7 @@ import os
 import robot
 from robot.api import logger
 from robot.libraries.BuiltIn import BuiltIn
+from SikuliXRobotLibrary import utils
 from keywordgroup import KeywordGroup
 
 try:
@@ -11,6 +12,29 @@ except ImportError:
 
 class _LoggingKeywords(KeywordGroup):
 
+    # Public
+    def get_keyword_latency_statistics(self):
+        """Returns the latency of the library keywords as a dictionary.
+
+        ``keywords`` maps every keyword name to the histogram of its ``total`` wall time and
+        the histograms of its ``phases``: ``parse``, ``capture``, ``match``, ``input``, ``ocr``,
+        ``logging`` and ``other``. ``locators`` maps every locator to the histogram of the
+        capture and match time spent on it. Each histogram contains ``count``, ``total``,
+        ``mean``, ``min``, ``max``, ``p50``, ``p95``, ``p99`` and the non-empty ``buckets``
+        in seconds. Only keywords run by the library itself are recorded, nested calls are
+        counted in the calling keyword.
+
+        Keywords are recorded when the `latency_report` is set in `importing`.
+
+        Example:
+        | ${stats} = | Get Keyword Latency Statistics |
+        | Log | ${stats['keywords']['click_pattern']['total']['p95']} |
+        """
+        stats = self.ROBOT_LIBRARY_LISTENER.latency.summary()
+        self._info("Keyword latency recorded for %d keyword(s) and %d locator(s)."
+                   % (len(stats['keywords']), len(stats['locators'])))
+        return stats
+
     # Private
     def _get_log_dir(self):
         try:
@@ -39,16 +63,20 @@ class _LoggingKeywords(KeywordGroup):
         elif (level == 'HTML'): self._html(message)
 
     def _info(self, message):
-        logger.info(message)
+        with utils.latency.phase('logging'):
+            logger.info(message)
 
     def _debug(self, message):
-        logger.debug(message)
+        with utils.latency.phase('logging'):
+            logger.debug(message)
 
     def _warn(self, message):
-        logger.warn(message)
+        with utils.latency.phase('logging'):
+            logger.warn(message)
 
     def _html(self, message):
-        logger.info(message, True, False)
+        with utils.latency.phase('logging'):
+            logger.info(message, True, False)
 
     def _path_exists(self, path):
         if (os.path.exists(path)):
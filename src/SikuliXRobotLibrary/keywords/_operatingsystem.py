@@ -1,10 +1,6 @@
-from sikuli import *
 from keywordgroup import KeywordGroup
 
 class _OperatingSystemKeywords(KeywordGroup):
-    def __init__(self):
-        self.env_OS = Env.getOS()
-        self.env_OS_version = Env.getOSVersion()
 
     # Public
 
@@ -12,19 +8,21 @@ class _OperatingSystemKeywords(KeywordGroup):
         """Returns the Operating System ``type`` of test pc.
         Example of Operating System `types`: WINDOWS, MAC, LINUX
         """
-        self._info("OS version is '%s'." % self.env_OS)
-        return self.env_OS
+        env_OS = self._backend.os_type()
+        self._info("OS version is '%s'." % env_OS)
+        return env_OS
 
     def get_env_OS_version(self):
         """Returns the Operating System ``version`` of test pc.
         """
-        self._info("OS is '%s'." % self.env_OS_version)
-        return self.env_OS_version
+        env_OS_version = self._backend.os_version()
+        self._info("OS is '%s'." % env_OS_version)
+        return env_OS_version
 
     def get_env_OS_type_and_version(self):
         """Returns the Operating System ``type`` and ``version`` of test pc.
         """
-        return str(self.env_OS) + " " + str(self.env_OS_version)
+        return str(self._backend.os_type()) + " " + str(self._backend.os_version())
 
     # Check if OS version is correct based on the argument env_OS
     def confirm_env_OS_type(self, env_OS):
@@ -32,11 +30,6 @@ class _OperatingSystemKeywords(KeywordGroup):
         """
         assert env_OS is not None and len(env_OS) > 0
         env_OS = env_OS.upper()
-        if(env_OS == "WINDOWS"):
-            OS_confirm = Settings.isWindows()
-        elif (env_OS == "MAC"):
-            OS_confirm = Settings.isMac()
-        elif (env_OS == "LINUX"):
-            OS_confirm = Settings.isLinux()
+        OS_confirm = self._backend.os_type().upper() == env_OS
         self._info("OS confirmation: '%s'." % OS_confirm)
         return OS_confirm
@@ -1,6 +1,7 @@
-from sikuli import *
+import time
 from keywordgroup import KeywordGroup
 from SikuliXRobotLibrary.locators import PatternFinder
+from SikuliXRobotLibrary.matchers import FindFailed
 from SikuliXRobotLibrary import utils
 
 class _RegionKeywords(KeywordGroup):
@@ -8,6 +9,13 @@ class _RegionKeywords(KeywordGroup):
         # Set target coordinates to Screen 1 as default
         self.target_screen = None
         self._pattern_finder = PatternFinder()
+        self._active_app_coordinates = None
+        self._active_app_cache = None
+        self.active_app_cache_ttl = 0.0
+        self._window_query_stats = {'queries': 0, 'cached': 0, 'time': 0.0, 'tests': {}}
+        self._current_test = None
+        self.ROBOT_LIBRARY_LISTENER.events.on('test_start', self._start_window_query_stats)
+        self.ROBOT_LIBRARY_LISTENER.events.on('test_end', self._end_window_query_stats)
 
     # Public
 
@@ -30,7 +38,7 @@ class _RegionKeywords(KeywordGroup):
         self._info("Setting search region to '%s'." % target_screen)
         self.target_screen = target_screen
         screen_number = self._parse_target_screen(self.target_screen)
-        setROI(Region(Screen(screen_number)))
+        self._backend.set_roi(*self._backend.screen_coordinates(screen_number))
         #setRect(Region(Screen(screen_number)))
 
     def set_search_region_to_active_app(self):
@@ -44,9 +52,13 @@ class _RegionKeywords(KeywordGroup):
         `Set New Search Region In Target Screen` and `Set New Search Region In Application`.
         """
         self._info("Setting the search region to the active application.")
-        search_region = self.get_active_app_region()
-        self._info("Setting the search region to '%s'." % (search_region))
-        setROI(search_region)
+        coordinates = self._get_active_app_coordinates()
+        self._forget_locations_if_moved(coordinates)
+        if self._matcher.get_roi() == coordinates:
+            self._info("Search region is already set to the active application '%s'." % (coordinates,))
+            return
+        self._info("Setting the search region to '%s'." % (coordinates,))
+        self._backend.set_roi(*coordinates)
         #setRect(search_region)
 
     def set_search_region_to_application(self, app_name):
@@ -59,9 +71,9 @@ class _RegionKeywords(KeywordGroup):
         See also `Set Search Region To Target Screen`, `Set New Search Region In Active App`,
         `Set New Search Region In Target Screen` and `Set New Search Region In Application`.
         """
-        search_region = App(app_name).window()
+        search_region = self._backend.app_window(app_name)
         self._info("Setting the search region: '%s' to the application: '%s'." % (app_name, search_region))
-        setROI(search_region)
+        self._backend.set_roi(*search_region)
         #setRect(search_region)
 
     def set_new_search_region_in_active_app(self, offsets):
@@ -76,16 +88,12 @@ class _RegionKeywords(KeywordGroup):
         """
         self._info("Setting new search region to offsets '%s'." % offsets)
         (offsetx, offsety, offsetw, offseth) = self._parse_coordinate_offsets(offsets)
-        active_app_region = self.get_active_app_region()
-        self._info("Active app region '%s'." % active_app_region)
-        new_x = active_app_region.x + offsetx
-        new_y = active_app_region.y + offsety
-        new_w = active_app_region.w + offsetw
-        new_h = active_app_region.h + offseth
-        new_coordinates = (new_x, new_y, new_w, new_h)
+        (x, y, w, h) = self.get_active_app_coordinates()
+        self._info("Active app region '%s'." % ((x, y, w, h),))
+        new_coordinates = (x + offsetx, y + offsety, w + offsetw, h + offseth)
         
         self._info("New coordinates: x:'%s' y:'%s w:'%s h:'%s." % new_coordinates)
-        setROI(*new_coordinates)
+        self._backend.set_roi(*new_coordinates)
         #setRect(*new_coordinates)
 
     def set_new_search_region_in_application(self, app_name, offsets):
@@ -100,17 +108,13 @@ class _RegionKeywords(KeywordGroup):
         """
         self._info("Setting new search region to offsets '%s'." % offsets)
         (offsetx, offsety, offsetw, offseth) = self._parse_coordinate_offsets(offsets)
-        application_region = self.get_application_region(app_name)
-        self._info("Application region '%s'." % application_region)
-        new_x = application_region.x + offsetx
-        new_y = application_region.y + offsety
-        new_w = application_region.w + offsetw
-        new_h = application_region.h + offseth
-        new_coordinates = (new_x, new_y, new_w, new_h)
+        (x, y, w, h) = self.get_application_coordinates(app_name)
+        self._info("Application region '%s'." % ((x, y, w, h),))
+        new_coordinates = (x + offsetx, y + offsety, w + offsetw, h + offseth)
         
         self._info("New coordinates: x:'%s' y:'%s w:'%s h:'%s." % new_coordinates)
 
-        setROI(*new_coordinates)
+        self._backend.set_roi(*new_coordinates)
         #setRect(*new_coordinates)
 
     def set_new_search_region_in_target_screen(self, target_screen, offsets):
@@ -129,14 +133,11 @@ class _RegionKeywords(KeywordGroup):
         screen_number = self._parse_target_screen(self.target_screen)
         self._info("'%s' region '%s'." % (target_screen, screen_number))
 
-        new_x = Sceen(screen_number).x + offsetx
-        new_y = Sceen(screen_number).y + offsety
-        new_w = Sceen(screen_number).w + offsetw
-        new_h = Sceen(screen_number).h + offseth
-        new_coordinates = (new_x, new_y, new_w, new_h)
+        (x, y, w, h) = self._backend.screen_coordinates(screen_number)
+        new_coordinates = (x + offsetx, y + offsety, w + offsetw, h + offseth)
         
         self._info("New coordinates: x:'%s' y:'%s w:'%s h:'%s." % new_coordinates)
-        setROI(*new_coordinates)
+        self._backend.set_roi(*new_coordinates)
         #setRect(*new_coordinates)
 
     def get_screen_coordinates(self, target_screen):
@@ -147,11 +148,7 @@ class _RegionKeywords(KeywordGroup):
         | Get Screen Coordinates | 1 | # Gets the coordinates of Screen 1 |
         """
         screen_number = self._parse_target_screen(target_screen)
-        coordinates = (Screen(screen_number).getX(), 
-                       Screen(screen_number).getY(), 
-                       Screen(screen_number).getW(), 
-                       Screen(screen_number).getH())
-        return coordinates
+        return self._backend.screen_coordinates(screen_number)
 
     def get_active_app_coordinates(self):
         """Returns the ``coordinates`` of the `application` in focus.
@@ -161,12 +158,19 @@ class _RegionKeywords(KeywordGroup):
         | Set Application Focus      | My Awesome App | # Sets the focus to `My Awesome App`       |
         | Get Active App Coordinates |                | # Gets the coordinates of `My Awesome App` |
         """
-        activeWindow = App.focusedWindow()
-        coordinates = (activeWindow.getX(), 
-                       activeWindow.getY(), 
-                       activeWindow.getW(), 
-                       activeWindow.getH())
-        return coordinates
+        return self._get_active_app_coordinates()
+
+    def get_window_query_statistics(self):
+        """Returns the time spent querying the window of the `application` in focus as a dictionary
+        with the keys ``queries``, ``cached``, ``time`` (seconds) and ``tests``, which maps each
+        test name to the seconds spent in that test.
+
+        Queries are answered from a cache for `active_app_cache_ttl` seconds, see `importing`.
+        """
+        stats = dict(self._window_query_stats)
+        stats['tests'] = dict(self._window_query_stats['tests'])
+        self._info("Window queries: %(queries)s queries, %(cached)s cached, %(time).3f second(s)." % stats)
+        return stats
 
     def get_application_coordinates(self, app_name):
         """Returns the ``coordinates`` of the `application` in focus.
@@ -174,12 +178,7 @@ class _RegionKeywords(KeywordGroup):
         Example:
         | Get Application Coordinates | My Awesome App | # Gets the coordinates of `My Awesome App` |
         """
-        applicationWindow = App(app_name).window()
-        coordinates = (applicationWindow.getX(), 
-                       applicationWindow.getY(), 
-                       applicationWindow.getW(), 
-                       applicationWindow.getH())
-        return coordinates
+        return self._backend.app_window(app_name)
 
     def get_application_xywh_coordinate(self, app_name, coordinate_name):
         """Returns the ``x``, ``y`` coordinate or the ``width`` or ``height`` of the `application` as specified in `app_name`.
@@ -192,17 +191,7 @@ class _RegionKeywords(KeywordGroup):
         """
         self._info("Getting'%s' value for application '%s." % (coordinate_name, app_name))
         assert coordinate_name is not None and len(coordinate_name) > 0
-        applicationWindow = App(app_name).window()
-        if (coordinate_name == x):
-            return applicationWindow.x
-        elif (coordinate_name == y):
-            return applicationWindow.y
-        elif (coordinate_name == w):
-            return applicationWindow.w
-        elif (coordinate_name == h):
-            return applicationWindow.h
-        else:
-            raise ValueError("Invalid value for coordinate name, input value is: '%s'" % (coordinate_name))
+        return self._get_xywh_coordinate(self._backend.app_window(app_name), coordinate_name)
 
     def get_active_app_xywh_coordinate(self, coordinate_name):
         """Returns the ``x``, ``y`` coordinate or the ``width`` or ``height`` of the active application in focus.
@@ -213,19 +202,9 @@ class _RegionKeywords(KeywordGroup):
         | Get Active App XYWH Coordinates | w | # Gets the w coordinate of the active application or the application in focus |
         | Get Active App XYWH Coordinates | h | # Gets the h coordinate of the active application or the application in focus |
         """
-        self._info("Getting'%s' value for application '%s." % (coordinate_name, app_name))
+        self._info("Getting'%s' value for the active application." % (coordinate_name))
         assert coordinate_name is not None and len(coordinate_name) > 0
-        activeWindow = App.focusedWindow()
-        if (coordinate_name == x):
-            return activeWindow.x
-        elif (coordinate_name == y):
-            return activeWindow.y
-        elif (coordinate_name == w):
-            return activeWindow.w
-        elif (coordinate_name == h):
-            return activeWindow.h
-        else:
-            raise ValueError("Invalid value for coordinate name, input value is: '%s'" % (coordinate_name))
+        return self._get_xywh_coordinate(self._backend.focused_window(), coordinate_name)
 
     def get_reference_pattern_coordinates(self, pattern):
         """Returns the ``coordinates`` of the element identified by ``pattern``.
@@ -234,7 +213,7 @@ class _RegionKeywords(KeywordGroup):
         | Get Reference Pattern Coordinates | pattern.png = 0.90 | # Gets the coordinates of pattern.png |
         """
         try:
-            matched_pattern = find(self._pattern_finder._find_pattern(pattern))
+            matched_pattern = self._location_hints.find(self._matcher, self._pattern_finder.compile(pattern))
             coordinates = (matched_pattern.getX(), matched_pattern.getY(), matched_pattern.getW(), matched_pattern.getH())
             return coordinates
         except FindFailed, err:
@@ -243,34 +222,33 @@ class _RegionKeywords(KeywordGroup):
     def get_application_region(self, app_name):
         """Returns the ``region`` of the application as specified in `app_name`.
         """
-        return Region(*self.get_application_coordinates(app_name))
+        return self._matcher.region(*self.get_application_coordinates(app_name))
 
 
     def get_active_screen_region(self):
         """Returns the ``region`` of the active screen.
         """
-        return Region(*self.get_screen_coordinates(0))
+        return self._matcher.region(*self._backend.screen_coordinates(0))
 
     def get_active_app_region(self):
         """Returns the ``region`` of the `application` in focus.
         """
-        return Region(*self.get_active_app_coordinates())
+        return self._matcher.region(*self.get_active_app_coordinates())
 
     def get_reference_pattern_region(self, pattern):
         """Returns the ``region`` of the element identified by `pattern`.
         """
-        return Region(*self.get_reference_pattern_coordinates(pattern))
+        return self._matcher.region(*self.get_reference_pattern_coordinates(pattern))
 
     def get_last_matching_coordinates(self):
         """Returns the ``coordinates`` of the last region of interest or ROI.
         """
-        coordinates_last_match = (getX(), getY(), getW(), getH())
-        return coordinates_last_match
+        return self._matcher.get_roi()
 
     def get_last_matching_region(self):
         """Returns the ``region`` of the last region of interest or ROI.
         """
-        return Region(*self.get_last_matching_coordinates())
+        return self._matcher.region(*self.get_last_matching_coordinates())
 
     # Private
     """***************************** Internal Methods ************************************"""
@@ -288,11 +266,52 @@ class _RegionKeywords(KeywordGroup):
         target_screen = target_screen.lower().replace("screen", "").strip()
         target_screen = int(target_screen)
 
-        actual_screen_count = getNumberScreens()
+        actual_screen_count = self._backend.screen_count()
         if (actual_screen_count < target_screen):
             raise ValueError("Actual screen count: '%s' is less than the specified target screen." % (actual_screen_count, target_screen))
         return target_screen
 
+    def _get_active_app_coordinates(self):
+        now = time.time()
+        if self._active_app_cache is not None and now - self._active_app_cache[0] < self.active_app_cache_ttl:
+            self._window_query_stats['cached'] += 1
+            return self._active_app_cache[1]
+        coordinates = self._backend.focused_window()
+        self._record_window_query(time.time() - now)
+        self._active_app_cache = (now, coordinates)
+        return coordinates
+
+    def _get_xywh_coordinate(self, coordinates, coordinate_name):
+        index = "xywh".find(coordinate_name.strip().lower())
+        if len(coordinate_name.strip()) != 1 or index == -1:
+            raise ValueError("Invalid value for coordinate name, input value is: '%s'" % (coordinate_name))
+        return coordinates[index]
+
+    def _invalidate_active_app_cache(self):
+        self._active_app_cache = None
+
+    def _record_window_query(self, elapsed):
+        stats = self._window_query_stats
+        stats['queries'] += 1
+        stats['time'] += elapsed
+        if self._current_test is not None:
+            stats['tests'][self._current_test] = stats['tests'].get(self._current_test, 0.0) + elapsed
+
+    def _start_window_query_stats(self, longname, attrs):
+        self._current_test = longname
+        self._invalidate_active_app_cache()
+
+    def _end_window_query_stats(self, longname, attrs):
+        elapsed = self._window_query_stats['tests'].get(longname, 0.0)
+        self._info("Window queries took %.3f second(s) in test '%s'." % (elapsed, longname))
+        self._current_test = None
+
+    def _forget_locations_if_moved(self, coordinates):
+        if self._active_app_coordinates is not None and self._active_app_coordinates != coordinates:
+            self._debug("Active app moved from '%s' to '%s', dropping location hints." % (self._active_app_coordinates, coordinates))
+            self._location_hints.clear()
+        self._active_app_coordinates = coordinates
+
     def _get_target_screen(self):
         if self.target_screen is not None:
             return self.target_screen
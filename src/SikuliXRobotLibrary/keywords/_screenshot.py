@@ -2,14 +2,25 @@ import os
 import robot
 import datetime
 import shutil
-from sikuli import *
 from keywordgroup import KeywordGroup
+from SikuliXRobotLibrary import utils
 
 class _ScreenshotKeywords(KeywordGroup):
     def __init__(self):
         self._screenshot_index = {}
         self._screenshot_path_stack = []
         self.screenshot_root_directory = None
+        self._screenshot_writer = utils.ScreenshotWriter()
+        self._screenshot_store = utils.ScreenshotStore()
+        self._screenshot_writer.on_drop = self._screenshot_store.forget
+        self.screenshot_dedup = False
+        self.screenshot_format = 'png'
+        self.screenshot_quality = 85
+        self.screenshot_max_size = 0
+        self.screenshot_context_padding = 100
+        self.ROBOT_LIBRARY_LISTENER.events.on('suite_start', self._start_screenshot_store_suite)
+        self.ROBOT_LIBRARY_LISTENER.events.on('suite_end', self._flush_screenshot_writer)
+        self.ROBOT_LIBRARY_LISTENER.events.on('suite_end', self._end_screenshot_store_suite)
 
     # Public
 
@@ -27,17 +38,71 @@ class _ScreenshotKeywords(KeywordGroup):
         if persist is False:
             self._screenshot_path_stack.append(self.screenshot_root_directory)
             # Restore after current scope ends
-            utils.events.on('scope_end', 'current',
-                            self._restore_screenshot_directory)
+            self.ROBOT_LIBRARY_LISTENER.events.on('scope_end', 'current',
+                                                  self._restore_screenshot_directory)
 
         self.screenshot_root_directory = path
 
+    def set_screenshot_options(self, format=None, quality=None, max_size=None, context_padding=None):
+        """Sets how captured screenshots are written and returns the previous options.
+
+        ``format`` is the image format of the written files, ``png`` or ``jpg``. Any other
+        format with an installed ImageIO writer, such as ``webp``, can be used as well.
+        ``quality`` is the compression quality of lossy formats from 0 to 100.
+        ``max_size`` is the maximum width and height in pixels; larger screenshots are scaled
+        down keeping their aspect ratio, 0 keeps the captured size.
+        ``context_padding`` is the number of pixels around the last match that
+        `Capture Screenshot Of Match Context` keeps.
+
+        Options that are not given keep their value. The initial options are set in `importing`
+        and apply to all screenshots, including the ones taken on failure.
+
+        Example:
+        | ${previous} = | Set Screenshot Options | format=jpg | quality=70 | max_size=1280 |
+        | Capture Screenshot | activeapp |
+        | Set Screenshot Options | &{previous} |
+        """
+        previous = {'format': self.screenshot_format,
+                    'quality': self.screenshot_quality,
+                    'max_size': self.screenshot_max_size,
+                    'context_padding': self.screenshot_context_padding}
+        if format is not None:
+            format = format.strip().lower().lstrip('.')
+            formats = self._backend.image_formats()
+            if format not in formats:
+                raise ValueError("Unsupported screenshot format '%s', expected one of: %s."
+                                 % (format, ", ".join(formats)))
+            self.screenshot_format = format
+        if quality is not None:
+            quality = int(quality)
+            if not 0 <= quality <= 100:
+                raise ValueError("Invalid screenshot quality '%s', expected a value from 0 to 100." % (quality))
+            self.screenshot_quality = quality
+        if max_size is not None:
+            self.screenshot_max_size = max(int(max_size), 0)
+        if context_padding is not None:
+            self.screenshot_context_padding = max(int(context_padding), 0)
+        return previous
+
     def capture_screenshot_of_active_app(self):
         """Takes a screenshot of the application in focus.
         """
 
         self.capture_screenshot("activeapp")
 
+    def capture_screenshot_of_match_context(self):
+        """Takes a screenshot of the surroundings of the last searched pattern.
+
+        The screenshot covers the last match of the pattern grown by the ``context_padding``
+        of `Set Screenshot Options`, or the whole search region if the pattern has not been
+        found there yet. Use it as `run_on_failure` keyword to keep the failure screenshots small.
+
+        Example:
+        | Register Keyword To Run On Failure | Capture Screenshot Of Match Context |
+        """
+
+        self.capture_screenshot("matchcontext")
+
     def capture_screenshot(self, target, filename='sikuli-screenshot-{index}.png'):
         """Takes a screenshot of the target application, screen or pattern and embeds it into the log.
 
@@ -66,6 +131,13 @@ class _ScreenshotKeywords(KeywordGroup):
         If there is a need to write literal _{index}_ or if ``filename``
         contains _{_ or _}_ characters, then the braces must be doubled.
 
+        The screenshot is written in the format, quality and maximum size set with
+        `Set Screenshot Options`. A ``.png`` extension of ``filename`` is replaced by the
+        extension of the format.
+
+        With `screenshot_dedup` enabled, a screenshot identical to one already written is not
+        written again and the log links to the existing file instead.
+
         Example 1:
         | ${file1} = | Capture Screenshot | activeapp |
         | File Should Exist | ${OUTPUTDIR}${/}sikuli-screenshot-1.png |
@@ -90,21 +162,54 @@ class _ScreenshotKeywords(KeywordGroup):
         | File Should Exist | ${OTHER_DIR}${/}sc-000001.png |
 
         Example 4:
-        | Capture Screenshot | activeapp   | # Captures the active application or the application in focus. |
-        | Capture Screenshot | lastROI     | # Captures the specified search region.                        |
-        | Capture Screenshot | Screen0     | # Captures Primary screen 1.                                   |
-        | Capture Screenshot | Screen1     | # Captures Screen 1.                                           |
-        | Capture Screenshot | pattern.png | # Captures the matching pattern                                |
+        | Capture Screenshot | activeapp    | # Captures the active application or the application in focus. |
+        | Capture Screenshot | lastROI      | # Captures the specified search region.                        |
+        | Capture Screenshot | matchContext | # Captures the surroundings of the last searched pattern.      |
+        | Capture Screenshot | Screen0      | # Captures Primary screen 1.                                   |
+        | Capture Screenshot | Screen1      | # Captures Screen 1.                                           |
+        | Capture Screenshot | pattern.png  | # Captures the matching pattern                                |
 
         """
-        path, link = self._get_screenshot_paths(filename)
+        path, link = self._get_screenshot_paths(self._get_screenshot_filename(filename))
         self._create_directory(path)
-        img_src = capture(*self._screenshot_target_coordinates(target))
-        shutil.copy(img_src, path)
+        coordinates = self._screenshot_target_coordinates(target)
+        with utils.latency.phase('capture'):
+            # Backends capturing to memory save writing and reading a temporary file
+            img_src = self._backend.capture_pixels(*coordinates)
+            if img_src is None:
+                img_src = self._backend.capture(*coordinates)
+        path, link = self._write_screenshot(img_src, path, link)
         msg = "Captured Screenshot " + target + ":" + path + "\n"
         self._html('%s </td></tr><tr><td colspan="3"><a href="%s">'
                    '<img src="%s"></a>' % (msg, link, link))
 
+    def flush_screenshots(self):
+        """Waits until all captured screenshots are written to their files.
+
+        Screenshots are written in the background so that capturing does not wait for the disk.
+        They are flushed automatically at the end of every suite; use this keyword when a
+        screenshot file must exist before that, e.g. to attach it to an external report.
+
+        See `importing` for the `screenshot_queue_size` and `screenshot_overflow` arguments.
+        """
+        self._screenshot_writer.flush()
+        self._info("Screenshots written: %(written)s, dropped: %(dropped)s." % self._screenshot_writer.stats())
+
+    def get_screenshot_deduplication_statistics(self):
+        """Returns and logs the screenshot deduplication statistics of the current suite.
+
+        The returned dictionary contains ``captured``, ``duplicates`` and ``bytes_saved``.
+        See `importing` for the `screenshot_dedup` argument.
+
+        Example:
+        | ${stats} = | Get Screenshot Deduplication Statistics |
+        | Log | ${stats['bytes_saved']} |
+        """
+        stats = self._screenshot_store.stats()
+        self._info("Screenshots captured: %(captured)s, duplicates: %(duplicates)s, "
+                   "bytes saved: %(bytes_saved)s." % stats)
+        return stats
+
     def _screenshot_target_coordinates(self, target):
         assert target is not None and len(target) > 0
         target = target.lower()
@@ -112,6 +217,8 @@ class _ScreenshotKeywords(KeywordGroup):
             target = self.get_active_app_coordinates()
         elif (target == "lastroi"):
             target = self.get_last_matching_coordinates()
+        elif (target == "matchcontext"):
+            target = self._get_match_context_coordinates()
         else:
             if(target.find('screen') != -1):
                 target = self.get_screen_coordinates(target)
@@ -121,6 +228,56 @@ class _ScreenshotKeywords(KeywordGroup):
 
     # Private
     """***************************** Internal methods ************************************"""
+    def _flush_screenshot_writer(self, longname, attrs):
+        self._screenshot_writer.flush()
+
+    def _write_screenshot(self, img_src, path, link):
+        # The file is overwritten, its previous content must no longer be linked to
+        self._screenshot_store.forget(path)
+        if not self.screenshot_dedup:
+            self._screenshot_writer.write(img_src, path, self._get_screenshot_encoder(img_src))
+            return path, link
+        (digest, existing_path) = self._screenshot_store.find(img_src)
+        if existing_path is not None:
+            return existing_path, robot.utils.get_link_path(existing_path, self._get_log_dir())
+        self._screenshot_store.add(digest, path)
+        self._screenshot_writer.write(img_src, path, self._get_screenshot_encoder(img_src))
+        return path, link
+
+    def _get_screenshot_filename(self, filename):
+        (root, extension) = os.path.splitext(filename)
+        if self.screenshot_format != 'png' and extension.lower() == '.png':
+            return root + '.' + self.screenshot_format
+        return filename
+
+    def _get_screenshot_encoder(self, img_src):
+        (format, quality, max_size) = (self.screenshot_format, self.screenshot_quality, self.screenshot_max_size)
+        if not isinstance(img_src, basestring):
+            return lambda source, destination: self._backend.encode_pixels(source, destination, format, quality, max_size)
+        if self.screenshot_format == 'png' and not self.screenshot_max_size:
+            # Captures are PNG files already
+            return None
+        return lambda source, destination: self._backend.encode_image(source, destination, format, quality, max_size)
+
+    def _get_match_context_coordinates(self):
+        roi = self._matcher.get_roi()
+        locator = self._pattern_finder.locator
+        if locator is None:
+            return roi
+        window = self._location_hints.window(locator, roi, self.screenshot_context_padding)
+        if window is None:
+            return roi
+        return window
+
+    def _start_screenshot_store_suite(self, longname, attrs):
+        self._screenshot_store.start_suite()
+
+    def _end_screenshot_store_suite(self, longname, attrs):
+        stats = self._screenshot_store.end_suite()
+        if stats['duplicates']:
+            self._info("Suite '%s' screenshots captured: %s, duplicates: %s, bytes saved: %s."
+                       % (longname, stats['captured'], stats['duplicates'], stats['bytes_saved']))
+
     def _create_directory(self, path):
         target_dir = os.path.dirname(path)
         if not os.path.exists(target_dir):
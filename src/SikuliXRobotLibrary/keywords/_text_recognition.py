@@ -1,9 +1,14 @@
-from org.sikuli.natives import OCR
-from org.sikuli.script import TextRecognizer
+from SikuliXRobotLibrary.ocr import OCRPool, TextCache, TextIndex
 from keywordgroup import KeywordGroup
 
 class _TextRecognitionKeywords(KeywordGroup):
 
+    def __init__(self):
+        self._ocr_whitelist = None
+        self._text_cache = TextCache()
+        self._ocr_pool = OCRPool()
+        self._text_index = TextIndex(lambda frame: self._backend.read_words(frame))
+
     # Public
     def set_OCR_Parameter_Whitelist(self, ocr_parameter):
         """Switches the on screen character recognition to numbers only.
@@ -28,8 +33,56 @@ class _TextRecognitionKeywords(KeywordGroup):
         """
         
         self._info("Setting the text recognition setting to the default settings.")
-        TextRecognizer.reset()
-        TextRecognizer.getInstance()
+        self._backend.reset_text_recognizer()
+        self._ocr_whitelist = None
+
+    def get_texts_in_regions(self, *regions):
+        """Returns a list of the texts in each of ``regions``, read in parallel.
+
+        Each region is given as ``x, y, w, h``, either as one comma separated string or as a list.
+        The regions are captured once and the regions showing the same pixels as when they were
+        last read are answered from the OCR cache. The other regions are read by `ocr_workers`
+        worker threads, see `importing`, so with a backend whose text recognition runs in parallel
+        reading all cells of a table takes about as long as reading its slowest cell. SikuliX reads
+        one region at a time. The current `Set OCR Parameter Whitelist` setting applies to every
+        region.
+
+        Example:
+        | ${texts}=       | Get Texts In Regions | 100, 200, 80, 20 | 180, 200, 80, 20 | 260, 200, 80, 20 |
+        | Should Be Equal | ${texts[1]}          | 112              |                  |                  |
+        """
+        self._info("Getting texts in %s region(s)." % (len(regions)))
+        return self._read_texts([self._parse_region(region) for region in regions])
+
+    def get_OCR_cache_statistics(self):
+        """Returns the statistics of the OCR cache as a dictionary with the keys ``size``,
+        ``capacity``, ``hits``, ``misses``, ``evictions`` and ``hit_rate``.
+
+        Keywords reading text, such as `Get Text In Pattern`, first capture the region to read
+        and reuse the text read before when the region shows the same pixels and the same
+        `Set OCR Parameter Whitelist` setting is used. The number of cached texts is set with
+        `ocr_cache_size` in `importing`.
+
+        Example:
+        | ${stats}=                | Get OCR Cache Statistics |
+        | Should Be True           | ${stats['hits']} > 0     |
+        """
+        stats = self._text_cache.stats()
+        self._info("OCR cache: %(hits)s hits, %(misses)s misses." % stats)
+        return stats
+
+    def get_text_index_statistics(self):
+        """Returns the statistics of the text locator index as a dictionary with the keys ``frames``,
+        ``builds``, ``searches`` and ``hit_rate``.
+
+        With `text_locator_index` enabled, see `importing`, the search region is read by OCR once
+        per captured screen and all text locators, e.g. ``Click Pattern    Password``, are searched
+        in the words read. ``builds`` is the number of OCR passes and ``searches`` the number of
+        text locator searches.
+        """
+        stats = self._text_index.stats()
+        self._info("Text index: %(builds)s OCR passes for %(searches)s searches." % stats)
+        return stats
 
     # Private
     """***************************** Internal methods ************************************"""
@@ -53,4 +106,29 @@ class _TextRecognitionKeywords(KeywordGroup):
         else:
             ocr_whitelist = ocr_parameter
 
-        OCR.setParameter("tessedit_char_whitelist", ocr_whitelist)
\ No newline at end of file
+        self._backend.set_ocr_whitelist(ocr_whitelist)
+        self._ocr_whitelist = ocr_whitelist
+
+    def _read_text(self, x, y, w, h):
+        """Returns the text in the rectangle, read again only when its pixels changed"""
+        return self._read_texts([(x, y, w, h)])[0]
+
+    def _read_texts(self, regions):
+        """Returns the text in each of ``regions``, reading the changed ones in parallel"""
+        regions = [tuple(int(value) for value in region) for region in regions]
+        whitelist = self._ocr_whitelist
+        return self._text_cache.read(self._matcher, regions, whitelist,
+                                     lambda frames: self._ocr_pool.read(self._backend.read_text, frames, whitelist))
+
+    def _get_ocr_workers(self, workers):
+        if workers in (None, ''):
+            # Backends reading one region at a time gain nothing from more threads
+            return 0 if self._backend.parallel_ocr else 1
+        return int(workers)
+
+    def _parse_region(self, region):
+        if isinstance(region, basestring):
+            region = region.split(',')
+        if len(region) != 4:
+            raise ValueError("Invalid region '%s', expected x, y, w, h." % (region,))
+        return tuple(int(str(value).strip()) for value in region)
\ No newline at end of file
@@ -1,16 +1,20 @@
 
 import time
 import robot
-from sikuli import *
 from keywordgroup import KeywordGroup
 from SikuliXRobotLibrary.locators import PatternFinder
+from SikuliXRobotLibrary.matchers import WaitEngine
 from SikuliXRobotLibrary import utils
 
 class _WaitingKeywords(KeywordGroup):
     def __init__(self):
         self._pattern_finder = PatternFinder()
+        self._wait_engine = WaitEngine()
+        self._deadlines = utils.deadline.Deadlines()
         self.sikulix_timeout = None
         self.sikulix_scanrate = None
+        self.ROBOT_LIBRARY_LISTENER.events.on('test_start', self._start_test_deadline)
+        self.ROBOT_LIBRARY_LISTENER.events.on('test_end', self._end_test_deadline)
 
     # Public
 
@@ -23,7 +27,7 @@ class _WaitingKeywords(KeywordGroup):
             self.sikulix_timeout = float(self._clean_string(timeout))
 
         self._info("Setting sikulix timeout to '%s' seconds." % (self.sikulix_timeout))
-        Settings.AutoWaitTimeout = self.sikulix_timeout
+        self._backend.set_timeout(self.sikulix_timeout)
 
     def set_sikulix_scanrate(self, scanrate):
         """Sets the ``sikulix scanrate`` value.
@@ -34,7 +38,78 @@ class _WaitingKeywords(KeywordGroup):
             self.sikulix_scanrate = float(self._clean_string(scanrate))
 
         self._info("Setting sikulix scanrate to '%s' seconds." % (self.sikulix_scanrate))
-        Settings.WaitScanRate = self.sikulix_scanrate
+        self._backend.set_scan_rate(self.sikulix_scanrate)
+
+    def set_adaptive_scanrate(self, min_scanrate, max_scanrate=None):
+        """Sets the range of the scan rate used while waiting for a ``pattern`` to appear or vanish.
+
+        Waiting keywords only search for the ``pattern`` again when the search region has changed
+        since the previous scan. While the search region stays the same, scanning slows down
+        towards ``min_scanrate`` scans per second; when it changes, scanning goes back to
+        ``max_scanrate``. Without ``max_scanrate`` the `sikulix_scanrate` is used. Until this
+        keyword is used, scanning does not slow down.
+
+        See also `Set SikuliX Scanrate` and `Get Wait Statistics`.
+
+        Example:
+        | Set Adaptive Scanrate | 0.5 | 10 | # Scans between every 2 seconds and 10 times per second |
+        """
+        self._wait_engine.min_scan_rate = float(self._clean_string(min_scanrate))
+        self._wait_engine.max_scan_rate = float(self._clean_string(max_scanrate)) if max_scanrate is not None else None
+        self._info("Setting adaptive scanrate between '%s' and '%s'." % (min_scanrate, max_scanrate))
+
+    def get_wait_statistics(self):
+        """Returns the statistics of the waiting keywords as a dictionary with the keys ``polls``,
+        ``matches``, ``skipped`` and ``skip_rate``. Skipped polls are scans of an unchanged search
+        region that did not need a new search.
+
+        See `Set Adaptive Scanrate`.
+        """
+        stats = self._wait_engine.stats()
+        self._info("Waits: %(polls)s polls, %(matches)s searches, %(skipped)s skipped." % stats)
+        return stats
+
+    def set_search_time_budget(self, budget, scope='test'):
+        """Sets the total time all searches of a test or of a keyword may wait and returns the previous budget.
+
+        Every keyword searching or waiting for a pattern takes its timeout from the time left of
+        the budget, so a test of many searches on a broken screen fails after ``budget`` instead of
+        waiting `sikulix_timeout` for every search. ``scope`` is ``test`` for a budget starting
+        with every test, or ``keyword`` for a budget starting with every keyword, e.g. for
+        `Drag And Drop Element` which searches twice. Setting the ``test`` budget during a test
+        starts it from now. ``budget`` is a Robot Framework time such as ``90 seconds`` or ``None``
+        to remove the budget. Budgets can also be set with `test_search_budget` and
+        `keyword_search_budget` in `importing`.
+
+        See also `Get Remaining Search Time`.
+
+        Example:
+        | Set Search Time Budget | 2 minutes  |         | # Searches of every test wait 2 minutes in total        |
+        | Set Search Time Budget | 10 seconds | keyword | # Searches of every keyword wait 10 seconds in total     |
+        """
+        scope = scope.strip().lower()
+        if scope not in ('test', 'keyword'):
+            raise ValueError("Invalid search time budget scope '%s', expected test or keyword." % (scope))
+        budget = self._parse_budget(budget)
+        deadlines = self._deadlines
+        if scope == 'test':
+            previous = deadlines.test_budget
+            deadlines.test_budget = budget
+            deadlines.restart_test()
+        else:
+            previous = deadlines.keyword_budget
+            deadlines.keyword_budget = budget
+        self._info("Setting %s search time budget to '%s' seconds." % (scope, budget))
+        return previous
+
+    def get_remaining_search_time(self):
+        """Returns the seconds left of the running search time budgets, or None when no budget is set.
+
+        See `Set Search Time Budget`.
+        """
+        remaining = self._deadlines.remaining()
+        self._info("Remaining search time: '%s' seconds." % (remaining))
+        return remaining
 
     def wait_in_seconds(self, timeout):
         """Waits until ``timeout`` expires.
@@ -44,7 +119,7 @@ class _WaitingKeywords(KeywordGroup):
         """
         timeout = float(self._clean_string(timeout))
         self._info("Setting wait value to '%s' seconds." % (timeout))
-        wait(timeout)
+        time.sleep(timeout)
 
     def wait_for_pattern_to_be_visible(self, pattern):
         """Waits until ``pattern`` appears on `application` in focus. 
@@ -56,10 +131,10 @@ class _WaitingKeywords(KeywordGroup):
         """
         self.set_search_region_to_active_app()
         self._info("Waiting for pattern '%s' to be visible." % (pattern))
-        try:
-            pattern = self._pattern_finder._find_pattern(pattern)
-            wait(pattern)
-        except FindFailed, err:
+        locator = self._pattern_finder.compile(pattern)
+        match = self._wait_engine.wait(self._matcher, locator)
+        self._location_hints.remember(self._matcher, locator, match)
+        if match is None:
             raise AssertionError("Element locator '%s' did not match any elements" % (pattern))
 
     def wait_until_pattern_is_visible(self, pattern, timeout):
@@ -77,15 +152,13 @@ class _WaitingKeywords(KeywordGroup):
         """
         self._info("Setting wait value to '%s'." % (timeout))
         self.set_search_region_to_active_app()
-        try:
-            timeout = self._clean_string(timeout)
-            pattern = self._pattern_finder._find_pattern(pattern)
-            if (timeout == "FOREVER"):
-                wait(pattern, FOREVER)
-            else:
-                timeout = float(timeout)
-                wait(pattern, timeout)
-        except FindFailed, err:
+        timeout = self._clean_string(timeout)
+        locator = self._pattern_finder.compile(pattern)
+        if (timeout != "FOREVER"):
+            timeout = float(timeout)
+        match = self._wait_engine.wait(self._matcher, locator, timeout)
+        self._location_hints.remember(self._matcher, locator, match)
+        if match is None:
             raise AssertionError("Element locator '%s' did not match any elements after %s" % (pattern, timeout))
 
     def wait_for_pattern_to_vanish(self, pattern):
@@ -98,8 +171,7 @@ class _WaitingKeywords(KeywordGroup):
         """
         self._info("Waiting for pattern '%s' to vanish." % (pattern))
         self.set_search_region_to_active_app()
-        pattern = self._pattern_finder._find_pattern(pattern)
-        hidden = waitVanish(pattern)
+        hidden = self._wait_engine.wait_vanish(self._matcher, self._pattern_finder.compile(pattern))
         self._debug(hidden)
 
         if not hidden:
@@ -122,13 +194,10 @@ class _WaitingKeywords(KeywordGroup):
         self._info("Setting wait value to '%s'." % (timeout))
         self.set_search_region_to_active_app()
         timeout = self._clean_string(timeout)
-        pattern = self._pattern_finder._find_pattern(pattern)
-        hidden = None
-        if (timeout == "FOREVER"):
-            hidden = waitVanish(pattern, FOREVER)
-        else:
+        locator = self._pattern_finder.compile(pattern)
+        if (timeout != "FOREVER"):
             timeout = float(timeout)
-            hidden = waitVanish(pattern, timeout)
+        hidden = self._wait_engine.wait_vanish(self._matcher, locator, timeout)
         self._debug(hidden)
         
         if not hidden:
@@ -141,18 +210,29 @@ class _WaitingKeywords(KeywordGroup):
         string_param = string_param.strip()
         return string_param
 
+    def _parse_budget(self, budget):
+        if budget is None or str(budget).strip().lower() in ('', 'none', 'off'):
+            return None
+        return robot.utils.timestr_to_secs(budget)
+
+    def _start_test_deadline(self, longname, attrs):
+        self._deadlines.start_test()
+
+    def _end_test_deadline(self, longname, attrs):
+        self._deadlines.end_test()
+
     def _get_sikulix_timeout(self):
         # Use sikulix_timeout value if set
         if self.sikulix_timeout is not None:
             return self.sikulix_timeout
 
-        # Otherwise use SikuliX's default timeout
-        return getAutoWaitTimeout()
+        # Otherwise use the backend's default timeout
+        return self._matcher.timeout
 
     def _get_sikulix_scanrate(self):
         # Use sikulix_timeout value if set
         if self.sikulix_scanrate is not None:
             return self.sikulix_scanrate
 
-        # Otherwise use SikuliX's default scanrate
-        return getWaitScanRate()
\ No newline at end of file
+        # Otherwise use the backend's default scanrate
+        return self._matcher.scan_rate
\ No newline at end of file
@@ -17,6 +17,9 @@ def _run_on_failure_decorator(method, *args, **kwargs):
     self = args[0]
     already_in_keyword = getattr(self, "_already_in_keyword", False) # If False, we are in the outermost keyword (or in `run_keyword`, if it's a dynamic library)
     self._already_in_keyword = True # Set a flag on the instance so that as we call keywords inside this call and this gets run again, we know we're at least one level in.
+    if not already_in_keyword:
+        self.ROBOT_LIBRARY_LISTENER.latency.start_keyword(method.__name__)
+        self._deadlines.start_keyword()
     try:
         return method(*args, **kwargs)
     except Exception, err:
@@ -27,6 +30,8 @@ def _run_on_failure_decorator(method, *args, **kwargs):
         raise
     finally:
         if not already_in_keyword:
+            self.ROBOT_LIBRARY_LISTENER.latency.end_keyword()
+            self._deadlines.end_keyword()
             # If we are in the outer call, reset the flags.
             self._already_in_keyword = False
             self._has_run_on_failure = False
@@ -1,5 +1,10 @@
 from patternfinder import PatternFinder
+from compiledlocator import CompiledLocator, AlternativeLocator
+from imagestore import ImageStore
 
 __all__ = [
-    "PatternFinder"
+    "PatternFinder",
+    "CompiledLocator",
+    "AlternativeLocator",
+    "ImageStore"
 ]
\ No newline at end of file
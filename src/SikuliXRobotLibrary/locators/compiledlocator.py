@@ -0,0 +1,93 @@
+try:
+    from sikuli import Pattern
+except ImportError:
+    # Frame based matchers such as NumpyMatcher only need the parsed locator
+    Pattern = None
+
+class CompiledLocator(object):
+    """Parsed form of a locator string as produced by `PatternFinder`.
+
+    ``target`` is the image path for PNG locators or the text to search for otherwise.
+    ``similarity`` is None for text locators.
+    ``options`` holds the matching options given after the locator, see `PatternFinder`.
+    When an ``image_store`` is given, patterns are built from its decoded images and are
+    rebuilt whenever the store reloads the image file.
+    """
+    alternatives = None
+
+    def __init__(self, locator, target, similarity, image_store=None, options=None):
+        self.locator = locator
+        self.target = target
+        self.similarity = similarity
+        self.options = options if options is not None else {}
+        self._image_store = image_store
+        self._image = None
+        self._patterns = {}
+
+    # Public
+
+    def is_image(self):
+        return self.similarity is not None
+
+    def is_alternatives(self):
+        return self.alternatives is not None
+
+    def pattern(self, xoffset=None, yoffset=None):
+        """Returns the SikuliX pattern for this locator with the optional target offset applied.
+
+        Text locators are returned as plain strings since SikuliX searches them with OCR.
+        """
+        if not self.is_image():
+            return self.target
+        self._refresh_image()
+        offset = self._target_offset(xoffset, yoffset)
+        if offset not in self._patterns:
+            self._patterns[offset] = self._build_pattern(offset)
+        return self._patterns[offset]
+
+    # Private
+
+    def _target_offset(self, xoffset, yoffset):
+        if xoffset is None and yoffset is None:
+            return None
+        return (int(xoffset), int(yoffset))
+
+    def _refresh_image(self):
+        if self._image_store is None:
+            return
+        image = self._image_store.get(self.target)
+        if image is not self._image:
+            self._image = image
+            self._patterns.clear()
+
+    def _build_pattern(self, offset):
+        # Pattern.targetOffset() modifies the pattern in place, hence one pattern per offset
+        source = self._image if self._image is not None else self.target
+        pattern = Pattern(source).similar(self.similarity)
+        if offset is not None:
+            pattern = pattern.targetOffset(*offset)
+        return pattern
+
+    def __repr__(self):
+        return "CompiledLocator(%r, similarity=%r)" % (self.target, self.similarity)
+
+class AlternativeLocator(CompiledLocator):
+    """Locator matching whichever of its ``alternatives``, in order, is found first.
+
+    Written as the alternatives separated by ``||``, e.g. ``a.png = 0.9 || b.png || Calculator``.
+    Matchers search all ``alternatives`` in the same frame and return the matches of the first
+    alternative that is found.
+    """
+
+    def __init__(self, locator, alternatives):
+        CompiledLocator.__init__(self, locator, None, None)
+        self.alternatives = alternatives
+
+    def is_image(self):
+        return False
+
+    def pattern(self, xoffset=None, yoffset=None):
+        raise ValueError("Locator '%s' has alternatives, it is searched by the matcher." % (self.locator))
+
+    def __repr__(self):
+        return "AlternativeLocator(%r)" % (self.alternatives,)
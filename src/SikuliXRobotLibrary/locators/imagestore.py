@@ -0,0 +1,118 @@
+import os
+from fnmatch import fnmatch
+from SikuliXRobotLibrary import utils
+
+try:
+    from java.io import File
+    from javax.imageio import ImageIO
+except ImportError:
+    # Outside of Jython the images are decoded with Pillow
+    ImageIO = None
+    try:
+        from PIL import Image
+    except ImportError:
+        Image = None
+
+class StoredImage(object):
+    """Decoded reference image together with the file modification time it was read at."""
+
+    def __init__(self, path, mtime, image, width, height):
+        self.path = path
+        self.mtime = mtime
+        self.image = image
+        # Decoded images are held as 32-bit pixels
+        self.size = width * height * 4
+
+class ImageStore(object):
+    """In-memory store of decoded reference images bounded by a memory budget in megabytes.
+
+    Images are looked up by the same name that is used in locators, either absolute or relative
+    to one of the image library directories, and are decoded again only when the file
+    modification time changes.
+    """
+
+    def __init__(self, budget_mb=64):
+        self.directories = []
+        self._index = {}
+        self._images = utils.LRUCache(self._to_bytes(budget_mb), sizeof=lambda stored: stored.size)
+
+    # Public
+
+    def set_budget(self, budget_mb):
+        self._images.set_capacity(self._to_bytes(budget_mb))
+
+    def add_directory(self, directory):
+        directory = os.path.abspath(directory)
+        if directory not in self.directories:
+            self.directories.append(directory)
+
+    def get(self, name):
+        """Returns the decoded image for ``name`` or None if the file cannot be resolved."""
+        path = self._resolve(name)
+        if path is None:
+            return None
+        mtime = os.path.getmtime(path)
+        stored = self._images.get(path)
+        if stored is None or stored.mtime != mtime:
+            stored = self._load(path, mtime)
+        return stored.image
+
+    def preload(self, directory, pattern='*.png'):
+        """Decodes every image under ``directory`` matching ``pattern`` and returns the number of loaded images."""
+        directory = os.path.abspath(directory)
+        self.add_directory(directory)
+        count = 0
+        for root, dirs, files in os.walk(directory):
+            for name in sorted(files):
+                if not fnmatch(name.lower(), pattern.lower()):
+                    continue
+                path = os.path.join(root, name)
+                self._index[os.path.relpath(path, directory).replace(os.sep, '/').lower()] = path
+                self._load(path, os.path.getmtime(path))
+                count += 1
+        return count
+
+    def clear(self):
+        self._images.clear()
+        self._index.clear()
+
+    def stats(self):
+        stats = self._images.stats()
+        stats['directories'] = list(self.directories)
+        return stats
+
+    # Private
+
+    def _to_bytes(self, budget_mb):
+        return int(float(budget_mb) * 1024 * 1024)
+
+    def _resolve(self, name):
+        if os.path.isabs(name):
+            return name if os.path.isfile(name) else None
+        for directory in self.directories:
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                return path
+        # Locators are lowercased by the PatternFinder, fall back to the preloaded file names
+        path = self._index.get(name.replace(os.sep, '/').lower())
+        if path is not None and os.path.isfile(path):
+            return path
+        return None
+
+    def _load(self, path, mtime):
+        (image, width, height) = self._decode(path)
+        stored = StoredImage(path, mtime, image, width, height)
+        self._images.put(path, stored)
+        return stored
+
+    def _decode(self, path):
+        if ImageIO is not None:
+            image = ImageIO.read(File(path))
+            if image is None:
+                raise ValueError("Unable to decode image '%s'." % (path))
+            return (image, image.getWidth(), image.getHeight())
+        if Image is None:
+            raise ImportError("Decoding '%s' requires the Pillow package." % (path))
+        image = Image.open(path)
+        image.load()
+        return (image, image.size[0], image.size[1])
@@ -1,11 +1,58 @@
 from SikuliXRobotLibrary import utils
 import robot
 from robot.api import logger
-from sikuli import *
+from compiledlocator import CompiledLocator, AlternativeLocator
+from imagestore import ImageStore
+
+# Separates the alternatives of a locator, e.g. "a.png = 0.90 || b.png || Calculator". A single '|'
+# is part of the locator, e.g. of a text, and a doubled one is not a cell separator in Robot's pipe format.
+ALTERNATIVE_SEPARATOR = '||'
+
+# Options that may follow a locator, e.g. "pattern.png = 0.90 ; pyramid = 2" or "sign in ; fuzzy = 0.8"
+LOCATOR_OPTIONS = ('pyramid', 'fuzzy')
 
 class PatternFinder(object):
-    def __init__(self):
+    def __init__(self, locator_cache_size=256, image_store_size=64):
         self.locator = None
+        self.locator_cache = utils.LRUCache(locator_cache_size)
+        self.image_store = ImageStore(image_store_size)
+
+    # Public
+
+    def set_locator_cache_size(self, size):
+        """Sets the maximum number of compiled locators kept in the cache."""
+        self.locator_cache.set_capacity(size)
+
+    def clear_locator_cache(self):
+        """Drops all compiled locators, e.g. when the image library path changes."""
+        self.locator_cache.clear()
+
+    def get_locator_cache_statistics(self):
+        return self.locator_cache.stats()
+
+    def compile(self, locator):
+        """Returns the cached `CompiledLocator` for the raw ``locator`` string, parsing it on a cache miss.
+        Locators with alternatives separated by ``||`` are returned as an `AlternativeLocator`."""
+        assert locator is not None and len(locator) > 0
+        utils.latency.set_locator(locator)
+        compiled = self.locator_cache.get(locator)
+        if compiled is None and ALTERNATIVE_SEPARATOR in locator:
+            alternatives = [self.compile(alternative.strip())
+                            for alternative in locator.split(ALTERNATIVE_SEPARATOR) if alternative.strip()]
+            compiled = AlternativeLocator(locator, alternatives)
+            self.locator_cache.put(locator, compiled)
+            utils.latency.set_locator(locator)
+        elif compiled is None:
+            with utils.latency.phase('parse'):
+                (locator_text, options) = self._parse_locator_options(locator.strip().lower())
+                (pattern, sensitivity) = self._parse_locator(locator_text)
+                if (sensitivity != None):
+                    sensitivity = float(sensitivity)
+                compiled = CompiledLocator(locator, pattern, sensitivity, self.image_store, options)
+                self.locator_cache.put(locator, compiled)
+        # Last attempted locator, e.g. for screenshots of the match context on failure
+        self.locator = compiled
+        return compiled
 
     # Private
 
@@ -25,18 +72,22 @@ class PatternFinder(object):
                 sensitivity = 0.70
         return (pattern, sensitivity)
 
-    def _find_pattern(self, locator):
+    def _parse_locator_options(self, locator):
+        """Splits ``name = value`` options separated by ';' from the end of the locator.
+        Text locators that merely contain a ';' are left untouched."""
+        locator_parts = locator.split(';')
+        options = {}
+        for option in locator_parts[1:]:
+            option_parts = option.partition('=')
+            name = option_parts[0].strip()
+            if name not in LOCATOR_OPTIONS or len(option_parts[1]) == 0:
+                return (locator, {})
+            options[name] = option_parts[2].strip()
+        return (locator_parts[0].strip(), options)
+
+    def _find_pattern(self, locator, xoffset=None, yoffset=None):
         """Sets pattern details if string or pattern is provided based on the parsed locator value"""
-        assert locator is not None and len(locator) > 0
-        locator = locator.strip().lower()
-        (pattern, sensitivity) = self._parse_locator(locator)
-
-        if (sensitivity != None):
-            sensitivity = float(sensitivity)
-            pattern = Pattern(pattern).similar(sensitivity)
-        else:
-            pattern = pattern
-        return pattern
+        return self.compile(locator).pattern(xoffset, yoffset)
 
     def _parse_scroll_details(self, scroll):
         """Breaks down scroll details to scroll direction and scroll steps"""
@@ -0,0 +1,25 @@
+from matcher import Matcher, FrameMatch, FindFailed
+try:
+    from sikulimatcher import SikuliMatcher
+except ImportError:
+    # SikuliX is only available on Jython
+    SikuliMatcher = None
+from numpymatcher import NumpyMatcher
+from locationhints import LocationHints
+from waitengine import WaitEngine
+from matchset import MatchSet, MatchSetCache, ORDERS
+from screensearch import ScreenSearch
+
+__all__ = [
+    "Matcher",
+    "FrameMatch",
+    "FindFailed",
+    "SikuliMatcher",
+    "NumpyMatcher",
+    "LocationHints",
+    "WaitEngine",
+    "MatchSet",
+    "MatchSetCache",
+    "ORDERS",
+    "ScreenSearch"
+]
\ No newline at end of file
@@ -0,0 +1,95 @@
+import time
+from SikuliXRobotLibrary import utils
+
+class LocationHints(object):
+    """Remembers where each locator matched last so that the next search starts there.
+
+    The next search of a locator in the same ROI first looks at the last match grown by
+    ``padding`` pixels on each side and falls back to searching the whole ROI on a miss.
+    A failed search keeps the last match, so that the surroundings of the place the locator
+    was last seen can still be captured on failure.
+    """
+
+    def __init__(self, padding=50, capacity=256):
+        self.padding = int(padding)
+        self._hints = utils.LRUCache(capacity)
+        self.hits = 0
+        self.misses = 0
+        self._hinted_time = 0.0
+        self._missed_time = 0.0
+        self._full_time = 0.0
+        self._full_searches = 0
+
+    # Public
+
+    def find(self, matcher, locator, xoffset=None, yoffset=None):
+        """Finds ``locator`` with ``matcher``, trying the last known location first."""
+        key = (locator.locator, matcher.get_roi())
+        hint = self._hints.get(key)
+        if hint is not None:
+            start = time.time()
+            window = self._search_window(hint, key[1])
+            match = matcher.exists(locator, 0, matcher.region(*window), xoffset, yoffset)
+            if match is not None:
+                self._hinted_time += time.time() - start
+                self.hits += 1
+                self._remember(key, match)
+                return match
+            self._missed_time += time.time() - start
+            self.misses += 1
+        start = time.time()
+        match = matcher.find(locator, None, xoffset, yoffset)
+        self._full_time += time.time() - start
+        self._full_searches += 1
+        self._remember(key, match)
+        return match
+
+    def remember(self, matcher, locator, match):
+        """Records ``match`` of ``locator`` found by a search other than `find`, e.g. a wait.
+
+        Nothing is recorded when ``match`` is None, so the last match is kept.
+        """
+        if match is not None:
+            self._remember((locator.locator, matcher.get_roi()), match)
+
+    def window(self, locator, roi, padding=None):
+        """Returns the last match of ``locator`` in ``roi`` grown by ``padding`` pixels and clipped
+        to ``roi``, or None when ``locator`` has not matched in ``roi`` yet."""
+        hint = self._hints.get((locator.locator, roi))
+        if hint is None:
+            return None
+        return self._search_window(hint, roi, padding)
+
+    def clear(self):
+        self._hints.clear()
+
+    def stats(self):
+        """Returns the hint statistics. ``time_saved`` is the time the full searches avoided by hits
+        would have taken minus the time spent searching around hints, including the searches of
+        misses, and is negative when the hints cost more time than they saved."""
+        lookups = self.hits + self.misses
+        hit_rate = float(self.hits) / lookups if lookups else 0.0
+        time_saved = 0.0
+        if self._full_searches:
+            average_full_time = self._full_time / self._full_searches
+            time_saved = average_full_time * self.hits - self._hinted_time - self._missed_time
+        return {'hints': len(self._hints),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': hit_rate,
+                'time_saved': time_saved}
+
+    # Private
+
+    def _remember(self, key, match):
+        self._hints.put(key, (match.getX(), match.getY(), match.getW(), match.getH()))
+
+    def _search_window(self, hint, roi, padding=None):
+        padding = self.padding if padding is None else int(padding)
+        (x, y, w, h) = hint
+        (left, top, right, bottom) = (x - padding, y - padding, x + w + padding, y + h + padding)
+        if roi is not None:
+            # Stay within the ROI so that hints never find matches the full search would not
+            (left, top) = (max(left, roi[0]), max(top, roi[1]))
+            (right, bottom) = (min(right, roi[0] + roi[2]), min(bottom, roi[1] + roi[3]))
+        return (left, top, right - left, bottom - top)
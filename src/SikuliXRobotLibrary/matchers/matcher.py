@@ -0,0 +1,247 @@
+import abc
+import time
+from SikuliXRobotLibrary import utils
+
+try:
+    from sikuli import FindFailed
+except ImportError:
+    class FindFailed(Exception):
+        pass
+
+class FrameMatch(object):
+    """Match found by a frame based matcher, in screen coordinates.
+
+    Mirrors the getters of the SikuliX ``Match`` used by the keywords.
+    """
+
+    def __init__(self, x, y, w, h, score, xoffset=0, yoffset=0):
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+        self.score = score
+        self.xoffset = xoffset
+        self.yoffset = yoffset
+
+    def getX(self):
+        return self.x
+
+    def getY(self):
+        return self.y
+
+    def getW(self):
+        return self.w
+
+    def getH(self):
+        return self.h
+
+    def getScore(self):
+        return self.score
+
+    def getTarget(self):
+        return (self.x + self.w // 2 + self.xoffset, self.y + self.h // 2 + self.yoffset)
+
+    def __repr__(self):
+        return "M[%s,%s %sx%s] S:%.2f" % (self.x, self.y, self.w, self.h, self.score)
+
+class Matcher(object):
+    """Interface of the pattern matching backends used by the keywords.
+
+    Locators are given as `CompiledLocator` objects. ``region`` limits the search to a region,
+    None searches the current ROI. Matches are returned in screen coordinates.
+
+    Subclasses must implement `capture` and `match_all`; the searching and waiting methods
+    poll these at ``scan_rate`` times per second until ``timeout`` seconds have passed.
+
+    ``pyramid`` selects coarse-to-fine searching for matchers that support it: 0 disables it,
+    ``'auto'`` picks the pyramid depth per search and a positive number fixes the depth.
+    A ``pyramid`` option on the locator overrides it for that locator. Matchers searching
+    frames themselves set ``supports_pyramid``; the others ignore both settings.
+
+    When ``text_index`` is set, text locators are searched in the words it read from the frame
+    instead of with a text search of the matcher, see `TextIndex`.
+
+    ``last_match`` is the last match found by `exists`, `find` or `wait`.
+
+    Matchers decoding reference images themselves load them through ``image_store``, the
+    `ImageStore` shared with the locators, when one is set.
+
+    When ``deadlines`` is set, every timeout is limited to the time left of its budgets, see `Deadlines`.
+    """
+    __metaclass__ = abc.ABCMeta
+    supports_pyramid = False
+
+    def __init__(self, timeout=3.0, scan_rate=3.0, pyramid=0):
+        self.timeout = float(timeout)
+        self.scan_rate = float(scan_rate)
+        self.pyramid = parse_pyramid_setting(pyramid)
+        self.last_match = None
+        self.text_index = None
+        self.image_store = None
+        self.deadlines = None
+        # Shared by every poll, alternatives and batches of locators reuse the same threads
+        self._pool = utils.WorkerPool('MatcherWorker')
+
+    def set_pyramid(self, pyramid):
+        self.pyramid = parse_pyramid_setting(pyramid)
+
+    @abc.abstractmethod
+    def capture(self, region=None):
+        """Returns a frame holding the current pixels of ``region``."""
+
+    @abc.abstractmethod
+    def frame_bounds(self, frame):
+        """Returns the ``(x, y, w, h)`` of ``frame`` in screen coordinates."""
+
+    @abc.abstractmethod
+    def crop(self, frame, region):
+        """Returns a frame holding the pixels of ``region``, an ``(x, y, w, h)`` tuple in screen
+        coordinates lying within ``frame``, without capturing the screen again."""
+
+    @abc.abstractmethod
+    def match_all(self, frame, locator, xoffset=None, yoffset=None):
+        """Returns all matches of ``locator`` in ``frame``, best match first."""
+
+    def region(self, x, y, w, h):
+        """Returns the region object this matcher accepts as ``region`` argument."""
+        return (int(x), int(y), int(w), int(h))
+
+    def get_roi(self):
+        """Returns the ``(x, y, w, h)`` of the current ROI or None when the whole frame is searched."""
+        return None
+
+    @abc.abstractmethod
+    def digest(self, frame):
+        """Returns a value that is equal for two frames only if their pixels are the same."""
+
+    @abc.abstractmethod
+    def row_digests(self, frame):
+        """Returns a list of values, one per pixel row of ``frame`` from the top, that are equal for
+        two rows only if their pixels are the same."""
+
+    def resolve_timeout(self, timeout):
+        """Returns ``timeout`` in seconds, the default timeout for None and infinity for ``FOREVER``,
+        limited to the time left of the running test and keyword budgets of ``deadlines``."""
+        if timeout is None:
+            timeout = self.timeout
+        elif timeout == "FOREVER":
+            timeout = float('inf')
+        if self.deadlines is None:
+            return float(timeout)
+        return self.deadlines.clamp(float(timeout))
+
+    def match(self, frame, locator, xoffset=None, yoffset=None):
+        """Returns the best match of ``locator`` in ``frame`` or None."""
+        matches = self.match_all(frame, locator, xoffset, yoffset)
+        if matches:
+            return matches[0]
+        return None
+
+    def match_many(self, frame, locators, workers=4):
+        """Returns the best match or None for each of ``locators`` in the same ``frame``.
+
+        The locators are matched by up to ``workers`` threads. A locator whose search raises
+        `FindFailed` is not found rather than failing the whole batch.
+        """
+        def match_or_none(locator):
+            try:
+                return self.match(frame, locator)
+            except FindFailed:
+                return None
+        return self._map_concurrently(match_or_none, locators, workers)
+
+    def find(self, locator, region=None, xoffset=None, yoffset=None):
+        return self.wait(locator, None, region, xoffset, yoffset)
+
+    def find_all(self, locator, region=None):
+        with utils.latency.phase('capture'):
+            frame = self.capture(region)
+        with utils.latency.phase('match'):
+            matches = self.match_all(frame, locator)
+        if not matches:
+            raise FindFailed("Unable to find '%s'." % (locator.locator))
+        return matches
+
+    def exists(self, locator, timeout=None, region=None, xoffset=None, yoffset=None):
+        deadline = time.time() + self.resolve_timeout(timeout)
+        while True:
+            with utils.latency.phase('capture'):
+                frame = self.capture(region)
+            with utils.latency.phase('match'):
+                match = self.match(frame, locator, xoffset, yoffset)
+            if match is not None:
+                self.last_match = match
+                return match
+            if time.time() >= deadline:
+                return None
+            self._pause()
+
+    def wait(self, locator, timeout=None, region=None, xoffset=None, yoffset=None):
+        match = self.exists(locator, timeout, region, xoffset, yoffset)
+        if match is None:
+            raise FindFailed("Unable to find '%s'." % (locator.locator))
+        return match
+
+    def wait_vanish(self, locator, timeout=None, region=None):
+        deadline = time.time() + self.resolve_timeout(timeout)
+        while True:
+            with utils.latency.phase('capture'):
+                frame = self.capture(region)
+            with utils.latency.phase('match'):
+                match = self.match(frame, locator)
+            if match is None:
+                return True
+            if time.time() >= deadline:
+                return False
+            self._pause()
+
+    # Private
+
+    def _uses_text_index(self, locator):
+        return self.text_index is not None and not locator.is_image() and not locator.is_alternatives()
+
+    def _is_polled(self, locator):
+        """Returns True when ``locator`` must be searched in captured frames by the polling methods"""
+        return locator.is_alternatives() or self._uses_text_index(locator)
+
+    def _match_all_alternatives(self, frame, locator, xoffset, yoffset, workers=4):
+        """Returns the matches of the first of the alternatives of ``locator`` found in ``frame``"""
+        results = self._map_concurrently(lambda alternative: self.match_all(frame, alternative, xoffset, yoffset),
+                                         locator.alternatives, workers)
+        for matches in results:
+            if matches:
+                return matches
+        return []
+
+    def _map_concurrently(self, function, items, workers):
+        return self._pool.map(function, items, workers)
+
+    def _get_pyramid(self, locator):
+        if 'pyramid' in locator.options:
+            return parse_pyramid_setting(locator.options['pyramid'])
+        return self.pyramid
+
+    def _pause(self):
+        time.sleep(1.0 / self.scan_rate)
+
+def region_bounds(region):
+    """Returns ``(x, y, w, h)`` of a tuple or of an object with ``x``, ``y``, ``w`` and ``h`` attributes."""
+    if isinstance(region, (tuple, list)):
+        return tuple(int(value) for value in region)
+    return (int(region.x), int(region.y), int(region.w), int(region.h))
+
+def parse_pyramid_setting(value):
+    """Returns 0 (disabled), ``'auto'`` or the fixed pyramid depth for an import argument or locator option."""
+    if value is None or value is False:
+        return 0
+    if value is True:
+        return 'auto'
+    value = str(value).strip().lower()
+    if value in ('', 'off', 'false', 'no', 'none'):
+        return 0
+    if value in ('auto', 'on', 'true', 'yes'):
+        return 'auto'
+    depth = int(value)
+    if depth < 0:
+        raise ValueError("Invalid pyramid depth: '%s'" % (value))
+    return depth
@@ -0,0 +1,219 @@
+import time
+from SikuliXRobotLibrary import utils
+
+ORDERS = ('xy', 'row_major', 'column_major')
+
+class MatchSet(object):
+    """All matches of a locator in one frame, indexed by position.
+
+    ``matches`` are ordered by ``(x, y)`` as the nth pattern keywords expect. The centers of
+    the matches are bucketed in a grid of cells about the size of a match, so that the match
+    nearest a point and the matches within a rectangle are found without visiting every match.
+
+    For grids and lists the matches are also clustered into rows and columns: matches whose
+    centers are at most ``tolerance`` pixels apart vertically belong to the same row, and the
+    same horizontally for columns. The default ``tolerance`` is half the average match size,
+    so that pixel jitter does not change the order of matches in the same visual row.
+    """
+
+    def __init__(self, matches):
+        self.matches = sorted(matches, key=lambda match: (match.getX(), match.getY()))
+        self._bounds = [(match.getX(), match.getY(), match.getW(), match.getH()) for match in self.matches]
+        self._cell_size = self._get_cell_size(self._bounds)
+        self._cells = {}
+        for index, (x, y, w, h) in enumerate(self._bounds):
+            self._cells.setdefault(self._cell(x + w // 2, y + h // 2), []).append(index)
+        self._extent = self._get_extent(self._cells)
+        self._clusters = {}
+
+    # Public
+
+    def nth(self, index, order='xy', tolerance=None):
+        """Returns the match at ``index``, counting from 0, in ``order``, one of `ORDERS`."""
+        return self.ordered(order, tolerance)[index]
+
+    def ordered(self, order='xy', tolerance=None):
+        """Returns the matches in ``(x, y)`` order, row by row (``row_major``) or column by column (``column_major``)."""
+        if order == 'xy':
+            return self.matches
+        if order not in ORDERS:
+            raise ValueError("Invalid match order '%s', expected one of: %s." % (order, ", ".join(ORDERS)))
+        (rows, columns) = self._get_clusters(tolerance)
+        if order == 'row_major':
+            key = lambda index: (rows[index], columns[index], self._bounds[index][0])
+        else:
+            key = lambda index: (columns[index], rows[index], self._bounds[index][1])
+        return [self.matches[index] for index in sorted(range(len(self.matches)), key=key)]
+
+    def row_major(self, tolerance=None):
+        """Returns the matches ordered row by row, top to bottom, then left to right."""
+        return self.ordered('row_major', tolerance)
+
+    def at(self, row, column, tolerance=None):
+        """Returns the match in ``row`` and ``column``, counting from 0, or None if that cell is empty."""
+        (rows, columns) = self._get_clusters(tolerance)
+        for index in range(len(self.matches)):
+            if rows[index] == row and columns[index] == column:
+                return self.matches[index]
+        return None
+
+    def shape(self, tolerance=None):
+        """Returns the number of rows and columns the matches are arranged in."""
+        (rows, columns) = self._get_clusters(tolerance)
+        return (max(rows) + 1 if rows else 0, max(columns) + 1 if columns else 0)
+
+    def nearest(self, x, y):
+        """Returns the match whose center is nearest to the point or None if there are no matches."""
+        if not self.matches:
+            return None
+        (column, row) = self._cell(x, y)
+        best = None
+        best_distance = None
+        max_ring = self._max_ring(column, row)
+        for ring in range(max_ring + 1):
+            for cell in self._ring(column, row, ring):
+                for index in self._cells.get(cell, ()):
+                    distance = self._distance(index, x, y)
+                    if best_distance is None or distance < best_distance:
+                        (best, best_distance) = (index, distance)
+            # Matches in the next rings are at least ``ring`` cells away
+            if best_distance is not None and best_distance <= (ring * self._cell_size) ** 2:
+                break
+        return self.matches[best]
+
+    def within(self, x, y, w, h):
+        """Returns the matches lying entirely within the rectangle in ``(x, y)`` order."""
+        (left, top) = self._cell(x, y)
+        (right, bottom) = self._cell(x + w, y + h)
+        indexes = []
+        for column in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                for index in self._cells.get((column, row), ()):
+                    (mx, my, mw, mh) = self._bounds[index]
+                    if mx >= x and my >= y and mx + mw <= x + w and my + mh <= y + h:
+                        indexes.append(index)
+        return [self.matches[index] for index in sorted(indexes)]
+
+    def __len__(self):
+        return len(self.matches)
+
+    # Private
+
+    def _get_cell_size(self, bounds):
+        if not bounds:
+            return 1
+        return max(sum(max(w, h) for (x, y, w, h) in bounds) // len(bounds), 1)
+
+    def _cell(self, x, y):
+        return (int(x) // self._cell_size, int(y) // self._cell_size)
+
+    def _get_extent(self, cells):
+        if not cells:
+            return None
+        columns = [cell[0] for cell in cells]
+        rows = [cell[1] for cell in cells]
+        return (min(columns), min(rows), max(columns), max(rows))
+
+    def _max_ring(self, column, row):
+        (left, top, right, bottom) = self._extent
+        return max(abs(column - left), abs(column - right), abs(row - top), abs(row - bottom))
+
+    def _ring(self, column, row, ring):
+        if ring == 0:
+            return [(column, row)]
+        cells = []
+        for offset in range(-ring, ring + 1):
+            cells.extend([(column + offset, row - ring), (column + offset, row + ring)])
+        for offset in range(-ring + 1, ring):
+            cells.extend([(column - ring, row + offset), (column + ring, row + offset)])
+        return cells
+
+    def _get_clusters(self, tolerance):
+        """Returns the row and the column number of every match."""
+        if tolerance is None:
+            tolerance = self._cell_size / 2.0
+        tolerance = float(tolerance)
+        if tolerance not in self._clusters:
+            centers_y = [y + h / 2.0 for (x, y, w, h) in self._bounds]
+            centers_x = [x + w / 2.0 for (x, y, w, h) in self._bounds]
+            self._clusters[tolerance] = (cluster(centers_y, tolerance), cluster(centers_x, tolerance))
+        return self._clusters[tolerance]
+
+    def _distance(self, index, x, y):
+        (mx, my, mw, mh) = self._bounds[index]
+        return (mx + mw // 2 - x) ** 2 + (my + mh // 2 - y) ** 2
+
+def cluster(values, tolerance):
+    """Returns the cluster number of each of ``values`` after sorting them in O(n log n).
+
+    A value starts a new cluster when it is more than ``tolerance`` above the first value of
+    the current cluster. Clusters are numbered from 0 in ascending order.
+    """
+    clusters = [0] * len(values)
+    number = -1
+    first = None
+    for index in sorted(range(len(values)), key=values.__getitem__):
+        if first is None or values[index] - first > tolerance:
+            number += 1
+            first = values[index]
+        clusters[index] = number
+    return clusters
+
+class MatchSetCache(object):
+    """Short-lived cache of the `MatchSet` of each locator and ROI.
+
+    A cached match set is reused for ``ttl`` seconds as long as the pixels of the ROI are
+    unchanged, which is checked by capturing the ROI again and comparing its digest. A ``ttl``
+    of 0 disables the cache.
+    """
+
+    def __init__(self, ttl=5.0, capacity=32):
+        self.ttl = float(ttl)
+        self._sets = utils.LRUCache(capacity)
+        self.hits = 0
+        self.misses = 0
+
+    # Public
+
+    def get(self, matcher, locator, timeout=0):
+        """Returns the `MatchSet` of ``locator`` in the current ROI, searching only when the ROI changed.
+
+        With a ``timeout`` the ROI is captured again at the scan rate of ``matcher`` until there
+        is a match or ``timeout`` seconds have passed, as `Matcher.wait` does.
+        """
+        deadline = time.time() + timeout
+        while True:
+            match_set = self._get(matcher, locator)
+            remaining = deadline - time.time()
+            if len(match_set) or remaining <= 0:
+                return match_set
+            time.sleep(min(1.0 / matcher.scan_rate, remaining))
+
+    def clear(self):
+        self._sets.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'size': len(self._sets),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': float(self.hits) / lookups if lookups else 0.0}
+
+    # Private
+
+    def _get(self, matcher, locator):
+        key = (locator.locator, matcher.get_roi())
+        with utils.latency.phase('capture'):
+            frame = matcher.capture()
+        digest = matcher.digest(frame)
+        now = time.time()
+        cached = self._sets.get(key)
+        if cached is not None and cached[1] == digest and now - cached[0] < self.ttl:
+            self.hits += 1
+            return cached[2]
+        self.misses += 1
+        with utils.latency.phase('match'):
+            match_set = MatchSet(matcher.match_all(frame, locator))
+        if self.ttl > 0:
+            self._sets.put(key, (now, digest, match_set))
+        return match_set
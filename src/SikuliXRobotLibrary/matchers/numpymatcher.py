@@ -0,0 +1,346 @@
+import os
+import math
+import weakref
+import hashlib
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from robot.api import logger
+from matcher import Matcher, FrameMatch, region_bounds
+from SikuliXRobotLibrary.locators.imagestore import ImageStore
+
+class Frame(object):
+    """Grayscale pixels of a captured region together with its screen position."""
+
+    def __init__(self, pixels, x=0, y=0):
+        self.pixels = pixels
+        self.x = x
+        self.y = y
+
+    @property
+    def w(self):
+        return self.pixels.shape[1]
+
+    @property
+    def h(self):
+        return self.pixels.shape[0]
+
+class NumpyMatcher(Matcher):
+    """CPython matcher doing normalized cross-correlation over NumPy arrays.
+
+    The screen is provided by ``frame_source``, a callable returning the whole screen as an
+    ``(h, w)`` or ``(h, w, channels)`` array, or set directly with `set_frame`. A
+    ``region_source`` taking ``(x, y, w, h)`` can be set instead to capture only the searched
+    region; it returns the pixels of the part on the screen with their ``(x, y)`` position.
+    Reference images are found by absolute paths or in the directories added with
+    `add_image_directory` and decoded by ``image_store``, whose memory budget, modification time
+    checks and preloading apply to them. Their grayscale pixels are kept only as long as the
+    store keeps the decoded image. Searches without a region are limited to the ROI set with `set_roi`.
+    Scores are the same as OpenCV's ``TM_CCOEFF_NORMED`` used by SikuliX.
+
+    With ``pyramid`` enabled, candidates are searched on frames downsampled by ``2 ** depth``
+    and only the areas around the candidates are searched again at full resolution. The
+    candidates are the ``PYRAMID_CANDIDATES`` best peaks of the downsampled frame and every
+    peak scoring at least ``similarity - pyramid_tolerance * depth``, since a needle that is
+    not aligned to the downsampling grid scores much lower there than at full resolution.
+    In ``'auto'`` mode the depth is chosen so that the downsampled needle keeps at least
+    ``MIN_PYRAMID_NEEDLE`` pixels per side and stays small compared to the frame; small
+    frames are searched at full resolution. A fixed depth is lowered as well when it would
+    shrink the needle below ``MIN_PYRAMID_NEEDLE`` pixels.
+
+    All matches are returned as SikuliX's ``findAll`` does. ``max_matches`` limits them to the
+    best ones instead, with a warning whenever matches are dropped.
+
+    Text locators are only supported with a ``text_index`` since there is no OCR in this matcher.
+    """
+    supports_pyramid = True
+    MIN_PYRAMID_NEEDLE = 8
+    MAX_PYRAMID_DEPTH = 4
+    PYRAMID_CANDIDATES = 16
+
+    def __init__(self, frame_source=None, timeout=3.0, scan_rate=3.0, max_matches=None,
+                 pyramid=0, pyramid_tolerance=0.2):
+        if numpy is None:
+            raise ImportError("NumpyMatcher requires the numpy package.")
+        Matcher.__init__(self, timeout, scan_rate, pyramid)
+        self.pyramid_tolerance = pyramid_tolerance
+        self.frame_source = frame_source
+        self.region_source = None
+        self.max_matches = max_matches
+        self.image_directories = []
+        self.image_store = ImageStore()
+        self.roi = None
+        self._frame = None
+        # Grayscale pixels by decoded image, dropped when the image store drops the image
+        self._needles = weakref.WeakKeyDictionary()
+
+    # Public
+
+    def set_frame(self, pixels):
+        self._frame = to_grayscale(pixels)
+
+    def set_roi(self, x, y, w, h):
+        self.roi = (int(x), int(y), int(w), int(h))
+
+    def get_roi(self):
+        return self.roi
+
+    def add_image_directory(self, directory):
+        directory = os.path.abspath(directory)
+        if directory not in self.image_directories:
+            self.image_directories.append(directory)
+
+    def capture(self, region=None):
+        if region is None:
+            region = self.roi
+        if self.region_source is not None and region is not None:
+            (pixels, x, y) = self.region_source(*region_bounds(region))
+            return Frame(to_grayscale(pixels), x, y)
+        if self.frame_source is not None:
+            self.set_frame(self.frame_source())
+        if self._frame is None:
+            raise ValueError("No frame available, provide a frame_source or call set_frame.")
+        if region is None:
+            return Frame(self._frame)
+        x, y, w, h = region_bounds(region)
+        # Regions may reach beyond the screen, e.g. padded search windows
+        left, top = max(x, 0), max(y, 0)
+        return Frame(self._frame[top:max(y + h, top), left:max(x + w, left)], left, top)
+
+    def frame_bounds(self, frame):
+        return (frame.x, frame.y, frame.w, frame.h)
+
+    def crop(self, frame, region):
+        x, y, w, h = region_bounds(region)
+        left, top = max(x - frame.x, 0), max(y - frame.y, 0)
+        return Frame(frame.pixels[top:max(y - frame.y + h, top), left:max(x - frame.x + w, left)],
+                     frame.x + left, frame.y + top)
+
+    def match_all(self, frame, locator, xoffset=None, yoffset=None):
+        if locator.is_alternatives():
+            return self._match_all_alternatives(frame, locator, xoffset, yoffset)
+        if self._uses_text_index(locator):
+            return self.text_index.match_all(self, frame, locator, xoffset, yoffset)
+        if not locator.is_image():
+            raise ValueError("Text locator '%s' is not supported by NumpyMatcher." % (locator.locator))
+        needle = self.load_needle(locator.target)
+        depth = self._pyramid_depth(frame.pixels.shape, needle.shape, self._get_pyramid(locator))
+        if depth > 0:
+            matches = self._pyramid_matches(frame, needle, depth, locator.similarity, xoffset, yoffset)
+        else:
+            scores = normalized_cross_correlation(frame.pixels, needle)
+            matches = self._to_matches(frame, needle, scores, locator.similarity, xoffset, yoffset)
+        return self._limit(matches, locator)
+
+    def digest(self, frame):
+        pixels = numpy.ascontiguousarray(frame.pixels)
+        return (frame.x, frame.y, pixels.shape, hashlib.md5(pixels.tobytes()).hexdigest())
+
+    def row_digests(self, frame):
+        pixels = numpy.ascontiguousarray(frame.pixels)
+        return [hashlib.md5(row.tobytes()).digest() for row in pixels]
+
+    def load_needle(self, name):
+        image = self.image_store.get(self._resolve(name))
+        needle = self._needles.get(image)
+        if needle is None:
+            needle = self._needles[image] = to_grayscale(numpy.asarray(image.convert('RGB')))
+        return needle
+
+    # Private
+
+    def _resolve(self, name):
+        if os.path.isabs(name) and os.path.isfile(name):
+            return name
+        for directory in self.image_directories:
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                return path
+        # Locators are lowercased by the PatternFinder, compare every path component case-insensitively
+        if os.path.isabs(name):
+            (drive, relative) = os.path.splitdrive(name)
+            path = self._find_ignoring_case(drive + os.sep, relative)
+            if path is not None:
+                return path
+        for directory in self.image_directories:
+            path = self._find_ignoring_case(directory, name)
+            if path is not None:
+                return path
+        raise IOError("Reference image '%s' not found in %s." % (name, self.image_directories))
+
+    def _find_ignoring_case(self, root, relative):
+        """Returns the file ``relative`` below ``root`` with each component matched ignoring case, or None."""
+        path = root
+        for component in relative.replace('\\', '/').split('/'):
+            if component in ('', '.'):
+                continue
+            candidate = os.path.join(path, component)
+            if not os.path.exists(candidate):
+                if not os.path.isdir(path):
+                    return None
+                names = [entry for entry in sorted(os.listdir(path)) if entry.lower() == component.lower()]
+                if not names:
+                    return None
+                candidate = os.path.join(path, names[0])
+            path = candidate
+        return path if os.path.isfile(path) else None
+
+    def _pyramid_depth(self, frame_shape, needle_shape, pyramid):
+        # Each level halves the needle, keep it large enough to be distinctive
+        depth = int(math.log(max(float(min(needle_shape)) / self.MIN_PYRAMID_NEEDLE, 1.0), 2))
+        if pyramid != 'auto':
+            return min(pyramid, depth)
+        ratio = min(float(frame_shape[0]) / needle_shape[0], float(frame_shape[1]) / needle_shape[1])
+        if ratio < 4:
+            return 0
+        depth = min(depth, int(math.log(ratio, 2)) - 1, self.MAX_PYRAMID_DEPTH)
+        return max(depth, 0)
+
+    def _pyramid_matches(self, frame, needle, depth, similarity, xoffset, yoffset):
+        factor = 2 ** depth
+        coarse_needle = downsample(needle, factor)
+        if min(coarse_needle.shape) == 0:
+            scores = normalized_cross_correlation(frame.pixels, needle)
+            return self._to_matches(frame, needle, scores, similarity, xoffset, yoffset)
+        coarse_scores = normalized_cross_correlation(downsample(frame.pixels, factor), coarse_needle)
+        # Needles at offsets that are not multiples of the factor score far lower when downsampled,
+        # keep the best peaks whatever their score and every peak above a threshold lowered per level
+        threshold = similarity - self.pyramid_tolerance * depth
+        candidates = find_peaks(coarse_scores, coarse_needle.shape, threshold)
+        positions = set((y, x) for (y, x, score) in candidates)
+        candidates.extend(peak for peak in find_peaks(coarse_scores, coarse_needle.shape, -1.0, self.PYRAMID_CANDIDATES)
+                          if peak[:2] not in positions)
+        nh, nw = needle.shape
+        matches = []
+        for (y, x, score) in candidates:
+            # Refine at full resolution within one coarse pixel around the candidate
+            top = max(y * factor - factor, 0)
+            left = max(x * factor - factor, 0)
+            window = Frame(frame.pixels[top:y * factor + nh + factor, left:x * factor + nw + factor],
+                           frame.x + left, frame.y + top)
+            scores = normalized_cross_correlation(window.pixels, needle)
+            matches.extend(self._to_matches(window, needle, scores, similarity, xoffset, yoffset))
+        return self._remove_overlaps(matches)
+
+    def _remove_overlaps(self, matches):
+        kept = []
+        for match in sorted(matches, key=lambda match: -match.score):
+            overlapping = [other for other in kept
+                           if abs(other.x - match.x) < match.w and abs(other.y - match.y) < match.h]
+            if not overlapping:
+                kept.append(match)
+        return kept
+
+    def _limit(self, matches, locator):
+        if self.max_matches is None or len(matches) <= self.max_matches:
+            return matches
+        logger.warn("Found %d matches of '%s', only the best %d are used, see max_matches."
+                    % (len(matches), locator.locator, self.max_matches))
+        return matches[:self.max_matches]
+
+    def _to_matches(self, frame, needle, scores, similarity, xoffset, yoffset):
+        h, w = needle.shape
+        return [FrameMatch(frame.x + x, frame.y + y, w, h, score, int(xoffset or 0), int(yoffset or 0))
+                for (y, x, score) in find_peaks(scores, needle.shape, similarity)]
+
+def find_peaks(scores, needle_shape, threshold, limit=None):
+    """Returns the ``(y, x, score)`` positions scoring at least ``threshold``, best first, at most
+    ``limit`` of them when given. Positions closer than the needle size to a better one are suppressed."""
+    h, w = needle_shape
+    candidates = numpy.flatnonzero(scores >= threshold)
+    if candidates.size == 0:
+        return []
+    candidates = candidates[numpy.argsort(-scores.ravel()[candidates], kind='mergesort')]
+    suppressed = numpy.zeros(scores.shape, dtype=bool)
+    peaks = []
+    for index in candidates:
+        y, x = divmod(int(index), scores.shape[1])
+        if suppressed[y, x]:
+            continue
+        # Overlapping candidates belong to the same match, keep only the best one
+        suppressed[max(y - h + 1, 0):y + h, max(x - w + 1, 0):x + w] = True
+        peaks.append((y, x, float(scores[y, x])))
+        if limit is not None and len(peaks) >= limit:
+            break
+    return peaks
+
+def downsample(pixels, factor):
+    """Averages ``factor`` x ``factor`` blocks, dropping the incomplete blocks at the edges."""
+    h = pixels.shape[0] // factor * factor
+    w = pixels.shape[1] // factor * factor
+    return pixels[:h, :w].reshape(h // factor, factor, w // factor, factor).mean(axis=3).mean(axis=1)
+
+def read_image(path):
+    if Image is None:
+        raise ImportError("Reading '%s' requires the Pillow package." % (path))
+    return numpy.asarray(Image.open(path).convert('RGB'))
+
+def to_grayscale(pixels):
+    pixels = numpy.asarray(pixels)
+    if pixels.ndim == 3:
+        pixels = numpy.dot(pixels[..., :3].astype(numpy.float64), [0.299, 0.587, 0.114])
+    return pixels.astype(numpy.float64, copy=False)
+
+def normalized_cross_correlation(haystack, needle):
+    """Returns the ``TM_CCOEFF_NORMED`` score of ``needle`` at every position of ``haystack``.
+
+    The correlation is computed with FFTs and the local statistics with integral images, so the
+    cost does not grow with the needle size.
+    """
+    hh, hw = haystack.shape
+    nh, nw = needle.shape
+    if nh > hh or nw > hw:
+        return numpy.zeros((0, 0))
+    count = float(nh * nw)
+    template = needle - needle.mean()
+    template_norm = numpy.sqrt((template * template).sum())
+
+    window_sum = _window_sums(haystack, nh, nw)
+    window_sq_sum = _window_sums(haystack * haystack, nh, nw)
+    variance = numpy.maximum(window_sq_sum - window_sum * window_sum / count, 0)
+
+    if template_norm == 0:
+        # Flat needle: only flat windows of the same brightness are a match
+        mean_delta = numpy.abs(window_sum / count - needle.mean()) / 255.0
+        return numpy.where(variance < 1e-6, 1.0 - mean_delta, 0.0)
+
+    # Padding to sizes with small prime factors keeps the FFTs fast for any frame size
+    shape = (_fft_size(hh + nh - 1), _fft_size(hw + nw - 1))
+    spectrum = numpy.fft.rfft2(haystack, shape) * numpy.fft.rfft2(template[::-1, ::-1], shape)
+    correlation = numpy.fft.irfft2(spectrum, shape)[nh - 1:hh, nw - 1:hw]
+
+    denominator = numpy.sqrt(variance) * template_norm
+    scores = numpy.zeros(correlation.shape)
+    valid = denominator > 1e-6
+    scores[valid] = correlation[valid] / denominator[valid]
+    return numpy.clip(scores, -1.0, 1.0)
+
+def _fft_size(size):
+    """Returns the smallest number of the form ``2 ** a * 3 ** b * 5 ** c`` not less than ``size``."""
+    best = 1
+    while best < size:
+        best *= 2
+    power_of_5 = 1
+    while power_of_5 < best:
+        power_of_3 = power_of_5
+        while power_of_3 < best:
+            candidate = power_of_3
+            while candidate < size:
+                candidate *= 2
+            best = min(best, candidate)
+            power_of_3 *= 3
+        power_of_5 *= 5
+    return best
+
+def _window_sums(pixels, nh, nw):
+    integral = numpy.zeros((pixels.shape[0] + 1, pixels.shape[1] + 1))
+    integral[1:, 1:] = pixels.cumsum(0).cumsum(1)
+    return integral[nh:, nw:] - integral[:-nh, nw:] - integral[nh:, :-nw] + integral[:-nh, :-nw]
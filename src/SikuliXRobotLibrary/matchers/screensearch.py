@@ -0,0 +1,96 @@
+import sys
+import time
+import threading
+from Queue import Queue
+from SikuliXRobotLibrary import utils
+
+class ScreenSearch(object):
+    """Searches locators on several screens at the same time, one worker thread per screen.
+
+    Each worker captures its screen once per poll and matches every locator in that capture.
+    The workers are started on the first search and kept for the following ones. In ``first``
+    mode the workers stop matching as soon as one of them found a locator and the match found
+    first is returned; in ``best`` mode all screens are searched and the best scoring match wins.
+    """
+    MODES = ('first', 'best')
+
+    def __init__(self):
+        self._queues = []
+        self._lock = threading.Lock()
+        self.polls = 0
+        self.captures = 0
+
+    # Public
+
+    def match(self, matcher, screens, locators, stop_early=False):
+        """Returns ``(screen, locator, match)`` index and match tuples of every locator found in one
+        capture of each of ``screens``, in the order they were found."""
+        self._start(len(screens))
+        self.polls += 1
+        results = Queue()
+        found = threading.Event() if stop_early else None
+        for index, screen in enumerate(screens):
+            self._queues[index].put((matcher, index, screen, locators, found, results))
+        matches = []
+        error = None
+        # Captures and matches overlap in the workers, the wait is accounted as matching
+        with utils.latency.phase('match'):
+            for _ in screens:
+                (screen_matches, exc_info) = results.get()
+                matches.extend(screen_matches)
+                if exc_info is not None and error is None:
+                    error = exc_info
+        self.captures += len(screens)
+        if error is not None:
+            raise error[0], error[1], error[2]
+        return matches
+
+    def find(self, matcher, screens, locators, timeout=None, mode='first'):
+        """Returns the ``(screen, locator, match)`` found first or best, polling until ``timeout``,
+        or None when no locator appeared on any screen."""
+        if mode not in self.MODES:
+            raise ValueError("Invalid screen search mode '%s', expected one of: %s." % (mode, ", ".join(self.MODES)))
+        deadline = time.time() + matcher.resolve_timeout(timeout)
+        while True:
+            matches = self.match(matcher, screens, locators, mode == 'first')
+            if matches:
+                if mode == 'first':
+                    return matches[0]
+                return max(matches, key=lambda found: found[2].getScore())
+            if time.time() >= deadline:
+                return None
+            matcher._pause()
+
+    def stats(self):
+        return {'screens': len(self._queues),
+                'polls': self.polls,
+                'captures': self.captures}
+
+    # Private
+
+    def _start(self, count):
+        with self._lock:
+            while len(self._queues) < count:
+                queue = Queue()
+                thread = threading.Thread(target=self._run, args=(queue,), name='ScreenSearch-%d' % (len(self._queues)))
+                thread.setDaemon(True)
+                thread.start()
+                self._queues.append(queue)
+
+    def _run(self, queue):
+        while True:
+            (matcher, index, screen, locators, found, results) = queue.get()
+            matches = []
+            try:
+                frame = matcher.capture(matcher.region(*screen))
+                for locator_index, locator in enumerate(locators):
+                    if found is not None and found.isSet():
+                        break
+                    match = matcher.match(frame, locator)
+                    if match is not None:
+                        matches.append((index, locator_index, match))
+                        if found is not None:
+                            found.set()
+                results.put((matches, None))
+            except:
+                results.put((matches, sys.exc_info()))
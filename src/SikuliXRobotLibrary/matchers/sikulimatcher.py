@@ -0,0 +1,155 @@
+from sikuli import *
+from org.sikuli.script import ScreenImage
+from java.awt import Rectangle
+from java.awt.image import BufferedImage
+from java.util import Arrays
+from matcher import Matcher, region_bounds
+from SikuliXRobotLibrary import utils
+
+class SikuliMatcher(Matcher):
+    """Matcher backed by the SikuliX runtime.
+
+    Searching and waiting are delegated to SikuliX so that ``Settings.AutoWaitTimeout`` and
+    ``Settings.WaitScanRate`` apply. Without a ``region`` the default ``SCREEN`` is searched,
+    which is what the global SikuliX functions do within the ROI set by ``setROI``.
+    Frames are SikuliX ``ScreenImage`` captures. Locators with alternatives and, with a
+    ``text_index``, text locators are searched by polling captures instead.
+    """
+
+    def __init__(self):
+        Matcher.__init__(self, getAutoWaitTimeout(), getWaitScanRate())
+
+    def capture(self, region=None):
+        region = self._get_region(region)
+        return region.getScreen().capture(region)
+
+    def region(self, x, y, w, h):
+        return Region(int(x), int(y), int(w), int(h))
+
+    def get_roi(self):
+        return (getX(), getY(), getW(), getH())
+
+    def frame_bounds(self, frame):
+        roi = frame.getROI()
+        return (roi.x, roi.y, roi.width, roi.height)
+
+    def crop(self, frame, region):
+        (x, y, w, h) = region_bounds(region)
+        roi = frame.getROI()
+        # Sub-images share the raster of the whole frame, copy the pixels so that digests only see the crop
+        image = BufferedImage(w, h, BufferedImage.TYPE_INT_RGB)
+        graphics = image.createGraphics()
+        try:
+            graphics.drawImage(frame.getImage().getSubimage(x - roi.x, y - roi.y, w, h), 0, 0, None)
+        finally:
+            graphics.dispose()
+        return ScreenImage(Rectangle(x, y, w, h), image)
+
+    def match_all(self, frame, locator, xoffset=None, yoffset=None):
+        if locator.is_alternatives():
+            return self._match_all_alternatives(frame, locator, xoffset, yoffset)
+        if self._uses_text_index(locator):
+            # Text matches never had a target offset, keep clicking their center
+            return [Match(Region(match.x, match.y, match.w, match.h), match.score)
+                    for match in self.text_index.match_all(self, frame, locator)]
+        pattern = locator.pattern(xoffset, yoffset)
+        frame_region = Region(frame.getROI())
+        if not locator.is_image():
+            # OCR text search is not available on captured images, search the live region instead.
+            # The search must not wait, the callers poll and a missing text is not a failure.
+            frame_region.setAutoWaitTimeout(0)
+            try:
+                return self._to_list(frame_region.findAll(pattern))
+            except FindFailed:
+                return []
+        finder = Finder(frame, frame_region)
+        try:
+            finder.findAll(pattern)
+            matches = []
+            while finder.hasNext():
+                matches.append(finder.next())
+            return sorted(matches, key=lambda match: -match.getScore())
+        finally:
+            finder.destroy()
+
+    def digest(self, frame):
+        roi = frame.getROI()
+        pixels = frame.getImage().getRaster().getDataBuffer().getData()
+        return (roi.x, roi.y, roi.width, roi.height, Arrays.hashCode(pixels))
+
+    def row_digests(self, frame):
+        image = frame.getImage()
+        width = image.getWidth()
+        return [Arrays.hashCode(image.getRGB(0, y, width, 1, None, 0, width)) for y in range(image.getHeight())]
+
+    def find(self, locator, region=None, xoffset=None, yoffset=None):
+        if self._is_polled(locator):
+            return Matcher.find(self, locator, region, xoffset, yoffset)
+        if region is None:
+            region = SCREEN
+        with utils.latency.phase('match'):
+            # Waiting explicitly so that the timeout is limited by the running budgets
+            match = region.wait(locator.pattern(xoffset, yoffset), self._sikuli_timeout(self.resolve_timeout(None)))
+        return self._record(match)
+
+    def find_all(self, locator, region=None):
+        if self._is_polled(locator):
+            return Matcher.find_all(self, locator, region)
+        if region is None:
+            region = SCREEN
+        with utils.latency.phase('match'):
+            return self._to_list(region.findAll(locator.pattern()))
+
+    def exists(self, locator, timeout=None, region=None, xoffset=None, yoffset=None):
+        if self._is_polled(locator):
+            return Matcher.exists(self, locator, timeout, region, xoffset, yoffset)
+        pattern = locator.pattern(xoffset, yoffset)
+        if region is None:
+            region = SCREEN
+        with utils.latency.phase('match'):
+            return self._record(region.exists(pattern, self._sikuli_timeout(self.resolve_timeout(timeout))))
+
+    def wait(self, locator, timeout=None, region=None, xoffset=None, yoffset=None):
+        if self._is_polled(locator):
+            return Matcher.wait(self, locator, timeout, region, xoffset, yoffset)
+        pattern = locator.pattern(xoffset, yoffset)
+        if region is None:
+            region = SCREEN
+        with utils.latency.phase('match'):
+            return self._record(region.wait(pattern, self._sikuli_timeout(self.resolve_timeout(timeout))))
+
+    def wait_vanish(self, locator, timeout=None, region=None):
+        if self._is_polled(locator):
+            return Matcher.wait_vanish(self, locator, timeout, region)
+        pattern = locator.pattern()
+        if region is None:
+            region = SCREEN
+        with utils.latency.phase('match'):
+            return region.waitVanish(pattern, self._sikuli_timeout(self.resolve_timeout(timeout)))
+
+    # Private
+
+    def _record(self, match):
+        """Returns ``match`` after recording it as the last match. Searches in other regions than
+        ``SCREEN``, e.g. around location hints, do not change the last match of ``SCREEN``."""
+        if match is not None:
+            self.last_match = match
+        return match
+
+    def _get_region(self, region):
+        if region is not None:
+            return region
+        return Region(getX(), getY(), getW(), getH())
+
+    def _sikuli_timeout(self, timeout):
+        if timeout == "FOREVER" or timeout == float('inf'):
+            return FOREVER
+        return float(timeout)
+
+    def _to_list(self, matches):
+        found = []
+        if matches is None:
+            return found
+        while matches.hasNext():
+            found.append(matches.next())
+        return found
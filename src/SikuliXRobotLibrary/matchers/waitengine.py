@@ -0,0 +1,79 @@
+import time
+from SikuliXRobotLibrary import utils
+
+class WaitEngine(object):
+    """Waits for a pattern to appear or vanish, matching only when the search region changed.
+
+    Each poll captures the search region and compares the digest of the capture with the
+    previous one. Unchanged captures are not matched again. With a ``min_scan_rate`` the
+    polling also slows down from ``max_scan_rate`` to ``min_scan_rate`` polls per second
+    while the region stays unchanged; as soon as it changes, polling goes back to
+    ``max_scan_rate``. Without a ``max_scan_rate`` the scan rate of the matcher is used and
+    without a ``min_scan_rate`` the polling does not slow down.
+
+    A successful wait records its match as the ``last_match`` of the matcher.
+    """
+
+    def __init__(self, min_scan_rate=None, max_scan_rate=None, backoff=1.5):
+        self.min_scan_rate = float(min_scan_rate) if min_scan_rate is not None else None
+        self.max_scan_rate = float(max_scan_rate) if max_scan_rate is not None else None
+        self.backoff = float(backoff)
+        self.polls = 0
+        self.matches = 0
+
+    # Public
+
+    def wait(self, matcher, locator, timeout=None, region=None, xoffset=None, yoffset=None):
+        """Returns the match of ``locator`` or None if it did not appear before ``timeout``."""
+        match = self._poll(matcher, locator, timeout, region, xoffset, yoffset, lambda match: match is not None)
+        if match is not None:
+            # Keywords acting on the last match use it, as after `Matcher.wait`
+            matcher.last_match = match
+        return match
+
+    def wait_vanish(self, matcher, locator, timeout=None, region=None):
+        """Returns True when ``locator`` is no longer visible before ``timeout``, otherwise False."""
+        match = self._poll(matcher, locator, timeout, region, None, None, lambda match: match is None)
+        return match is None
+
+    def stats(self):
+        skipped = self.polls - self.matches
+        skip_rate = float(skipped) / self.polls if self.polls else 0.0
+        return {'polls': self.polls,
+                'matches': self.matches,
+                'skipped': skipped,
+                'skip_rate': skip_rate}
+
+    # Private
+
+    def _poll(self, matcher, locator, timeout, region, xoffset, yoffset, is_done):
+        deadline = time.time() + matcher.resolve_timeout(timeout)
+        shortest_interval = 1.0 / self._get_max_scan_rate(matcher)
+        longest_interval = shortest_interval
+        if self.min_scan_rate is not None:
+            longest_interval = max(1.0 / self.min_scan_rate, shortest_interval)
+        interval = shortest_interval
+        previous_digest = None
+        match = None
+        while True:
+            with utils.latency.phase('capture'):
+                frame = matcher.capture(region)
+                digest = matcher.digest(frame)
+            self.polls += 1
+            if digest != previous_digest:
+                with utils.latency.phase('match'):
+                    match = matcher.match(frame, locator, xoffset, yoffset)
+                self.matches += 1
+                previous_digest = digest
+                interval = shortest_interval
+            else:
+                interval = min(interval * self.backoff, longest_interval)
+            remaining = deadline - time.time()
+            if is_done(match) or remaining <= 0:
+                return match
+            time.sleep(min(interval, remaining))
+
+    def _get_max_scan_rate(self, matcher):
+        if self.max_scan_rate is not None:
+            return self.max_scan_rate
+        return matcher.scan_rate
@@ -0,0 +1,11 @@
+from ocrpool import OCRPool
+from scrollingtext import ScrollingText
+from textcache import TextCache
+from textindex import TextIndex
+
+__all__ = [
+    "OCRPool",
+    "ScrollingText",
+    "TextCache",
+    "TextIndex"
+]
@@ -0,0 +1,75 @@
+import sys
+import threading
+from Queue import Queue
+
+try:
+    from multiprocessing import cpu_count
+except ImportError:
+    # Jython has no multiprocessing, its threads run on all cores
+    from java.lang import Runtime
+    cpu_count = lambda: Runtime.getRuntime().availableProcessors()
+
+class OCRPool(object):
+    """Persistent worker threads reading the text of several captured frames in parallel.
+
+    The workers are started on the first batch and kept for the following ones, so recognizers
+    that load their language model on first use in a thread stay warm. ``workers`` is the
+    number of threads, 0 uses one per core and 1 reads the frames one after the other in the
+    calling thread.
+    """
+
+    def __init__(self, workers=0):
+        self._tasks = Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self.set_workers(workers)
+
+    # Public
+
+    def set_workers(self, workers):
+        workers = int(workers)
+        self.workers = workers if workers > 0 else cpu_count()
+
+    def read(self, recognize, frames, whitelist):
+        """Returns the text of each of ``frames`` read with ``recognize(frame, whitelist)``, in the
+        order of ``frames``. When ``recognize`` runs in parallel, reading a batch takes about as
+        long as its slowest frame."""
+        frames = list(frames)
+        if self.workers <= 1 or len(frames) <= 1:
+            return [recognize(frame, whitelist) for frame in frames]
+        self._start(min(self.workers, len(frames)))
+        results = Queue()
+        for index, frame in enumerate(frames):
+            self._tasks.put((recognize, frame, whitelist, index, results))
+        texts = [None] * len(frames)
+        error = None
+        for _ in frames:
+            (index, text, exc_info) = results.get()
+            if exc_info is not None and error is None:
+                error = exc_info
+            texts[index] = text
+        if error is not None:
+            raise error[0], error[1], error[2]
+        return texts
+
+    def size(self):
+        return len([thread for thread in self._threads if thread.isAlive()])
+
+    # Private
+
+    def _start(self, count):
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.isAlive()]
+            while len(self._threads) < count:
+                thread = threading.Thread(target=self._run, name='OCRWorker-%d' % (len(self._threads) + 1))
+                thread.setDaemon(True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self):
+        while True:
+            (recognize, frame, whitelist, index, results) = self._tasks.get()
+            try:
+                results.put((index, recognize(frame, whitelist), None))
+            except:
+                results.put((index, None, sys.exc_info()))
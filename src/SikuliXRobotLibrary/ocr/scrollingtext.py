@@ -0,0 +1,102 @@
+from SikuliXRobotLibrary import utils
+
+class ScrollingText(object):
+    """Text of a scrolling region, read again only where the scrolling exposed new pixels.
+
+    Every read captures ``region`` and compares the digests of its pixel rows with the previous
+    capture to find how far the content scrolled vertically. Only the newly exposed strip, grown
+    by ``overlap`` pixels so that lines cut at its edge are read whole, is passed to OCR and its
+    lines are stitched to ``lines``, the text read so far. The whole region is read again when the
+    content did not scroll but changed, or when ``region`` changed.
+    """
+
+    def __init__(self, overlap=20, min_votes=3):
+        self.overlap = int(overlap)
+        self.min_votes = int(min_votes)
+        self.lines = []
+        self.full_reads = 0
+        self.strip_reads = 0
+        self.unchanged = 0
+        self._region = None
+        self._rows = None
+
+    # Public
+
+    def read(self, matcher, region, recognize):
+        """Returns the text read so far after reading the new pixels of ``region`` with
+        ``recognize(x, y, w, h)``."""
+        region = tuple(int(value) for value in region)
+        with utils.latency.phase('capture'):
+            rows = matcher.row_digests(matcher.capture(matcher.region(*region)))
+        offset = None
+        if region == self._region:
+            offset = vertical_offset(self._rows, rows, self.min_votes)
+        (x, y, w, h) = region
+        if offset == 0 and rows == self._rows:
+            self.unchanged += 1
+        elif offset is None or offset == 0 or abs(offset) >= h:
+            self.full_reads += 1
+            self.lines = self._append(self.lines if region == self._region else [], self._split(recognize(*region)))
+        elif offset > 0:
+            # The content moved up, the new lines are at the bottom
+            strip = min(offset + self.overlap, h)
+            self.strip_reads += 1
+            self.lines = self._append(self.lines, self._split(recognize(x, y + h - strip, w, strip)))
+        else:
+            strip = min(-offset + self.overlap, h)
+            self.strip_reads += 1
+            self.lines = self._prepend(self.lines, self._split(recognize(x, y, w, strip)))
+        (self._region, self._rows) = (region, rows)
+        return "\n".join(self.lines)
+
+    def reset(self):
+        self.lines = []
+        self._region = None
+        self._rows = None
+
+    def stats(self):
+        return {'lines': len(self.lines),
+                'full_reads': self.full_reads,
+                'strip_reads': self.strip_reads,
+                'unchanged': self.unchanged}
+
+    # Private
+
+    def _split(self, text):
+        return [line for line in (text or "").splitlines() if line.strip()]
+
+    def _append(self, lines, new_lines):
+        """Appends the ``new_lines`` following the last line of ``lines`` within them"""
+        if lines and lines[-1] in new_lines:
+            last = len(new_lines) - 1 - new_lines[::-1].index(lines[-1])
+            return lines + new_lines[last + 1:]
+        return lines + new_lines
+
+    def _prepend(self, lines, new_lines):
+        """Prepends the ``new_lines`` preceding the first line of ``lines`` within them"""
+        if lines and lines[0] in new_lines:
+            return new_lines[:new_lines.index(lines[0])] + lines
+        return new_lines + lines
+
+def vertical_offset(previous, current, min_votes=3):
+    """Returns how many rows the content of ``current`` moved up compared to ``previous``, negative
+    when it moved down, or None when fewer than ``min_votes`` rows agree on an offset.
+
+    Every row of ``current`` whose digest is unique in ``previous`` votes for the offset between
+    the two rows, so the cost is linear in the number of rows. Repeated rows, such as background
+    between lines, do not vote.
+    """
+    if not previous or not current:
+        return None
+    positions = {}
+    for index, digest in enumerate(previous):
+        positions[digest] = None if digest in positions else index
+    votes = {}
+    for index, digest in enumerate(current):
+        position = positions.get(digest)
+        if position is not None:
+            votes[position - index] = votes.get(position - index, 0) + 1
+    if not votes:
+        return None
+    (offset, count) = max(votes.items(), key=lambda item: (item[1], -abs(item[0])))
+    return offset if count >= min_votes else None
@@ -0,0 +1,60 @@
+from SikuliXRobotLibrary import utils
+
+class TextCache(object):
+    """Remembers the text recognized in a region for as long as the region shows the same pixels.
+
+    Texts are keyed by the digest of the captured region and the OCR whitelist it was read with,
+    and are recognized from that same capture, so a text is never cached under the digest of
+    pixels it was not read from. Reading an unchanged region again only costs a capture. The
+    least recently read texts are evicted once ``capacity`` texts are cached. A ``capacity`` of
+    0 disables the cache.
+    """
+
+    def __init__(self, capacity=128):
+        self._texts = utils.LRUCache(capacity)
+
+    # Public
+
+    def read(self, matcher, regions, whitelist, recognize):
+        """Returns the text in each of ``regions``, calling ``recognize(frames)`` once with the
+        captured frames of the regions whose pixels or ``whitelist`` changed since they were last
+        read."""
+        regions = [tuple(region) for region in regions]
+        with utils.latency.phase('capture'):
+            frames = self._capture(matcher, regions)
+        if self._texts.capacity <= 0:
+            with utils.latency.phase('ocr'):
+                return recognize(frames)
+        keys = [(region, matcher.digest(frame), whitelist) for region, frame in zip(regions, frames)]
+        texts = [self._texts.get(key) for key in keys]
+        missing = [index for index, text in enumerate(texts) if text is None]
+        if missing:
+            with utils.latency.phase('ocr'):
+                recognized = recognize([frames[index] for index in missing])
+            for index, text in zip(missing, recognized):
+                texts[index] = text
+                self._texts.put(keys[index], text)
+        return texts
+
+    def set_capacity(self, capacity):
+        self._texts.set_capacity(capacity)
+
+    def clear(self):
+        self._texts.clear()
+
+    def stats(self):
+        stats = self._texts.stats()
+        return dict((name, stats[name]) for name in ('size', 'capacity', 'hits', 'misses', 'evictions', 'hit_rate'))
+
+    # Private
+
+    def _capture(self, matcher, regions):
+        """Returns a frame of each of ``regions`` cut from one capture of all ``regions``"""
+        if len(regions) == 1:
+            return [matcher.capture(matcher.region(*regions[0]))]
+        left = min(x for (x, y, w, h) in regions)
+        top = min(y for (x, y, w, h) in regions)
+        right = max(x + w for (x, y, w, h) in regions)
+        bottom = max(y + h for (x, y, w, h) in regions)
+        frame = matcher.capture(matcher.region(left, top, right - left, bottom - top))
+        return [matcher.crop(frame, region) for region in regions]
@@ -0,0 +1,100 @@
+import string
+import threading
+from difflib import SequenceMatcher
+from SikuliXRobotLibrary import utils
+from SikuliXRobotLibrary.matchers.matcher import FrameMatch
+from SikuliXRobotLibrary.matchers.matchset import cluster
+
+class TextIndex(object):
+    """Words and their positions in a frame, read with one OCR pass and reused by all text locators.
+
+    ``read_words(frame)`` returns the words recognized in a captured frame as ``(text, x, y, w, h)``
+    tuples. The words of a frame are grouped into lines and kept for the ``capacity`` frames read last,
+    keyed by the digest of the frame, so a text locator is searched without OCR as long as the
+    pixels of the search region are unchanged.
+
+    Text locators match a run of consecutive words of a line, ignoring case and the punctuation
+    around words, so that ``Password`` matches the label ``Password:``. With the ``fuzzy``
+    locator option, e.g. ``Sign in ; fuzzy = 0.8``, words also match when their similarity to
+    the locator is at least that ratio, which tolerates OCR mistakes.
+    """
+
+    def __init__(self, read_words, capacity=4):
+        self.read_words = read_words
+        self._lines = utils.LRUCache(capacity)
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.searches = 0
+
+    # Public
+
+    def match_all(self, matcher, frame, locator, xoffset=None, yoffset=None):
+        """Returns the matches of the text ``locator`` in ``frame``, best match first."""
+        lines = self.lines(matcher, frame)
+        self.searches += 1
+        target = [word for word in (normalize(word) for word in locator.target.split()) if word]
+        if not target:
+            return []
+        similarity = float(locator.options.get('fuzzy', 1.0))
+        matches = []
+        for words in lines:
+            for start in range(len(words) - len(target) + 1):
+                run = words[start:start + len(target)]
+                score = self._score(" ".join(normalize(word[0]) for word in run), " ".join(target), similarity)
+                if score is not None:
+                    matches.append(self._to_match(run, score, xoffset, yoffset))
+        return sorted(matches, key=lambda match: -match.getScore())
+
+    def lines(self, matcher, frame):
+        """Returns the words of ``frame`` grouped into lines from the top, each ordered from the left."""
+        key = matcher.digest(frame)
+        # Alternatives of a locator are matched concurrently, read each frame only once
+        with self._lock:
+            lines = self._lines.get(key)
+            if lines is None:
+                with utils.latency.phase('ocr'):
+                    words = [word for word in self.read_words(frame) if normalize(word[0])]
+                lines = self._group_lines(words)
+                self._lines.put(key, lines)
+                self.builds += 1
+        return lines
+
+    def clear(self):
+        self._lines.clear()
+
+    def stats(self):
+        return {'frames': len(self._lines),
+                'builds': self.builds,
+                'searches': self.searches,
+                'hit_rate': 1.0 - float(self.builds) / self.searches if self.searches else 0.0}
+
+    # Private
+
+    def _group_lines(self, words):
+        if not words:
+            return []
+        heights = sorted(h for (text, x, y, w, h) in words)
+        rows = cluster([y + h / 2.0 for (text, x, y, w, h) in words], heights[len(heights) // 2] / 2.0)
+        lines = [[] for _ in range(max(rows) + 1)]
+        for row, word in zip(rows, words):
+            lines[row].append(word)
+        return [sorted(line, key=lambda word: word[1]) for line in lines]
+
+    def _score(self, text, target, similarity):
+        if text == target:
+            return 1.0
+        if similarity >= 1.0:
+            return None
+        ratio = SequenceMatcher(None, text, target).ratio()
+        return ratio if ratio >= similarity else None
+
+    def _to_match(self, words, score, xoffset, yoffset):
+        left = min(word[1] for word in words)
+        top = min(word[2] for word in words)
+        right = max(word[1] + word[3] for word in words)
+        bottom = max(word[2] + word[4] for word in words)
+        return FrameMatch(left, top, right - left, bottom - top, score, int(xoffset or 0), int(yoffset or 0))
+
+def normalize(word):
+    """Returns ``word`` lowercased without the punctuation around it, e.g. ``password`` for ``Password:``."""
+    return word.strip().strip(string.punctuation).lower()
@@ -1,7 +1,13 @@
 import os
 from fnmatch import fnmatch
 from librarylistener import LibraryListener
+from lrucache import LRUCache
+from screenshotwriter import ScreenshotWriter
+from screenshotstore import ScreenshotStore
+from workerpool import WorkerPool
 import events
+import latency
+import deadline
 
 __all__ = [
     "get_child_packages_in",
@@ -9,7 +15,13 @@ __all__ = [
     "import_modules_under",
     "escape_xpath_value",
     "LibraryListener",
-    "events"
+    "LRUCache",
+    "ScreenshotWriter",
+    "ScreenshotStore",
+    "WorkerPool",
+    "events",
+    "latency",
+    "deadline"
 ]
 
 # Public
@@ -0,0 +1,61 @@
+import time
+
+__all__ = [
+    "Deadlines"
+]
+
+class Deadlines(object):
+    """Time budgets shared by all searches of the running test and of the running keyword.
+
+    ``test_budget`` and ``keyword_budget`` are seconds, None for no budget. A budget starts
+    with the test or with the outermost library keyword. Every search clamps its timeout to the
+    time left of the budgets, so a test cannot wait longer than its budget in total however
+    many searches it makes. When a budget is used up, searches look once and give up.
+    """
+
+    def __init__(self):
+        self.test_budget = None
+        self.keyword_budget = None
+        self.clamped = 0
+        self._test_end = None
+        self._keyword_end = None
+
+    # Public
+
+    def start_test(self):
+        self._test_end = self._end(self.test_budget)
+
+    def end_test(self):
+        self._test_end = None
+
+    def start_keyword(self):
+        self._keyword_end = self._end(self.keyword_budget)
+
+    def end_keyword(self):
+        self._keyword_end = None
+
+    def restart_test(self):
+        """Starts the test budget again from now, e.g. after it was changed during a test."""
+        self._test_end = self._end(self.test_budget)
+
+    def remaining(self):
+        """Returns the seconds left of the running budgets or None when no budget is running."""
+        ends = [end for end in (self._test_end, self._keyword_end) if end is not None]
+        if not ends:
+            return None
+        return max(min(ends) - time.time(), 0.0)
+
+    def clamp(self, timeout):
+        """Returns ``timeout`` in seconds limited to the time left of the running budgets."""
+        left = self.remaining()
+        if left is None or timeout <= left:
+            return timeout
+        self.clamped += 1
+        return left
+
+    # Private
+
+    def _end(self, budget):
+        if budget is None:
+            return None
+        return time.time() + budget
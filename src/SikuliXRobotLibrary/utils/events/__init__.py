@@ -1,24 +1,33 @@
 from scope_event import ScopeStart, ScopeEnd
+from listener_event import SuiteStart, SuiteEnd, TestStart, TestEnd
 
-_registered_events = [ ScopeStart, ScopeEnd ]
-_events = []
+_registered_events = [ ScopeStart, ScopeEnd, SuiteStart, SuiteEnd, TestStart, TestEnd ]
 
 __all__ = [
-    "on",
-    "dispatch",
+    "EventHandlers",
     "register_event"
 ]
 
-def on(event_name, *args, **kwargs):
-    for event in _registered_events:
-        if event.name == event_name:
-            _events.append(event(*args, **kwargs))
-            return
+class EventHandlers(object):
+    """Handlers of the events of one library instance, dispatched by the listener of that instance.
 
-def dispatch(event_name, *args, **kwargs):
-    for event in _events:
-        if event.name == event_name:
-            event.trigger(*args, **kwargs)
+    Keeping the handlers per instance means that every library instance registers its handlers
+    once and that the handlers of other instances are not run.
+    """
+
+    def __init__(self):
+        self._events = []
+
+    def on(self, event_name, *args, **kwargs):
+        for event in _registered_events:
+            if event.name == event_name:
+                self._events.append(event(*args, **kwargs))
+                return
+
+    def dispatch(self, event_name, *args, **kwargs):
+        for event in self._events:
+            if event.name == event_name:
+                event.trigger(*args, **kwargs)
 
 def register_event(event):
     for registered_event in _registered_events:
@@ -0,0 +1,24 @@
+from event import Event
+
+class ListenerEvent(Event):
+    """Runs ``action`` on every matching listener call with the name and attributes of the suite or test."""
+
+    def __init__(self, action, *args, **kwargs):
+        self.action = action
+        self.action_args = args
+        self.action_kwargs = kwargs
+
+    def trigger(self, *args, **kwargs):
+        self.action(*(self.action_args + args), **self.action_kwargs)
+
+class SuiteStart(ListenerEvent):
+    name = 'suite_start'
+
+class SuiteEnd(ListenerEvent):
+    name = 'suite_end'
+
+class TestStart(ListenerEvent):
+    name = 'test_start'
+
+class TestEnd(ListenerEvent):
+    name = 'test_end'
@@ -0,0 +1,176 @@
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+# Upper bounds of the histogram buckets in seconds
+BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0)
+PHASES = ('parse', 'capture', 'match', 'input', 'ocr', 'logging', 'other')
+
+__all__ = [
+    "Histogram",
+    "LatencyRecorder",
+    "phase",
+    "set_locator"
+]
+
+class Histogram(object):
+    """Distribution of durations in seconds over the fixed `BUCKETS`."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, seconds):
+        index = 0
+        while index < len(BUCKETS) and seconds > BUCKETS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, percent):
+        """Returns the upper bound of the bucket holding ``percent`` of the durations."""
+        if not self.count:
+            return 0.0
+        rank = percent / 100.0 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(BUCKETS[index], self.max) if index < len(BUCKETS) else self.max
+        return self.max
+
+    def to_dict(self):
+        bounds = ['<=%g' % (bound) for bound in BUCKETS] + ['>%g' % (BUCKETS[-1])]
+        return {'count': self.count,
+                'total': self.total,
+                'mean': self.total / self.count if self.count else 0.0,
+                'min': self.min or 0.0,
+                'max': self.max or 0.0,
+                'p50': self.percentile(50),
+                'p95': self.percentile(95),
+                'p99': self.percentile(99),
+                'buckets': dict((bound, count) for bound, count in zip(bounds, self.counts) if count)}
+
+class LatencyRecorder(object):
+    """Records the wall time of the outermost library keywords split into `PHASES`.
+
+    Code running in a phase is wrapped in `phase`; nested phases are subtracted from the phase
+    around them and the time spent outside of any phase is counted as ``other``. Phases running
+    in worker threads are added as well, so the phases of a keyword may sum up to more than its
+    wall time. The search time following `set_locator` is also recorded per locator.
+    Nothing is recorded until ``enabled`` is set.
+
+    Every library instance has its own recorder. While it records a keyword, the module level
+    `phase` and `set_locator` used by the matchers and readers record into it.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.report = None
+        self._keywords = {}
+        self._locators = {}
+        self._current = None
+        self._previous = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # Public
+
+    def start_keyword(self, name):
+        global _running
+        if not self.enabled:
+            return
+        self._current = {'name': name, 'start': time.time(), 'phases': {}, 'locator': None, 'locators': {}}
+        (self._previous, _running) = (_running, self)
+
+    def end_keyword(self):
+        global _running
+        current, self._current = self._current, None
+        if current is None:
+            return
+        if _running is self:
+            _running = self._previous
+        self._previous = None
+        elapsed = time.time() - current['start']
+        with self._lock:
+            histograms = self._keywords.setdefault(current['name'], {'total': Histogram(), 'phases': {}})
+            histograms['total'].add(elapsed)
+            phases = dict(current['phases'])
+            phases['other'] = max(elapsed - sum(phases.values()), 0.0)
+            for name, seconds in phases.items():
+                histograms['phases'].setdefault(name, Histogram()).add(seconds)
+            for locator, seconds in current['locators'].items():
+                self._locators.setdefault(locator, Histogram()).add(seconds)
+
+    @contextmanager
+    def phase(self, name):
+        current = self._current
+        if current is None:
+            yield
+            return
+        stack = self._get_stack()
+        # Time spent in nested phases is collected in the last item
+        stack.append(0.0)
+        start = time.time()
+        try:
+            yield
+        finally:
+            elapsed = time.time() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self._lock:
+                current['phases'][name] = current['phases'].get(name, 0.0) + elapsed - nested
+                locator = current['locator']
+                if name in ('capture', 'match') and locator is not None:
+                    current['locators'][locator] = current['locators'].get(locator, 0.0) + elapsed - nested
+
+    def set_locator(self, locator):
+        """Attributes the following search phases of the current keyword to ``locator``."""
+        if self._current is not None:
+            self._current['locator'] = locator
+
+    def summary(self):
+        with self._lock:
+            keywords = dict((name, {'total': histograms['total'].to_dict(),
+                                    'phases': dict((phase, histogram.to_dict())
+                                                   for phase, histogram in histograms['phases'].items())})
+                            for name, histograms in self._keywords.items())
+            locators = dict((locator, histogram.to_dict()) for locator, histogram in self._locators.items())
+        return {'keywords': keywords, 'locators': locators}
+
+    def reset(self):
+        with self._lock:
+            self._keywords = {}
+            self._locators = {}
+
+    def write_report(self):
+        """Writes the summary as JSON to ``report`` if it is set."""
+        if not self.enabled or self.report is None:
+            return
+        with open(self.report, 'w') as report_file:
+            json.dump(self.summary(), report_file, indent=2, sort_keys=True)
+
+    # Private
+
+    def _get_stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+# The recorder of the keyword running, one that never records while no keyword is recorded
+_running = LatencyRecorder()
+
+def phase(name):
+    return _running.phase(name)
+
+def set_locator(locator):
+    _running.set_locator(locator)
@@ -1,18 +1,33 @@
-import events as event
+from events import EventHandlers
+import latency
 from robot.api import logger
 
 class LibraryListener(object):
+    """Listener of one library instance, dispatching the suite and test events to its ``events``.
+
+    ``latency`` is the `LatencyRecorder` of the library instance, its report is written at the
+    end of every suite.
+    """
 
     ROBOT_LISTENER_API_VERSION = 2
 
+    def __init__(self):
+        self.events = EventHandlers()
+        self.latency = latency.LatencyRecorder()
+
     def start_suite(self, name, attrs):
-        event.dispatch( 'scope_start', attrs['longname'] )
+        self.events.dispatch( 'scope_start', attrs['longname'] )
+        self.events.dispatch( 'suite_start', attrs['longname'], attrs )
 
     def end_suite(self, name, attrs):
-        event.dispatch( 'scope_end', attrs['longname'] )
+        self.events.dispatch( 'scope_end', attrs['longname'] )
+        self.events.dispatch( 'suite_end', attrs['longname'], attrs )
+        self.latency.write_report()
 
     def start_test(self, name, attrs):
-        event.dispatch( 'scope_start', attrs['longname'] )
+        self.events.dispatch( 'scope_start', attrs['longname'] )
+        self.events.dispatch( 'test_start', attrs['longname'], attrs )
 
     def end_test(self, name, attrs):
-        event.dispatch( 'scope_end', attrs['longname'] )
+        self.events.dispatch( 'scope_end', attrs['longname'] )
+        self.events.dispatch( 'test_end', attrs['longname'], attrs )
@@ -0,0 +1,80 @@
+from collections import OrderedDict
+
+class LRUCache(object):
+    """Bounded mapping that evicts the least recently used entries once ``capacity`` is exceeded.
+
+    By default every entry counts as one unit of ``capacity``. When ``sizeof`` is given it is called
+    with each value and its result is counted instead, e.g. to bound a cache by bytes.
+    """
+
+    def __init__(self, capacity=256, sizeof=None):
+        self._items = OrderedDict()
+        self._sizeof = sizeof if sizeof is not None else (lambda value: 1)
+        self._weight = 0
+        self.capacity = int(capacity)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Public
+
+    def get(self, key, default=None):
+        if key in self._items:
+            value = self._items.pop(key)
+            self._items[key] = value
+            self.hits += 1
+            return value
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        self.pop(key)
+        self._items[key] = value
+        self._weight += self._sizeof(value)
+        self._evict()
+
+    def pop(self, key, default=None):
+        if key not in self._items:
+            return default
+        value = self._items.pop(key)
+        self._weight -= self._sizeof(value)
+        return value
+
+    def clear(self):
+        self._items.clear()
+        self._weight = 0
+
+    def set_capacity(self, capacity):
+        self.capacity = int(capacity)
+        self._evict()
+
+    def keys(self):
+        return self._items.keys()
+
+    def weight(self):
+        return self._weight
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        hit_rate = float(self.hits) / lookups if lookups else 0.0
+        return {'size': len(self._items),
+                'weight': self._weight,
+                'capacity': self.capacity,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': hit_rate}
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    # Private
+
+    def _evict(self):
+        while self._items and self._weight > max(self.capacity, 0):
+            key, value = self._items.popitem(last=False)
+            self._weight -= self._sizeof(value)
+            self.evictions += 1
@@ -0,0 +1,72 @@
+import os
+import hashlib
+
+class ScreenshotStore(object):
+    """Index of written screenshots by the SHA-1 digest of their content.
+
+    Screenshots identical to one that was already written are not written again; the
+    existing file is used instead. Sources are the paths of captured image files or arrays
+    of pixels captured to memory. Savings are counted per suite, suites being nested with
+    `start_suite` and `end_suite`.
+    """
+
+    def __init__(self):
+        self._paths = {}
+        self._suites = [self._new_suite_stats()]
+
+    # Public
+
+    def find(self, source):
+        """Returns ``(digest, path)`` where ``path`` is the already written identical screenshot or None."""
+        digest = self._digest(source)
+        path = self._paths.get(digest)
+        stats = self._suites[-1]
+        stats['captured'] += 1
+        if path is not None:
+            stats['duplicates'] += 1
+            stats['bytes_saved'] += self._size(source)
+        return (digest, path)
+
+    def add(self, digest, path):
+        self._paths[digest] = path
+
+    def forget(self, path):
+        """Drops ``path`` from the index, e.g. when its write was dropped."""
+        for digest in [digest for digest, indexed_path in self._paths.items() if indexed_path == path]:
+            del self._paths[digest]
+
+    def start_suite(self):
+        self._suites.append(self._new_suite_stats())
+
+    def end_suite(self):
+        """Returns the statistics of the ending suite, which are also added to its parent suite."""
+        stats = self._suites.pop() if len(self._suites) > 1 else self._suites[0]
+        if self._suites and self._suites[-1] is not stats:
+            for key in stats:
+                self._suites[-1][key] += stats[key]
+        return stats
+
+    def stats(self):
+        return dict(self._suites[-1])
+
+    # Private
+
+    def _new_suite_stats(self):
+        return {'captured': 0, 'duplicates': 0, 'bytes_saved': 0}
+
+    def _size(self, source):
+        if isinstance(source, basestring):
+            return os.path.getsize(source)
+        return source.nbytes
+
+    def _digest(self, source):
+        sha1 = hashlib.sha1()
+        if not isinstance(source, basestring):
+            # Pixels captured to memory, the shape tells apart images with the same bytes
+            sha1.update(repr(source.shape))
+            sha1.update(source.tobytes())
+            return sha1.hexdigest()
+        with open(source, 'rb') as image_file:
+            for chunk in iter(lambda: image_file.read(65536), b''):
+                sha1.update(chunk)
+        return sha1.hexdigest()
@@ -0,0 +1,128 @@
+import shutil
+import threading
+from Queue import Queue, Full, Empty
+from robot.api import logger
+
+class ScreenshotWriter(object):
+    """Copies captured screenshots to their destination on a background thread.
+
+    At most ``queue_size`` screenshots wait to be written. When the queue is full, ``overflow``
+    decides whether the caller waits (``block``) or the oldest waiting screenshot is dropped
+    (``drop_oldest``). A ``queue_size`` of 0 writes screenshots synchronously. ``on_drop`` is
+    called with the destination of every dropped screenshot and of every failed write.
+
+    Screenshots are copied unless an ``encode`` callable taking the source and destination
+    is given to `write`, e.g. to scale or convert them on the background thread or to write
+    pixels captured to memory.
+    """
+    OVERFLOW_MODES = ('block', 'drop_oldest')
+
+    def __init__(self, queue_size=32, overflow='block'):
+        self.written = 0
+        self.dropped = 0
+        self._errors = []
+        self._queue = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self.on_drop = None
+        self.configure(queue_size, overflow)
+
+    # Public
+
+    def configure(self, queue_size, overflow):
+        overflow = overflow.strip().lower()
+        if overflow not in self.OVERFLOW_MODES:
+            raise ValueError("Invalid screenshot overflow mode '%s', expected one of: %s."
+                             % (overflow, ", ".join(self.OVERFLOW_MODES)))
+        self._stop()
+        self.queue_size = int(queue_size)
+        self.overflow = overflow
+        self._queue = Queue(self.queue_size) if self.queue_size > 0 else None
+
+    def write(self, source, destination, encode=None):
+        if self._queue is None:
+            try:
+                self._copy(source, destination, encode)
+            except Exception:
+                self._notify_drop(destination)
+                raise
+            return
+        self._start()
+        if self.overflow == 'block':
+            self._queue.put((source, destination, encode))
+            return
+        while True:
+            try:
+                self._queue.put_nowait((source, destination, encode))
+                return
+            except Full:
+                self._drop_oldest()
+
+    def flush(self):
+        """Waits until all queued screenshots are written and logs the failed writes."""
+        if self._queue is not None:
+            self._queue.join()
+        with self._lock:
+            errors, self._errors = self._errors, []
+        for error in errors:
+            logger.warn("Unable to write screenshot: %s" % (error))
+
+    def stats(self):
+        return {'written': self.written,
+                'dropped': self.dropped,
+                'queued': self._queue.qsize() if self._queue is not None else 0}
+
+    # Private
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.isAlive():
+                self._thread = threading.Thread(target=self._run, args=(self._queue,), name='ScreenshotWriter')
+                self._thread.setDaemon(True)
+                self._thread.start()
+
+    def _stop(self):
+        if self._queue is None:
+            return
+        self.flush()
+        if self._thread is not None and self._thread.isAlive():
+            # Tells the writer thread to exit once the queue is drained
+            self._queue.put(None)
+            self._thread.join()
+        self._thread = None
+
+    def _run(self, queue):
+        while True:
+            job = queue.get()
+            if job is None:
+                queue.task_done()
+                return
+            (source, destination, encode) = job
+            try:
+                self._copy(source, destination, encode)
+            except Exception as err:
+                with self._lock:
+                    self._errors.append("%s: %s" % (destination, err))
+                self._notify_drop(destination)
+            finally:
+                queue.task_done()
+
+    def _drop_oldest(self):
+        try:
+            (source, destination, encode) = self._queue.get_nowait()
+        except Empty:
+            return
+        self._queue.task_done()
+        self.dropped += 1
+        self._notify_drop(destination)
+
+    def _notify_drop(self, destination):
+        if self.on_drop is not None:
+            self.on_drop(destination)
+
+    def _copy(self, source, destination, encode=None):
+        if encode is not None:
+            encode(source, destination)
+        else:
+            shutil.copy(source, destination)
+        self.written += 1
@@ -0,0 +1,65 @@
+import sys
+import threading
+from Queue import Queue
+
+class WorkerPool(object):
+    """Persistent worker threads applying a function to several items in parallel.
+
+    The workers are started on the first call needing them and kept for the following ones,
+    so that searches polled several times per second do not start threads on every scan.
+    A call made from one of the workers, e.g. matching the alternatives of a locator within a
+    batch of locators, runs in that worker so that it never waits for the busy workers.
+    """
+
+    def __init__(self, name='Worker'):
+        self.name = name
+        self._tasks = Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # Public
+
+    def map(self, function, items, workers):
+        """Returns ``function(item)`` for each of ``items`` in their order, computed by up to
+        ``workers`` threads. The first error raised by ``function`` is raised again."""
+        items = list(items)
+        if min(int(workers), len(items)) <= 1 or getattr(self._local, 'worker', False):
+            return [function(item) for item in items]
+        self._start(min(int(workers), len(items)))
+        results = Queue()
+        for index, item in enumerate(items):
+            self._tasks.put((function, item, index, results))
+        values = [None] * len(items)
+        error = None
+        for _ in items:
+            (index, value, exc_info) = results.get()
+            if exc_info is not None and error is None:
+                error = exc_info
+            values[index] = value
+        if error is not None:
+            raise error[0], error[1], error[2]
+        return values
+
+    def size(self):
+        return len([thread for thread in self._threads if thread.isAlive()])
+
+    # Private
+
+    def _start(self, count):
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.isAlive()]
+            while len(self._threads) < count:
+                thread = threading.Thread(target=self._run, name='%s-%d' % (self.name, len(self._threads) + 1))
+                thread.setDaemon(True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self):
+        self._local.worker = True
+        while True:
+            (function, item, index, results) = self._tasks.get()
+            try:
+                results.put((index, function(item), None))
+            except:
+                results.put((index, None, sys.exc_info()))
@@ -0,0 +1,44 @@
+import os
+import sys
+import shutil
+import tempfile
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+try:
+    import numpy
+    from PIL import Image
+except ImportError:
+    # Jython runs the tests that need neither
+    numpy = None
+
+def icon(seed, size=20):
+    """Returns a ``size`` x ``size`` RGB image of random pixels, distinct for each ``seed``."""
+    return numpy.random.RandomState(seed).randint(0, 256, (size, size, 3)).astype(numpy.uint8)
+
+def save_icon(directory, name, seed, size=20):
+    path = os.path.join(directory, name)
+    if not os.path.isdir(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    save_pixels(icon(seed, size), path)
+    return path
+
+def save_pixels(pixels, path):
+    Image.fromarray(pixels).save(path)
+
+def flat_frame(height, width, value):
+    return numpy.zeros((height, width, 3), dtype=numpy.uint8) + numpy.uint8(value)
+
+def noise_frame(height, width, seed):
+    return numpy.random.RandomState(seed).randint(0, 256, (height, width, 3)).astype(numpy.uint8)
+
+class TemporaryDirectory(object):
+
+    def __enter__(self):
+        self.path = tempfile.mkdtemp(prefix='sikulix-tests-')
+        return self.path
+
+    def __exit__(self, *exc_info):
+        shutil.rmtree(self.path, ignore_errors=True)
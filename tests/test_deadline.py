@@ -0,0 +1,66 @@
+import time
+import unittest
+
+import helpers
+from SikuliXRobotLibrary import SikuliXRobotLibrary
+from SikuliXRobotLibrary.utils.deadline import Deadlines
+
+class DeadlinesTest(unittest.TestCase):
+
+    def test_no_budget_does_not_clamp(self):
+        deadlines = Deadlines()
+        deadlines.start_test()
+        self.assertIsNone(deadlines.remaining())
+        self.assertEqual(deadlines.clamp(10), 10)
+        self.assertEqual(deadlines.clamped, 0)
+
+    def test_test_budget_clamps_timeouts(self):
+        deadlines = Deadlines()
+        deadlines.test_budget = 1.0
+        deadlines.start_test()
+        self.assertLessEqual(deadlines.clamp(10), 1.0)
+        self.assertEqual(deadlines.clamp(0.5), 0.5)
+        self.assertEqual(deadlines.clamped, 1)
+
+    def test_shortest_budget_wins(self):
+        deadlines = Deadlines()
+        (deadlines.test_budget, deadlines.keyword_budget) = (5.0, 0.2)
+        deadlines.start_test()
+        deadlines.start_keyword()
+        self.assertLessEqual(deadlines.remaining(), 0.2)
+        deadlines.end_keyword()
+        self.assertGreater(deadlines.remaining(), 0.2)
+
+    def test_used_up_budget_leaves_nothing(self):
+        deadlines = Deadlines()
+        deadlines.keyword_budget = 0.01
+        deadlines.start_keyword()
+        time.sleep(0.02)
+        self.assertEqual(deadlines.remaining(), 0.0)
+        self.assertEqual(deadlines.clamp(3), 0.0)
+
+    def test_ending_the_test_stops_its_budget(self):
+        deadlines = Deadlines()
+        deadlines.test_budget = 1.0
+        deadlines.start_test()
+        deadlines.end_test()
+        self.assertIsNone(deadlines.remaining())
+
+class LibraryDeadlinesTest(unittest.TestCase):
+
+    def test_libraries_have_their_own_budgets(self):
+        limited = SikuliXRobotLibrary(backend='fake', screenshot_queue_size=0, test_search_budget='1 second')
+        unlimited = SikuliXRobotLibrary(backend='fake', screenshot_queue_size=0)
+        limited._start_test_deadline('Suite.Test', {})
+        unlimited._start_test_deadline('Suite.Test', {})
+        self.assertLessEqual(limited.get_remaining_search_time(), 1.0)
+        self.assertIsNone(unlimited.get_remaining_search_time())
+
+    def test_matcher_timeouts_are_clamped_to_the_budget(self):
+        library = SikuliXRobotLibrary(backend='fake', screenshot_queue_size=0)
+        library.set_search_time_budget('1 second')
+        self.assertLessEqual(library._matcher.resolve_timeout(10), 1.0)
+        self.assertEqual(SikuliXRobotLibrary(backend='fake', screenshot_queue_size=0)._matcher.resolve_timeout(10), 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import unittest
+
+import helpers
+from SikuliXRobotLibrary import SikuliXRobotLibrary
+from SikuliXRobotLibrary.backends import FakeBackend
+from SikuliXRobotLibrary.matchers.numpymatcher import NumpyMatcher
+
+class ImageResolutionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = helpers.TemporaryDirectory()
+        self.path = self.directory.__enter__()
+        self.image = helpers.save_icon(self.path, os.path.join('Win7', 'Calc.png'), 1)
+        self.matcher = NumpyMatcher()
+
+    def tearDown(self):
+        self.directory.__exit__(None, None, None)
+
+    def test_relative_name_in_image_directory(self):
+        self.matcher.add_image_directory(self.path)
+        self.assertEqual(self.matcher._resolve(os.path.join('Win7', 'Calc.png')), self.image)
+
+    def test_lowercased_relative_name(self):
+        self.matcher.add_image_directory(self.path)
+        self.assertEqual(self.matcher._resolve(os.path.join('win7', 'calc.png')), self.image)
+
+    def test_lowercased_absolute_name(self):
+        self.assertEqual(self.matcher._resolve(self.image.lower()), self.image)
+
+    def test_missing_image(self):
+        self.matcher.add_image_directory(self.path)
+        self.assertRaises(IOError, self.matcher._resolve, 'missing.png')
+
+class FakeBackendKeywordsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = helpers.TemporaryDirectory()
+        self.path = self.directory.__enter__()
+        helpers.save_icon(self.path, 'Button.png', 1)
+        self.library = SikuliXRobotLibrary(backend='fake', screenshot_queue_size=0)
+        self.backend = self.library.get_backend()
+        self.backend.add_image_path(self.path)
+        self.backend.draw(helpers.icon(1), 100, 50)
+
+    def tearDown(self):
+        self.directory.__exit__(None, None, None)
+
+    def test_click_pattern_clicks_its_center(self):
+        self.library.click_pattern('Button.png')
+        self.assertIn(('click', 110, 60), self.backend.events)
+
+    def test_nth_pattern_counts_every_match(self):
+        self.backend.draw(helpers.icon(1), 300, 50)
+        self.assertEqual(self.library.get_pattern_count('Button.png'), 2)
+        self.library.click_nth_pattern('Button.png', 2)
+        self.assertIn(('click', 310, 60), self.backend.events)
+
+    def test_click_last_match_after_wait(self):
+        self.library.wait_until_pattern_is_visible('Button.png', '1')
+        self.library.click_last_match()
+        self.assertIn(('click', 110, 60), self.backend.events)
+
+    def test_missing_pattern_fails(self):
+        self.backend.draw(helpers.icon(2), 100, 50)
+        self.assertRaises(AssertionError, self.library.assert_pattern_is_visible_in_region, 'Button.png')
+
+    def test_alternatives_are_separated_by_a_double_pipe(self):
+        helpers.save_icon(self.path, 'Other.png', 2)
+        self.library.click_pattern('Other.png || Button.png')
+        self.assertIn(('click', 110, 60), self.backend.events)
+
+    def test_single_pipe_belongs_to_a_text_locator(self):
+        self.backend.add_text("File | Save", 200, 150, 110, 12)
+        self.library.click_pattern('File | Save')
+        self.assertIn(('click', 255, 156), self.backend.events)
+
+    def test_text_locator(self):
+        self.backend.add_text("Sign in", 200, 150, 70, 12)
+        self.library.click_pattern('Sign in')
+        self.assertIn(('click', 235, 156), self.backend.events)
+
+class PyramidSearchTest(unittest.TestCase):
+
+    def test_frame_based_matcher_uses_the_setting(self):
+        library = SikuliXRobotLibrary(backend='fake', pyramid_search='auto', screenshot_queue_size=0)
+        self.assertEqual(library.get_backend().matcher.pyramid, 'auto')
+
+    def test_matcher_without_pyramid_search_warns(self):
+        backend = FakeBackend()
+        backend.matcher.supports_pyramid = False
+        warnings = []
+        SikuliXRobotLibrary._warn = lambda library, message: warnings.append(message)
+        try:
+            library = SikuliXRobotLibrary(backend=backend, pyramid_search='auto', screenshot_queue_size=0)
+        finally:
+            del SikuliXRobotLibrary._warn
+        self.assertEqual(backend.matcher.pyramid, 0)
+        self.assertEqual(len(warnings), 1)
+
+if __name__ == '__main__':
+    unittest.main()
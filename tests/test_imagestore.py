@@ -0,0 +1,58 @@
+import os
+import unittest
+
+import helpers
+from SikuliXRobotLibrary.locators.imagestore import ImageStore
+from SikuliXRobotLibrary.matchers import numpymatcher
+
+class PreloadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = helpers.TemporaryDirectory()
+        self.path = self.directory.__enter__()
+        helpers.save_icon(self.path, 'OK.PNG', 1)
+        helpers.save_icon(self.path, os.path.join('Win7', 'cancel.png'), 2)
+
+    def tearDown(self):
+        self.directory.__exit__(None, None, None)
+
+    def test_pattern_matches_ignoring_case(self):
+        self.assertEqual(ImageStore().preload(self.path, '*.PNG'), 2)
+        self.assertEqual(ImageStore().preload(self.path, '*.png'), 2)
+
+    def test_pattern_selects_images(self):
+        self.assertEqual(ImageStore().preload(self.path, 'ok*'), 1)
+
+@unittest.skipIf(numpymatcher.numpy is None, "requires numpy")
+class NeedleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = helpers.TemporaryDirectory()
+        self.path = self.directory.__enter__()
+        helpers.save_icon(self.path, 'ok.png', 1)
+        self.matcher = numpymatcher.NumpyMatcher()
+        self.matcher.add_image_directory(self.path)
+
+    def tearDown(self):
+        self.directory.__exit__(None, None, None)
+
+    def test_needles_are_loaded_through_the_image_store(self):
+        self.matcher.image_store.preload(self.path)
+        needle = self.matcher.load_needle('ok.png')
+        self.assertIs(self.matcher.load_needle('ok.png'), needle)
+        self.assertEqual(self.matcher.image_store.stats()['misses'], 0)
+
+    def test_changed_image_is_loaded_again(self):
+        needle = self.matcher.load_needle('ok.png')
+        helpers.save_icon(self.path, 'ok.png', 2)
+        path = os.path.join(self.path, 'ok.png')
+        os.utime(path, (os.path.getatime(path), os.path.getmtime(path) + 10))
+        self.assertFalse((self.matcher.load_needle('ok.png') == needle).all())
+
+    def test_needles_follow_the_image_store_budget(self):
+        self.matcher.image_store.set_budget(0)
+        self.matcher.load_needle('ok.png')
+        self.assertEqual(len(self.matcher._needles), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+import helpers
+from SikuliXRobotLibrary.utils import latency
+from SikuliXRobotLibrary.utils.latency import LatencyRecorder
+
+class LatencyRecorderTest(unittest.TestCase):
+
+    def test_phases_are_recorded_by_the_running_recorder(self):
+        (recording, idle) = (LatencyRecorder(), LatencyRecorder())
+        recording.enabled = idle.enabled = True
+        recording.start_keyword('click_pattern')
+        with latency.phase('match'):
+            pass
+        recording.end_keyword()
+        self.assertEqual(sorted(recording.summary()['keywords']['click_pattern']['phases']), ['match', 'other'])
+        self.assertEqual(idle.summary()['keywords'], {})
+
+    def test_disabled_recorder_records_nothing(self):
+        recorder = LatencyRecorder()
+        recorder.start_keyword('click_pattern')
+        with latency.phase('match'):
+            pass
+        recorder.end_keyword()
+        self.assertEqual(recorder.summary(), {'keywords': {}, 'locators': {}})
+
+    def test_nested_recorders_restore_the_outer_one(self):
+        (outer, inner) = (LatencyRecorder(), LatencyRecorder())
+        outer.enabled = inner.enabled = True
+        outer.start_keyword('outer')
+        inner.start_keyword('inner')
+        inner.end_keyword()
+        latency.set_locator('button.png')
+        with latency.phase('capture'):
+            pass
+        outer.end_keyword()
+        self.assertIn('button.png', outer.summary()['locators'])
+        self.assertEqual(inner.summary()['locators'], {})
+
+    def test_phases_outside_keywords_are_not_recorded(self):
+        with latency.phase('match'):
+            latency.set_locator('button.png')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import time
+import unittest
+
+import helpers
+from SikuliXRobotLibrary import SikuliXRobotLibrary
+from SikuliXRobotLibrary.matchers import LocationHints
+
+class StubLocator(object):
+
+    def __init__(self, locator):
+        self.locator = locator
+
+class StubMatch(object):
+
+    def __init__(self, x, y, w=20, h=20):
+        (self.x, self.y, self.w, self.h) = (x, y, w, h)
+
+    def getX(self):
+        return self.x
+
+    def getY(self):
+        return self.y
+
+    def getW(self):
+        return self.w
+
+    def getH(self):
+        return self.h
+
+class StubMatcher(object):
+    """Matcher whose searches take ``cost`` seconds per pixel row of the searched region."""
+
+    def __init__(self, position, cost=0.0001):
+        self.position = position
+        self.cost = cost
+        self.last_match = None
+
+    def get_roi(self):
+        return None
+
+    def region(self, x, y, w, h):
+        return (x, y, w, h)
+
+    def exists(self, locator, timeout=None, region=None, xoffset=None, yoffset=None):
+        (x, y, w, h) = region or (0, 0, 1920, 1080)
+        time.sleep(h * self.cost)
+        match = None
+        if self.position is not None and x <= self.position[0] < x + w and y <= self.position[1] < y + h:
+            match = StubMatch(*self.position)
+            self.last_match = match
+        return match
+
+    def find(self, locator, timeout=None, xoffset=None, yoffset=None):
+        match = self.exists(locator)
+        if match is None:
+            raise AssertionError("Not found")
+        return match
+
+class LocationHintsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.hints = LocationHints()
+        self.locator = StubLocator('button.png')
+
+    def test_hit_records_the_last_match(self):
+        matcher = StubMatcher((100, 50))
+        self.hints.find(matcher, self.locator)
+        matcher.last_match = None
+        match = self.hints.find(matcher, self.locator)
+        self.assertIs(matcher.last_match, match)
+        self.assertEqual(self.hints.stats()['hits'], 1)
+
+    def test_hits_save_time(self):
+        matcher = StubMatcher((100, 50))
+        for index in range(3):
+            self.hints.find(matcher, self.locator)
+        self.assertGreater(self.hints.stats()['time_saved'], 0)
+
+    def test_misses_cost_time(self):
+        matcher = StubMatcher((100, 50), cost=0.001)
+        self.hints.find(matcher, self.locator)
+        matcher.position = (100, 700)
+        self.hints.find(matcher, self.locator)
+        stats = self.hints.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (0, 1))
+        self.assertLess(stats['time_saved'], 0)
+
+class MatchContextTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = helpers.TemporaryDirectory()
+        self.path = self.directory.__enter__()
+        helpers.save_icon(self.path, 'button.png', 1)
+        self.library = SikuliXRobotLibrary(backend='fake', screenshot_queue_size=0)
+        self.library.screenshot_context_padding = 10
+        self.backend = self.library.get_backend()
+        self.backend.add_image_path(self.path)
+
+    def tearDown(self):
+        self.directory.__exit__(None, None, None)
+
+    def test_context_is_the_search_region_before_any_match(self):
+        self.assertRaises(AssertionError, self.library.click_pattern, 'button.png')
+        self.assertEqual(self.library._get_match_context_coordinates(), (0, 0, 1920, 1080))
+
+    def test_failed_find_keeps_the_last_match(self):
+        self.backend.draw(helpers.icon(1), 100, 50)
+        self.library.click_pattern('button.png')
+        self.backend.draw(helpers.icon(2), 100, 50)
+        self.assertRaises(AssertionError, self.library.click_pattern, 'button.png')
+        self.assertEqual(self.library._get_match_context_coordinates(), (90, 40, 40, 40))
+
+    def test_hint_of_a_failed_find_is_tried_again(self):
+        self.backend.draw(helpers.icon(1), 100, 50)
+        self.library.click_pattern('button.png')
+        self.backend.draw(helpers.icon(2), 100, 50)
+        self.assertRaises(AssertionError, self.library.click_pattern, 'button.png')
+        self.backend.draw(helpers.icon(1), 100, 50)
+        self.library.click_pattern('button.png')
+        self.assertEqual(self.library._location_hints.stats()['hits'], 1)
+
+    def test_assertions_record_their_match(self):
+        self.backend.draw(helpers.icon(1), 300, 200)
+        self.library.assert_pattern_is_visible_in_region('button.png')
+        self.backend.draw(helpers.icon(2), 300, 200)
+        self.assertRaises(AssertionError, self.library.assert_pattern_is_visible_in_region, 'button.png')
+        self.assertEqual(self.library._get_match_context_coordinates(), (290, 190, 40, 40))
+
+    def test_patterns_asserted_together_record_their_matches(self):
+        self.backend.draw(helpers.icon(1), 300, 200)
+        self.library.assert_patterns_are_visible('button.png')
+        self.assertEqual(self.library._get_match_context_coordinates(), (290, 190, 40, 40))
+
+if __name__ == '__main__':
+    unittest.main()
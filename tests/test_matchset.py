@@ -0,0 +1,87 @@
+import unittest
+
+import helpers
+from SikuliXRobotLibrary import SikuliXRobotLibrary
+from SikuliXRobotLibrary.matchers.matcher import FrameMatch
+from SikuliXRobotLibrary.matchers.matchset import MatchSet, cluster
+
+def grid(rows, columns, jitter=0):
+    return [FrameMatch(column * 50 + (row * jitter) % 5, row * 40 + (column * jitter) % 5, 20, 20, 1.0)
+            for row in range(rows) for column in range(columns)]
+
+class ClusterTest(unittest.TestCase):
+
+    def test_values_within_tolerance_share_a_cluster(self):
+        self.assertEqual(cluster([10, 0, 12, 3, 30], 5), [1, 0, 1, 0, 2])
+
+    def test_tolerance_is_measured_from_the_first_value_of_a_cluster(self):
+        self.assertEqual(cluster([0, 4, 8, 12], 5), [0, 0, 1, 1])
+
+    def test_no_values(self):
+        self.assertEqual(cluster([], 5), [])
+
+class MatchSetTest(unittest.TestCase):
+
+    def test_matches_are_ordered_by_x_then_y(self):
+        matches = MatchSet(grid(2, 2)).matches
+        self.assertEqual([(match.getX(), match.getY()) for match in matches], [(0, 0), (0, 40), (50, 0), (50, 40)])
+
+    def test_row_major_order_ignores_jitter_within_a_row(self):
+        ordered = MatchSet(grid(2, 3, jitter=3)).row_major()
+        self.assertEqual([match.getY() // 40 for match in ordered], [0, 0, 0, 1, 1, 1])
+        self.assertEqual([match.getX() // 50 for match in ordered], [0, 1, 2, 0, 1, 2])
+
+    def test_column_major_order(self):
+        ordered = MatchSet(grid(2, 2)).ordered('column_major')
+        self.assertEqual([(match.getX(), match.getY()) for match in ordered], [(0, 0), (0, 40), (50, 0), (50, 40)])
+
+    def test_invalid_order(self):
+        self.assertRaises(ValueError, MatchSet(grid(1, 1)).ordered, 'diagonal')
+
+    def test_shape_and_cells(self):
+        match_set = MatchSet(grid(3, 4, jitter=2))
+        self.assertEqual(match_set.shape(), (3, 4))
+        self.assertEqual(match_set.at(2, 1).getX() // 50, 1)
+        self.assertEqual(match_set.at(2, 1).getY() // 40, 2)
+        self.assertIsNone(match_set.at(3, 0))
+
+    def test_nearest(self):
+        match_set = MatchSet(grid(3, 3))
+        nearest = match_set.nearest(108, 85)
+        self.assertEqual((nearest.getX(), nearest.getY()), (100, 80))
+        self.assertIsNone(MatchSet([]).nearest(0, 0))
+
+    def test_within(self):
+        within = MatchSet(grid(3, 3)).within(40, 30, 90, 60)
+        self.assertEqual([(match.getX(), match.getY()) for match in within], [(50, 40), (100, 40)])
+
+@unittest.skipIf(helpers.numpy is None, "requires numpy")
+class FindAllTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = helpers.TemporaryDirectory()
+        self.path = self.directory.__enter__()
+        helpers.save_icon(self.path, 'cell.png', 1)
+        self.library = SikuliXRobotLibrary(backend='fake', screenshot_queue_size=0)
+        self.backend = self.library.get_backend()
+        self.backend.add_image_path(self.path)
+        # 150 cells, more than a match limit would allow
+        for index in range(150):
+            self.backend.draw(helpers.icon(1), 40 + index % 15 * 30, 40 + index // 15 * 30)
+
+    def tearDown(self):
+        self.directory.__exit__(None, None, None)
+
+    def test_all_matches_are_found(self):
+        self.assertEqual(self.library.get_pattern_count('cell.png'), 150)
+
+    def test_all_matches_are_found_with_pyramid_search(self):
+        self.library._set_pyramid_search('auto')
+        self.assertEqual(self.library.get_pattern_count('cell.png'), 150)
+
+    def test_max_matches_keeps_the_best_matches(self):
+        self.library._matcher.max_matches = 100
+        self.assertEqual(self.library.get_pattern_count('cell.png'), 100)
+
+if __name__ == '__main__':
+    unittest.main()
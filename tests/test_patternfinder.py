@@ -0,0 +1,27 @@
+import unittest
+
+import helpers
+from SikuliXRobotLibrary.locators import PatternFinder, AlternativeLocator
+
+class CompileTest(unittest.TestCase):
+
+    def test_image_locator(self):
+        locator = PatternFinder().compile('OK.png = 0.90 ; pyramid = 2')
+        self.assertEqual((locator.target, locator.similarity, locator.options), ('ok.png', 0.9, {'pyramid': '2'}))
+
+    def test_text_locator(self):
+        locator = PatternFinder().compile('Sign in')
+        self.assertFalse(locator.is_image())
+
+    def test_compiled_locators_are_cached(self):
+        finder = PatternFinder()
+        self.assertIs(finder.compile('ok.png'), finder.compile('ok.png'))
+        self.assertEqual(finder.get_locator_cache_statistics()['hits'], 1)
+
+    def test_alternatives(self):
+        locator = PatternFinder().compile('ok.png || Sign in')
+        self.assertIsInstance(locator, AlternativeLocator)
+        self.assertEqual([alternative.target for alternative in locator.alternatives], ['ok.png', 'sign in'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import unittest
+
+import helpers
+from SikuliXRobotLibrary.locators.compiledlocator import CompiledLocator
+from SikuliXRobotLibrary.matchers import numpymatcher
+
+CALC = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                    'demo', 'calc_test_suite', 'calc_image_library', 'Win7', 'calc.png')
+
+@unittest.skipIf(numpymatcher.numpy is None, "Pyramid search requires the numpy package.")
+class PyramidSearchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = helpers.TemporaryDirectory()
+        self.path = self.directory.__enter__()
+
+    def tearDown(self):
+        self.directory.__exit__(None, None, None)
+
+    def _matches(self, frame, needle, pyramid):
+        path = os.path.join(self.path, 'needle.png')
+        helpers.save_pixels(needle, path)
+        matcher = numpymatcher.NumpyMatcher(lambda: frame, pyramid=pyramid)
+        matcher.set_roi(0, 0, frame.shape[1], frame.shape[0])
+        matches = matcher.match_all(matcher.capture(), CompiledLocator(path, path, 0.9))
+        return sorted((match.getX(), match.getY()) for match in matches)
+
+    def _assert_same_as_full_resolution(self, frame, needle, positions):
+        self.assertEqual(self._matches(frame, needle, 0), sorted(positions))
+        for pyramid in ('auto', 1, 2, 3):
+            self.assertEqual(self._matches(frame, needle, pyramid), sorted(positions), "pyramid=%s" % (pyramid,))
+
+    def test_crop_of_a_screenshot_at_unaligned_offsets(self):
+        needle = numpymatcher.read_image(CALC)[10:70, 10:90, :3].copy()
+        frame = helpers.flat_frame(1080, 1920, 200)
+        for (x, y) in ((3, 7), (901, 517), (1415, 1003)):
+            frame[y:y + 60, x:x + 80] = needle
+        self._assert_same_as_full_resolution(frame, needle, [(3, 7), (901, 517), (1415, 1003)])
+
+    def test_textured_icon_at_unaligned_offset(self):
+        needle = helpers.icon(3, 64)
+        frame = helpers.flat_frame(1080, 1920, 200)
+        frame[901:965, 1503:1567] = needle
+        self._assert_same_as_full_resolution(frame, needle, [(1503, 901)])
+
+    def test_icon_on_a_noisy_screen(self):
+        needle = helpers.icon(4, 32)
+        frame = helpers.noise_frame(600, 800, 5)
+        for (x, y) in ((13, 5), (301, 299), (765, 561)):
+            frame[y:y + 32, x:x + 32] = needle
+        self._assert_same_as_full_resolution(frame, needle, [(13, 5), (301, 299), (765, 561)])
+
+if __name__ == '__main__':
+    unittest.main()
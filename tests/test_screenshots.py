@@ -0,0 +1,81 @@
+import os
+import unittest
+
+import helpers
+from SikuliXRobotLibrary import SikuliXRobotLibrary
+from SikuliXRobotLibrary.utils import ScreenshotStore
+
+class ScreenshotStoreTest(unittest.TestCase):
+
+    def test_identical_pixels_are_found(self):
+        store = ScreenshotStore()
+        (digest, path) = store.find(helpers.icon(1))
+        self.assertIsNone(path)
+        store.add(digest, 'first.png')
+        self.assertEqual(store.find(helpers.icon(1)), (digest, 'first.png'))
+        self.assertIsNone(store.find(helpers.icon(2))[1])
+        self.assertEqual(store.stats(), {'captured': 3, 'duplicates': 1, 'bytes_saved': helpers.icon(1).nbytes})
+
+    def test_shape_tells_apart_images_with_the_same_bytes(self):
+        store = ScreenshotStore()
+        pixels = helpers.icon(1)
+        store.add(store.find(pixels)[0], 'square.png')
+        self.assertIsNone(store.find(pixels.reshape(10, 40, 3))[1])
+
+    def test_forgotten_paths_are_no_longer_found(self):
+        store = ScreenshotStore()
+        (digest, path) = store.find(helpers.icon(1))
+        store.add(digest, 'first.png')
+        store.forget('first.png')
+        self.assertIsNone(store.find(helpers.icon(1))[1])
+
+    def test_suite_statistics_are_added_to_the_parent_suite(self):
+        store = ScreenshotStore()
+        store.add(store.find(helpers.icon(1))[0], 'first.png')
+        store.start_suite()
+        store.find(helpers.icon(1))
+        self.assertEqual(store.end_suite()['duplicates'], 1)
+        self.assertEqual(store.stats()['captured'], 2)
+        self.assertEqual(store.stats()['duplicates'], 1)
+
+class ScreenshotDeduplicationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = helpers.TemporaryDirectory()
+        self.path = self.directory.__enter__()
+        self.library = SikuliXRobotLibrary(backend='fake', screenshot_queue_size=0, screenshot_dedup=True)
+        self.library.screenshot_root_directory = self.path
+        self.library._get_log_dir = lambda: self.path
+        self.library._html = lambda message: None
+        self.backend = self.library.get_backend()
+        self.backend.draw(helpers.icon(1), 0, 0)
+
+    def tearDown(self):
+        self.directory.__exit__(None, None, None)
+
+    def _capture(self, filename='shot-{index}.png'):
+        self.library.capture_screenshot('screen0', filename)
+        self.library.flush_screenshots()
+
+    def test_identical_screenshots_are_written_once(self):
+        self._capture()
+        self._capture()
+        self.assertEqual(sorted(os.listdir(self.path)), ['shot-1.png'])
+        self.assertEqual(self.library.get_screenshot_deduplication_statistics()['duplicates'], 1)
+
+    def test_changed_screen_is_written_again(self):
+        self._capture()
+        self.backend.draw(helpers.icon(2), 0, 0)
+        self._capture()
+        self.assertEqual(sorted(os.listdir(self.path)), ['shot-1.png', 'shot-2.png'])
+
+    def test_overwritten_file_is_not_linked_for_its_previous_content(self):
+        self._capture('fixed.png')
+        self.backend.draw(helpers.icon(2), 0, 0)
+        self._capture('fixed.png')
+        self.backend.draw(helpers.icon(1), 0, 0)
+        self._capture('other.png')
+        self.assertEqual(sorted(os.listdir(self.path)), ['fixed.png', 'other.png'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+import helpers
+from SikuliXRobotLibrary.ocr.scrollingtext import vertical_offset
+
+class VerticalOffsetTest(unittest.TestCase):
+
+    def test_content_moved_up(self):
+        previous = ['a', 'b', 'c', 'd', 'e', 'f']
+        current = ['c', 'd', 'e', 'f', 'g', 'h']
+        self.assertEqual(vertical_offset(previous, current), 2)
+
+    def test_content_moved_down(self):
+        previous = ['c', 'd', 'e', 'f', 'g', 'h']
+        current = ['a', 'b', 'c', 'd', 'e', 'f']
+        self.assertEqual(vertical_offset(previous, current), -2)
+
+    def test_unchanged_content(self):
+        rows = ['a', 'b', 'c', 'd']
+        self.assertEqual(vertical_offset(rows, list(rows)), 0)
+
+    def test_repeated_rows_do_not_vote(self):
+        previous = ['x', 'x', 'x', 'a', 'x', 'x']
+        current = ['x', 'a', 'x', 'x', 'x', 'x']
+        self.assertIsNone(vertical_offset(previous, current))
+
+    def test_too_few_votes(self):
+        self.assertIsNone(vertical_offset(['a', 'b', 'c'], ['b', 'c', 'z'], min_votes=3))
+        self.assertEqual(vertical_offset(['a', 'b', 'c'], ['b', 'c', 'z'], min_votes=2), 1)
+
+    def test_empty_frames(self):
+        self.assertIsNone(vertical_offset([], ['a']))
+        self.assertIsNone(vertical_offset(['a'], []))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+import helpers
+from SikuliXRobotLibrary.backends import FakeBackend
+from SikuliXRobotLibrary.locators.compiledlocator import CompiledLocator
+from SikuliXRobotLibrary.ocr.textindex import TextIndex, normalize
+
+def text_locator(text, **options):
+    return CompiledLocator(text, text, None, options=options)
+
+class TextIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = FakeBackend(width=400, height=200)
+        self.backend.add_text("User name:", 10, 10, 100, 12)
+        self.backend.add_text("Password:", 10, 40, 90, 12)
+        self.backend.add_text("Sign in", 200, 41, 70, 12)
+        self.reads = []
+        self.index = TextIndex(self._read_words)
+        self.matcher = self.backend.matcher
+        self.frame = self.matcher.capture()
+
+    def _read_words(self, frame):
+        self.reads.append(frame)
+        return self.backend.read_words(frame)
+
+    def test_words_are_grouped_into_lines(self):
+        lines = self.index.lines(self.matcher, self.frame)
+        self.assertEqual([[word[0] for word in line] for line in lines],
+                         [['User', 'name:'], ['Password:', 'Sign', 'in']])
+
+    def test_locator_ignores_case_and_punctuation(self):
+        matches = self.index.match_all(self.matcher, self.frame, text_locator('password'))
+        self.assertEqual(len(matches), 1)
+        self.assertEqual((matches[0].getX(), matches[0].getY()), (10, 40))
+
+    def test_locator_matches_a_run_of_words(self):
+        matches = self.index.match_all(self.matcher, self.frame, text_locator('sign in'))
+        self.assertEqual(len(matches), 1)
+        self.assertEqual((matches[0].getX(), matches[0].getW()), (200, 70))
+
+    def test_fuzzy_locator_tolerates_ocr_mistakes(self):
+        self.assertEqual(self.index.match_all(self.matcher, self.frame, text_locator('sign ln')), [])
+        matches = self.index.match_all(self.matcher, self.frame, text_locator('sign ln', fuzzy=0.8))
+        self.assertEqual(len(matches), 1)
+        self.assertLess(matches[0].getScore(), 1.0)
+
+    def test_unchanged_frame_is_read_once(self):
+        for text in ('password', 'sign in', 'user name'):
+            self.index.match_all(self.matcher, self.matcher.capture(), text_locator(text))
+        self.assertEqual(len(self.reads), 1)
+        self.assertEqual(self.index.stats()['builds'], 1)
+        self.assertEqual(self.index.stats()['searches'], 3)
+
+    def test_changed_frame_is_read_again(self):
+        self.index.match_all(self.matcher, self.frame, text_locator('password'))
+        self.backend.draw(helpers.icon(1), 300, 100)
+        self.index.match_all(self.matcher, self.matcher.capture(), text_locator('password'))
+        self.assertEqual(len(self.reads), 2)
+
+    def test_punctuation_only_locator_matches_nothing(self):
+        self.assertEqual(self.index.match_all(self.matcher, self.frame, text_locator(':')), [])
+
+    def test_normalize(self):
+        self.assertEqual(normalize(' Password: '), 'password')
+        self.assertEqual(normalize('...'), '')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+import helpers
+from SikuliXRobotLibrary.matchers import WaitEngine
+
+class StubMatcher(object):
+    """Matcher whose captures are the names in ``frames``, the last one repeating."""
+
+    def __init__(self, frames, scan_rate=20.0):
+        self.frames = frames
+        self.scan_rate = scan_rate
+        self.captures = 0
+        self.last_match = None
+
+    def resolve_timeout(self, timeout):
+        return timeout if timeout is not None else 0
+
+    def capture(self, region=None):
+        frame = self.frames[min(self.captures, len(self.frames) - 1)]
+        self.captures += 1
+        return frame
+
+    def digest(self, frame):
+        return frame
+
+    def match(self, frame, locator, xoffset=None, yoffset=None):
+        return "%s in %s" % (locator, frame) if locator in frame else None
+
+class WaitEngineTest(unittest.TestCase):
+
+    def test_wait_records_the_last_match(self):
+        matcher = StubMatcher(['blank', 'blank', 'with button'])
+        self.assertEqual(WaitEngine().wait(matcher, 'button', 1), 'button in with button')
+        self.assertEqual(matcher.last_match, 'button in with button')
+
+    def test_failed_wait_keeps_the_last_match(self):
+        matcher = StubMatcher(['blank'])
+        matcher.last_match = 'previous'
+        self.assertIsNone(WaitEngine().wait(matcher, 'button', 0.1))
+        self.assertEqual(matcher.last_match, 'previous')
+
+    def test_unchanged_screen_is_not_matched_again(self):
+        engine = WaitEngine()
+        engine.wait(StubMatcher(['blank']), 'button', 0.3)
+        self.assertEqual(engine.matches, 1)
+        self.assertGreater(engine.polls, 1)
+
+    def test_polling_keeps_the_scan_rate_by_default(self):
+        engine = WaitEngine()
+        engine.wait(StubMatcher(['blank'], scan_rate=20.0), 'button', 1)
+        self.assertGreaterEqual(engine.polls, 15)
+
+    def test_polling_slows_down_to_the_min_scan_rate(self):
+        engine = WaitEngine(min_scan_rate=1.0)
+        engine.wait(StubMatcher(['blank'], scan_rate=20.0), 'button', 1)
+        self.assertLess(engine.polls, 10)
+
+    def test_wait_vanish(self):
+        matcher = StubMatcher(['with button', 'blank'])
+        self.assertTrue(WaitEngine().wait_vanish(matcher, 'button', 1))
+        self.assertFalse(WaitEngine().wait_vanish(StubMatcher(['with button']), 'button', 0.1))
+
+if __name__ == '__main__':
+    unittest.main()
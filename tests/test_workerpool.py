@@ -0,0 +1,39 @@
+import threading
+import unittest
+
+import helpers
+from SikuliXRobotLibrary.utils import WorkerPool
+
+class WorkerPoolTest(unittest.TestCase):
+
+    def test_results_keep_the_order_of_the_items(self):
+        self.assertEqual(WorkerPool().map(lambda item: item * 2, range(10), 4), [item * 2 for item in range(10)])
+
+    def test_workers_are_reused(self):
+        pool = WorkerPool()
+        names = set()
+        for _ in range(5):
+            names.update(pool.map(lambda item: threading.current_thread().name, range(4), 4))
+        self.assertEqual(pool.size(), 4)
+        self.assertLessEqual(len(names), 4)
+
+    def test_single_worker_runs_in_the_calling_thread(self):
+        pool = WorkerPool()
+        self.assertEqual(pool.map(lambda item: threading.current_thread().name, range(3), 1),
+                         [threading.current_thread().name] * 3)
+        self.assertEqual(pool.size(), 0)
+
+    def test_nested_calls_do_not_wait_for_busy_workers(self):
+        pool = WorkerPool()
+        nested = lambda item: sum(pool.map(lambda value: value + item, range(3), 2))
+        self.assertEqual(pool.map(nested, range(4), 2), [3, 6, 9, 12])
+
+    def test_first_error_is_raised(self):
+        def fail_on_odd(item):
+            if item % 2:
+                raise ValueError(item)
+            return item
+        self.assertRaises(ValueError, WorkerPool().map, fail_on_odd, range(6), 3)
+
+if __name__ == '__main__':
+    unittest.main()